@@ -0,0 +1,115 @@
+"""throughput of 500 coroutines running 10 SELECTs each, through the
+dm+dmPython_async dialect and through run_in_executor around the sync
+dialect.
+
+    python bench/bench_async.py [latency in seconds]
+
+Runs against bench/standin/dmPython.py, which sleeps for each execute
+(1 ms here by default) instead of reaching a server, with 20 pooled
+connections and 20 threads.  "per call" wraps every statement in
+run_in_executor, behind a semaphore in front of checkout (without it,
+checkouts blocked in the executor deadlock it); "whole unit" runs each
+coroutine's ten statements in one executor call.  The user-021 figures
+(medians of three runs at 1 and 5 ms) are from this script.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'standin'))
+
+import dmPython
+import sqlalchemy as sa
+from sqlalchemy.dialects import registry
+from sqlalchemy.ext.asyncio import create_async_engine
+
+registry.register('dm', 'sqlalchemy_dm.dmPython', 'DMDialect_dmPython')
+registry.register('dm.dmPython_async', 'sqlalchemy_dm.dmPython_async',
+                  'DMDialect_dmPython_async')
+
+COROUTINES = 500
+QUERIES = 10
+SIZE = 20
+
+statement = sa.select(sa.literal('a'))
+
+
+async def loop_lag(stop, lags):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append(time.perf_counter() - start - 0.005)
+
+
+async def run(work):
+    """queries/s and the longest event loop stall in ms, medians of three
+    runs after a warm-up."""
+    results = []
+    for i in range(4):
+        stop = asyncio.Event()
+        lags = []
+        monitor = asyncio.ensure_future(loop_lag(stop, lags))
+        start = time.perf_counter()
+        await asyncio.gather(*[work() for _ in range(COROUTINES)])
+        seconds = time.perf_counter() - start
+        stop.set()
+        await monitor
+        if i:
+            results.append((COROUTINES * QUERIES / seconds, max(lags) * 1000))
+    return (statistics.median(r[0] for r in results),
+            statistics.median(r[1] for r in results))
+
+
+async def main():
+    engine = create_async_engine(
+        'dm+dmPython_async://u:p@h:5236', pool_size=SIZE, max_overflow=0,
+        pool_timeout=300, thread_pool_size=SIZE)
+
+    async def dialect():
+        async with engine.connect() as conn:
+            for _ in range(QUERIES):
+                (await conn.execute(statement)).all()
+
+    print('dm+dmPython_async          %6.0f q/s, loop stall %5.1f ms' %
+          await run(dialect))
+    await engine.dispose()
+
+    sync_engine = sa.create_engine(
+        'dm://u:p@h:5236', pool_size=SIZE, max_overflow=0, pool_timeout=300)
+    executor = ThreadPoolExecutor(SIZE)
+    checkout = asyncio.Semaphore(SIZE)
+
+    async def per_call():
+        loop = asyncio.get_running_loop()
+        async with checkout:
+            conn = await loop.run_in_executor(executor, sync_engine.connect)
+            try:
+                for _ in range(QUERIES):
+                    await loop.run_in_executor(
+                        executor, lambda: conn.execute(statement).all())
+            finally:
+                await loop.run_in_executor(executor, conn.close)
+
+    print('run_in_executor per call   %6.0f q/s, loop stall %5.1f ms' %
+          await run(per_call))
+
+    def unit():
+        with sync_engine.connect() as conn:
+            for _ in range(QUERIES):
+                conn.execute(statement).all()
+
+    async def whole_unit():
+        await asyncio.get_running_loop().run_in_executor(executor, unit)
+
+    print('run_in_executor whole unit %6.0f q/s, loop stall %5.1f ms' %
+          await run(whole_unit))
+    executor.shutdown()
+    sync_engine.dispose()
+
+
+if __name__ == '__main__':
+    dmPython.LATENCY = float(sys.argv[1]) if len(sys.argv) > 1 else 0.001
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+"""uncached compile throughput of a 30-column SELECT with a join, IN,
+ORDER BY and LIMIT, with dialect tracing off and on.
+
+    python bench/bench_compile.py [compiles]
+
+No driver or server is needed.  Run it on two checkouts to compare
+them; the user-001 figures (1100 -> 1720 compiles/s, tracing off) are
+from the baseline commit against the user-001 commit.
+"""
+import sys
+import timeit
+
+import sqlalchemy as sa
+
+from sqlalchemy_dm.dmPython import DMDialect_dmPython
+
+
+def statement():
+    md = sa.MetaData()
+    t = sa.Table('t', md, *[sa.Column('c%d' % i, sa.Integer)
+                            for i in range(30)])
+    u = sa.Table('u', md, sa.Column('id', sa.Integer),
+                 sa.Column('tid', sa.Integer))
+    return sa.select(t).join(u, u.c.tid == t.c.c0).where(
+        t.c.c1 == 5, t.c.c2.in_([1, 2, 3])).order_by(t.c.c3).limit(10)
+
+
+def main(number=2000):
+    stmt = statement()
+    for trace in (False, True):
+        kw = {}
+        if trace:
+            kw = {'supports_trace': True, 'trace_path': '/dev/null',
+                  'trace_format': 'jsonl'}
+        dialect = DMDialect_dmPython(**kw)
+        seconds = min(timeit.repeat(
+            lambda: stmt.compile(dialect=dialect), number=number, repeat=5))
+        print('tracing %-3s %6.0f compiles/s' % (
+            'on' if trace else 'off', number / seconds))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,61 @@
+"""bind-name quoting and name normalization on a wide table, with the
+name caches off and on.
+
+    python bench/bench_name_cache.py
+
+No driver or server is needed.  The table has 241 columns, ten of them
+reserved words, as wide legacy tables have.  The user-015 figures
+(quote check 757 -> 153 ns, normalize_name ~900 -> ~180 ns,
+denormalize_name ~1000 -> ~200 ns per name) are from this script.
+"""
+import timeit
+
+import sqlalchemy as sa
+
+from sqlalchemy_dm.dmPython import DMDialect_dmPython
+
+
+NAMES = ['col_%d' % i for i in range(230)] + [
+    'level', 'size', 'comment', 'date', 'mode', 'uid', 'rows', 'limit',
+    'year', 'option']
+
+
+def per_name(fn, names, number):
+    seconds = min(timeit.repeat(fn, number=number, repeat=7))
+    return seconds / number / len(names) * 1e9
+
+
+def main():
+    md = sa.MetaData()
+    t = sa.Table('wide', md, sa.Column('id', sa.Integer, primary_key=True),
+                 *[sa.Column(name, sa.Integer) for name in NAMES])
+    statements = {
+        'insert': t.insert(),
+        'update': t.update().where(t.c.id == sa.bindparam('pk')),
+        'select': sa.select(t).where(sa.and_(
+            *[t.c[name] == i for i, name in enumerate(NAMES)])),
+    }
+    upper = [name.upper() for name in NAMES]
+
+    for size in (0, 4096):
+        dialect = DMDialect_dmPython(name_cache_size=size)
+        requires_quotes = \
+            dialect.identifier_preparer._bindparam_requires_quotes
+        print('name_cache_size=%d' % size)
+        print('  bind-name quote check %5.0f ns per name' % per_name(
+            lambda: [requires_quotes(name) for name in NAMES], NAMES, 200))
+        print('  normalize_name        %5.0f ns per name' % per_name(
+            lambda: [dialect.normalize_name(name) for name in upper],
+            upper, 200))
+        print('  denormalize_name      %5.0f ns per name' % per_name(
+            lambda: [dialect.denormalize_name(name) for name in NAMES],
+            NAMES, 200))
+        for label, stmt in statements.items():
+            seconds = min(timeit.repeat(
+                lambda: stmt.compile(dialect=dialect), number=20, repeat=7))
+            print('  %-6s compile        %5.0f us' % (
+                label, seconds / 20 * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""ORM flush of N new objects with an integer identity key, with
+insertmanyvalues on and off.
+
+    python bench/bench_orm_flush.py [N,N,...] [latency in seconds]
+
+Runs against bench/standin/dmPython.py, which sleeps for each execute
+(0.2 ms by default) instead of reaching a server.  Turning
+use_insertmanyvalues off sends one INSERT ... RETURNING INTO per object,
+as before user-010; the user-010 figures (2000-2700 obj/s before, 23000-
+33000 obj/s after, for 1k to 100k objects) are from this script.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'standin'))
+
+import dmPython
+import sqlalchemy as sa
+from sqlalchemy import orm
+from sqlalchemy.dialects import registry
+
+registry.register('dm', 'sqlalchemy_dm.dmPython', 'DMDialect_dmPython')
+
+
+class Base(orm.DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = 'item'
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    x = sa.Column(sa.String(10))
+    y = sa.Column(sa.Integer)
+
+
+def main(counts='1000,10000,100000', latency=dmPython.LATENCY):
+    dmPython.LATENCY = float(latency)
+    for batched in (False, True):
+        engine = sa.create_engine(
+            'dm://u:p@h:5236', use_insertmanyvalues=batched)
+        for count in [int(count) for count in counts.split(',')]:
+            with orm.Session(engine) as session:
+                items = [Item(x='q', y=i) for i in range(count)]
+                session.add_all(items)
+                dmPython.STATS['execute'] = 0
+                start = time.perf_counter()
+                session.flush()
+                seconds = time.perf_counter() - start
+                ids = [item.id for item in items]
+                assert ids == list(range(ids[0], ids[0] + count))
+            print('insertmanyvalues %-3s %6d objects: %6.0f obj/s, '
+                  '%d round trips' % (
+                      'on' if batched else 'off', count, count / seconds,
+                      dmPython.STATS['execute']))
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,174 @@
+"""MetaData.reflect()-style reflection of 6000 tables with
+reflection_workers 1, 4 and 8, against a stand-in catalog server.
+
+    python bench/bench_parallel_reflect.py [latency in seconds] [workers,...]
+
+No DM server is needed: the catalog views the dialect reads
+(ALL_TABLES, ALL_TAB_COLS, ...) are tables of a SQLite file, 6000 tables
+with 10 columns, a primary key, a foreign key, a check constraint and an
+index each, and every query sleeps ``latency`` seconds (20 ms by
+default) as a round trip to a remote server would.  The constraint and
+index queries are replaced by plain ones over that catalog, sent through
+the dialect's own IN-list batching.  The user-018 figures (6.2 / 3.4 /
+4.0 s at 20 ms, 15.2 / 4.8 / 4.3 s at 100 ms) are from this script;
+every worker count must reflect the same result.
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import sqlalchemy as sa
+from sqlalchemy.engine import ObjectKind, ObjectScope
+
+from sqlalchemy_dm.base import DMInspector
+from sqlalchemy_dm.dmPython import DMDialect_dmPython
+
+
+TABLES = 6000
+COLUMNS = 10
+
+
+def build_catalog(path):
+    random.seed(1)
+    engine = sa.create_engine('sqlite:///' + path)
+    tables = [('SYSDBA', 'T_%05d' % i, 'MAIN', None, 'DISABLED', None)
+              for i in range(TABLES)]
+    constraints = []
+    for i in range(TABLES):
+        name = 'T_%05d' % i
+        constraints.append(('PK_%d' % i, name, 'P', 'COL_0', None, None,
+                            None, 1, None, None, 'PK_%d' % i, None))
+        if i:
+            constraints.append((
+                'FK_%d' % i, name, 'R', 'COL_2', 'T_%05d' % (i - 1),
+                'COL_0', 'SYSDBA', 1, 1, 'NO ACTION', 'FK_%d' % i, None))
+        constraints.append(('CK_%d' % i, name, 'C', 'COL_3', None, None,
+                            None, 1, None, None, 'CK_%d' % i, 'COL_3 > 0'))
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE all_tables (owner, table_name, tablespace_name, "
+            "duration, compression, compress_for)")
+        conn.exec_driver_sql(
+            "CREATE TABLE all_tab_cols (owner, table_name, column_name, "
+            "data_type, char_length, data_precision, data_scale, nullable, "
+            "data_default, virtual_column, hidden_column, column_id)")
+        conn.exec_driver_sql(
+            "CREATE TABLE all_col_comments (owner, table_name, "
+            "column_name, comments)")
+        conn.exec_driver_sql(
+            "CREATE TABLE user_tab_comments (table_name, comments)")
+        conn.exec_driver_sql(
+            "CREATE TABLE dm_cons (cons_name, table_name, constraint_type, "
+            "local_column, remote_table, remote_column, remote_owner, "
+            "loc_pos, rem_pos, delete_rule, constraint_name, "
+            "search_condition)")
+        conn.exec_driver_sql(
+            "CREATE TABLE dm_ind (table_name, index_name, column_name, "
+            "index_type, uniqueness, compression, prefix_length)")
+        conn.exec_driver_sql(
+            "INSERT INTO all_tables VALUES (?, ?, ?, ?, ?, ?)", tables)
+        conn.exec_driver_sql(
+            "INSERT INTO all_tab_cols VALUES "
+            "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [('SYSDBA', table[1], 'COL_%d' % j,
+              random.choice(['NUMBER', 'VARCHAR2', 'DATE', 'INT']),
+              20, 10, 0, 'Y', None, 'NO', 'NO', j)
+             for table in tables for j in range(COLUMNS)])
+        conn.exec_driver_sql(
+            "INSERT INTO user_tab_comments VALUES (?, ?)",
+            [(table[1], 'c %s' % table[1]) for table in tables[::7]])
+        conn.exec_driver_sql(
+            "INSERT INTO dm_cons VALUES "
+            "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", constraints)
+        conn.exec_driver_sql(
+            "INSERT INTO dm_ind VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [('T_%05d' % i, 'IX_%d' % i, 'COL_1', 'NORMAL', 'NONUNIQUE',
+              'DISABLED', None) for i in range(TABLES)])
+    engine.dispose()
+
+
+def reflect(path, workers, latency):
+    engine = sa.create_engine('sqlite:///' + path, pool_size=20,
+                              max_overflow=0)
+    queries = [0]
+
+    @sa.event.listens_for(engine, 'connect')
+    def connect(dbapi_connection, record):
+        dbapi_connection.create_function(
+            'nvl', 2, lambda a, b: b if a is None else a)
+
+    @sa.event.listens_for(engine, 'before_cursor_execute')
+    def round_trip(*args):
+        queries[0] += 1
+        time.sleep(latency)
+
+    dialect = DMDialect_dmPython(reflection_workers=workers)
+    dialect.default_schema_name = 'sysdba'
+    dialect._get_synonyms = lambda *args, **kw: []
+
+    def constraint_data(connection, schema, filter_names, scope, kind,
+                        dblink=None, **kw):
+        if filter_names is None:
+            filter_names = dialect._get_all_objects(
+                connection, schema, scope, kind, None, dblink)
+        return list(dialect._run_batches(
+            connection, filter_names,
+            "SELECT * FROM dm_cons WHERE table_name IN(",
+            ") ORDER BY cons_name", None))
+
+    def index_rows(connection, schema, filter_names, scope, dblink=None,
+                   **kw):
+        return list(dialect._run_batches(
+            connection, filter_names,
+            "SELECT * FROM dm_ind WHERE table_name IN(",
+            ") ORDER BY index_name", None))
+
+    dialect.get_multi_constraint_data = constraint_data
+    dialect._get_indexes_rows = index_rows
+
+    class Inspector(DMInspector):
+        # the engine speaks SQLite; reflection goes through the DM dialect
+        def _init_engine(self, engine):
+            super(Inspector, self)._init_engine(engine)
+            self.dialect = dialect
+
+        def _init_connection(self, connection):
+            super(Inspector, self)._init_connection(connection)
+            self.dialect = dialect
+
+    inspector = Inspector._construct(Inspector._init_engine, engine)
+    start = time.perf_counter()
+    info = inspector._get_reflection_info(
+        schema=None, filter_names=None, kind=ObjectKind.TABLE,
+        scope=ObjectScope.DEFAULT)
+    seconds = time.perf_counter() - start
+    engine.dispose()
+    result = repr([
+        sorted(getattr(info, name).items(), key=repr)
+        for name in ('columns', 'pk_constraint', 'foreign_keys', 'indexes',
+                     'unique_constraints', 'table_comment',
+                     'check_constraints', 'table_options')])
+    return seconds, queries[0], result
+
+
+def main(latency='0.02', workers='1,4,8'):
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'catalog.db')
+        build_catalog(path)
+        results = set()
+        for count in [int(count) for count in workers.split(',')]:
+            seconds, queries, result = reflect(path, count, float(latency))
+            results.add(result)
+            print('workers=%d  %5.1f s, %d queries' % (
+                count, seconds, queries))
+        assert len(results) == 1, 'worker counts reflected differently'
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,44 @@
+"""single-row Core INSERTs reading inserted_primary_key, with the key
+fetched by a rowid SELECT and by RETURNING INTO.
+
+    python bench/bench_pk_fetch.py [inserts] [latency in seconds]
+
+Runs against bench/standin/dmPython.py, which sleeps for each execute
+(0.2 ms by default) instead of reaching a server.  The user-008 figures
+(rowid ~900 inserts/s and 2 round trips per insert, returning ~1700
+inserts/s and 1) are from this script.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'standin'))
+
+import dmPython
+import sqlalchemy as sa
+from sqlalchemy.dialects import registry
+
+registry.register('dm', 'sqlalchemy_dm.dmPython', 'DMDialect_dmPython')
+
+
+def main(count=2000, latency=dmPython.LATENCY):
+    dmPython.LATENCY = float(latency)
+    md = sa.MetaData()
+    t = sa.Table('t', md, sa.Column('id', sa.Integer, primary_key=True),
+                 sa.Column('x', sa.String(20)))
+    for mode in ('rowid', 'returning'):
+        engine = sa.create_engine('dm://u:p@h:5236', insert_pk_fetch=mode)
+        with engine.begin() as conn:
+            dmPython.STATS['execute'] = 0
+            start = time.perf_counter()
+            for _ in range(int(count)):
+                conn.execute(t.insert(), {'x': 'a'}).inserted_primary_key
+            seconds = time.perf_counter() - start
+        print('%-9s %6.0f inserts/s, %.2f round trips per insert' % (
+            mode, int(count) / seconds,
+            dmPython.STATS['execute'] / float(count)))
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
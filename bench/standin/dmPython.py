@@ -0,0 +1,152 @@
+"""stand-in for the dmPython driver, for the benchmarks in bench/.
+
+No server is involved: every execute sleeps ``LATENCY`` seconds, for a
+round trip, and counts itself in ``STATS``.  INSERTs hand out increasing
+keys, through ``lastrowid`` and through any ``RETURNING ... INTO`` out
+variable; SELECTs by rowid return the last key, other SELECTs one row.
+
+The benchmarks put this directory first on ``sys.path``, so that the
+dialect imports it as ``dmPython``.
+"""
+import base64
+import time
+
+paramstyle = 'qmark'
+apilevel = '2.0'
+threadsafety = 1
+version = '2.5.5'
+
+# seconds per execute
+LATENCY = 0.0002
+STATS = {'execute': 0}
+
+NUMBER = 'NUMBER'
+STRING = 'STRING'
+
+
+class Error(Exception):
+    pass
+
+
+class Warning(Exception):
+    pass
+
+
+class InterfaceError(Error):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+class DataError(DatabaseError):
+    pass
+
+
+class OperationalError(DatabaseError):
+    pass
+
+
+class IntegrityError(DatabaseError):
+    pass
+
+
+class InternalError(DatabaseError):
+    pass
+
+
+class ProgrammingError(DatabaseError):
+    pass
+
+
+class NotSupportedError(DatabaseError):
+    pass
+
+
+class Var(object):
+    def __init__(self, type_):
+        self.value = None
+
+    def getvalue(self):
+        return self.value
+
+
+class Cursor(object):
+    arraysize = 50
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self._rows = []
+
+    def var(self, type_, *args, **kw):
+        return Var(type_)
+
+    def execute(self, statement, parameters=None):
+        time.sleep(LATENCY)
+        STATS['execute'] += 1
+        words = statement.strip().upper()
+        self.description = None
+        self._rows = []
+        if words.startswith('INSERT'):
+            count = words.count('), (') + 1
+            first = self.connection.last_key + 1
+            self.connection.last_key += count
+            self.lastrowid = base64.b64encode(
+                first.to_bytes(15, 'big')).decode()[2:]
+            keys = list(range(first, first + count))
+            for value in parameters or ():
+                if isinstance(value, Var):
+                    value.value = keys
+            self.rowcount = count
+        elif words.startswith('SELECT'):
+            self.description = [('X', None, None, None, None, None, None)]
+            if 'ROWID' in words:
+                self._rows = [(self.connection.last_key, )]
+            else:
+                self._rows = [('SYSDBA', )]
+
+    def executemany(self, statement, rows):
+        for row in rows:
+            self.execute(statement, row)
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size=None):
+        return self.fetchall()
+
+    def close(self):
+        pass
+
+
+class Connection(object):
+    local_code = 1
+    str_case_sensitive = True
+    server_version = '8.1.3.62'
+
+    def __init__(self):
+        self.last_key = 0
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def connect(*args, **kw):
+    return Connection()
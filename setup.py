@@ -15,7 +15,8 @@ setup_params = dict(
     include_package_data=True,
     entry_points={
         "sqlalchemy.dialects":
-            ["dm = sqlalchemy_dm.dmPython:DMDialect_dmPython", "dm.dmPython = sqlalchemy_dm.dmPython:DMDialect_dmPython"]
+            ["dm = sqlalchemy_dm.dmPython:DMDialect_dmPython", "dm.dmPython = sqlalchemy_dm.dmPython:DMDialect_dmPython",
+             "dm.dmPython_async = sqlalchemy_dm.dmPython_async:DMDialect_dmPython_async"]
     },
     install_requires=['dmPython', 'sqlalchemy'],
 )
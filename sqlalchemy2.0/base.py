@@ -1,19 +1,27 @@
 import re
 import json
+import inspect
+import threading
 from collections import defaultdict
-from sqlalchemy import util, sql,text
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import util, sql, text, exc
 from sqlalchemy.engine import default, reflection
 from sqlalchemy.engine import ObjectKind, ObjectScope
 from sqlalchemy.sql import compiler, visitors, expression, util as sql_util
 from sqlalchemy.sql import operators as sql_operators
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
 from sqlalchemy.engine.reflection import ReflectionDefaults
 from sqlalchemy.sql.elements import quoted_name
-from functools import wraps
+from functools import wraps, lru_cache
 from sqlalchemy import types as sqltypes, schema as sa_schema
 from sqlalchemy.types import VARCHAR, NVARCHAR, CHAR, \
     BLOB, CLOB, TIME, TIMESTAMP, FLOAT, BIGINT, String, DOUBLE_PRECISION, REAL, INTEGER
 from .types import NUMBER,_DMNumeric
-from .types import colspecs, ischema_names
+from .types import colspecs, ischema_names, decode_rowid
+from .tracing import DMTraceWriter, DMSpanTracer, TRACE_FORMATS
+from .metrics import DMMetrics, REFLECTION_OPTION
+from .reflection_cache import DMReflectionCache
+from .hints import DMHint
 import sqlalchemy.sql.elements
 from datetime import datetime
 NO_ARG = util.symbol("NO_ARG")
@@ -30,37 +38,65 @@ RESERVED_WORDS = \
         'DECIMAL UNION PUBLIC AND START UID COMMENT CURRENT LEVEL '
         'SCHEMA ROWS LIMIT YEAR DATETIME NUMBER'.split())
 
+PAGINATION_MODES = ('auto', 'limit', 'fetch', 'rownum')
+
 NO_ARG_FNS = set('UID CURRENT_DATE SYSDATE USER '
                  'CURRENT_TIME CURRENT_TIMESTAMP'.split())
 
+PK_FETCH_MODES = ('rowid', 'rowid_decode', 'returning')
+
+# entries kept per identifier cache, see DMDialect.name_cache_info()
+NAME_CACHE_SIZE = 4096
+
+# names per batched reflection query; smaller batches are padded up to the
+# next of these sizes, so only a handful of distinct statements is parsed
+REFLECTION_BATCH_SIZE = 500
+REFLECTION_IN_SIZES = (10, 50, 100)
+
+# (ReflectionInfo field, Inspector method, optional) in the order the
+# Inspector runs them
+REFLECTION_CATEGORIES = (
+    ('columns', 'get_multi_columns', False),
+    ('pk_constraint', 'get_multi_pk_constraint', False),
+    ('foreign_keys', 'get_multi_foreign_keys', False),
+    ('indexes', 'get_multi_indexes', False),
+    ('unique_constraints', 'get_multi_unique_constraints', True),
+    ('table_comment', 'get_multi_table_comment', True),
+    ('check_constraints', 'get_multi_check_constraints', True),
+    ('table_options', 'get_multi_table_options', True),
+)
+
+# dialect methods the Inspector reflects through; with collect_metrics,
+# the statements run under them are counted as "reflection"
+REFLECTION_METHODS = (
+    'has_table', 'has_sequence', 'get_schema_names', 'get_table_names',
+    'get_temp_table_names', 'get_view_names', 'get_view_definition',
+    'get_columns', 'get_pk_constraint', 'get_foreign_keys', 'get_indexes',
+    'get_unique_constraints', 'get_check_constraints', 'get_table_comment',
+    'get_table_options',
+) + tuple(name for field, name, optional in REFLECTION_CATEGORIES)
+
+
 class DMTypeCompiler(compiler.GenericTypeCompiler):
     def visit_datetime(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_datetime', type_, **kw)
         return self.visit_DATETIME(type_, **kw)
 
     def visit_float(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_float', type_, **kw)
         return self.visit_FLOAT(type_, **kw)
     
     def visit_TINYINT(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_TINYINT', type_, **kw)
         return "TINYINT"
     
     def visit_BIT(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_BIT', type_, **kw)
         return "BIT"
 
     def visit_unicode(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_unicode', type_, **kw)
-        
         if self.dialect._supports_nchar:
             return self.visit_NVARCHAR2(type_, **kw)
         else:
             return self.visit_VARCHAR2(type_, **kw)
 
     def visit_INTERVAL(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_INTERVAL', type_, **kw)
-        
         # INTERVAL YEAR
         if type_.year_precision is not None and type_.to_month:
             return "INTERVAL YEAR(%d) TO MONTH" % (type_.year_precision)
@@ -110,24 +146,18 @@ class DMTypeCompiler(compiler.GenericTypeCompiler):
             #        )            
 
     def visit_LONGVARCHAR(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_LONGVARCHAR', type_, **kw)
         return "LONGVARCHAR"
 
     def visit_ARRAY(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_ARRAY', type_, **kw)
         return "CLOB"
 
     def visit_TIMESTAMP(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_TIMESTAMP', type_, **kw)
-        
         if type_.timezone:
             return "TIMESTAMP WITH TIME ZONE"
         else:
             return "TIMESTAMP"
         
     def visit_DMTIMESTAMP(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_DMTIMESTAMP', type_, **kw)
-        
         if type_.timezone:
             return "TIMESTAMP WITH TIME ZONE"
         elif type_.local_timezone:
@@ -136,28 +166,21 @@ class DMTypeCompiler(compiler.GenericTypeCompiler):
             return "TIMESTAMP"
     
     def visit_TIME(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_TIME', type_, **kw)
-        
         if type_.timezone:
             return "TIME WITH TIME ZONE"
         else:
             return "TIME"
     
     def visit_IMAGE(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_IMAGE', type_, **kw)
         return "IMAGE"
 
     def visit_DOUBLE_PRECISION(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_DOUBLE_PRECISION', type_, **kw)
         return self._generate_numeric(type_, "DOUBLE", **kw)
 
     def visit_NUMBER(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_NUMBER', type_, **kw)
         return self._generate_numeric(type_, "NUMBER", **kw)
 
     def _generate_numeric(self, type_, name, precision=None, scale=None, **kw):
-        self.dialect.trace_process('DMTypeCompiler', '_generate_numeric', type_, name, precision=None, scale=None, **kw)
-        
         if precision is None:
             precision = type_.precision
 
@@ -174,28 +197,22 @@ class DMTypeCompiler(compiler.GenericTypeCompiler):
             return n % {'name': name, 'precision': precision, 'scale': scale}
 
     def visit_string(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_string', type_, **kw)
         return self.visit_VARCHAR2(type_, **kw)
 
     def visit_VARCHAR2(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_VARCHAR2', type_, **kw)
         return self._visit_varchar(type_, '', '2')
 
     def visit_NVARCHAR2(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_NVARCHAR2', type_, **kw)
         return self._visit_varchar(type_, 'N', '2')
     visit_NVARCHAR = visit_NVARCHAR2
 
     def visit_VARCHAR(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_VARCHAR', type_, **kw)
         return self._visit_varchar(type_, '', '')
     
     def visit_LongVarBinary(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_LongVarBinary', type_, **kw)
         return "LONGVARBINARY"
 
     def _visit_varchar(self, type_, n, num):
-        self.dialect.trace_process('DMTypeCompiler', '_visit_varchar', type_, n, num)
         if not type_.length:
             return "%(n)sVARCHAR%(two)s" % {'two': num, 'n': n}
         elif not n and self.dialect._supports_char_length:
@@ -206,150 +223,38 @@ class DMTypeCompiler(compiler.GenericTypeCompiler):
             return varchar % {'length': type_.length, 'two': num, 'n': n}
 
     def visit_text(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_text', type_, **kw)
         return "TEXT"
 
     def visit_unicode_text(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_unicode_text', type_, **kw)
-        
         if self.dialect._supports_nchar:
             return self.visit_NCLOB(type_, **kw)
         else:
             return self.visit_CLOB(type_, **kw)
 
     def visit_large_binary(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_large_binary', type_, **kw)
         return self.visit_BLOB(type_, **kw)
 
     def visit_big_integer(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_big_integer', type_, **kw)
         return self.visit_BIGINT(type_, **kw)
 
     def visit_boolean(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_boolean', type_, **kw)
         #return self.visit_SMALLINT(type_, **kw)
         return "BIT"
 
     def visit_ROWID(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_ROWID', type_, **kw)
         return "ROWID"
-    
-    # for trace only
-    def visit_BIGINT(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_BIGINT', type_, **kw)
-        return super(DMTypeCompiler, self).visit_BIGINT(type_, **kw)
-        
-    def visit_BINARY(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_BINARY', type_, **kw)
-        return super(DMTypeCompiler, self).visit_BINARY(type_, **kw)
-        
-    def visit_BLOB(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_BLOB', type_, **kw)
-        return super(DMTypeCompiler, self).visit_BLOB(type_, **kw)
-        
-    def visit_BOOLEAN(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_BOOLEAN', type_, **kw)
-        return super(DMTypeCompiler, self).visit_BOOLEAN(type_, **kw)
-        
-    def visit_CHAR(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_CHAR', type_, **kw)
-        return super(DMTypeCompiler, self).visit_CHAR(type_, **kw)
-        
-    def visit_CLOB(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_CLOB', type_, **kw)
-        return super(DMTypeCompiler, self).visit_CLOB(type_, **kw)
-        
-    def visit_DATE(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_DATE', type_, **kw)
-        return super(DMTypeCompiler, self).visit_DATE(type_, **kw)
-        
-    def visit_date(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_date', type_, **kw)
-        return super(DMTypeCompiler, self).visit_date(type_, **kw)
-        
-    def visit_DATETIME(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_DATETIME', type_, **kw)
-        return super(DMTypeCompiler, self).visit_DATETIME(type_, **kw)
-        
-    def visit_DECIMAL(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_DECIMAL', type_, **kw)
-        return super(DMTypeCompiler, self).visit_DECIMAL(type_, **kw)
-        
-    def visit_enum(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_enum', type_, **kw)
-        return super(DMTypeCompiler, self).visit_enum(type_, **kw)
-        
-    def visit_FLOAT(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_FLOAT', type_, **kw)
-        return super(DMTypeCompiler, self).visit_FLOAT(type_, **kw)
-        
-    def visit_INTEGER(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_INTEGER', type_, **kw)
-        return super(DMTypeCompiler, self).visit_INTEGER(type_, **kw)
-        
-    def visit_integer(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_integer', type_, **kw)
-        return super(DMTypeCompiler, self).visit_integer(type_, **kw)
-        
-    def visit_NCHAR(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_NCHAR', type_, **kw)
-        return super(DMTypeCompiler, self).visit_NCHAR(type_, **kw)
-        
-    def visit_NCLOB(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_NCLOB', type_, **kw)
-        return super(DMTypeCompiler, self).visit_NCLOB(type_, **kw)
-        
-    def visit_null(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_null', type_, **kw)
-        return super(DMTypeCompiler, self).visit_null(type_, **kw)
-        
-    def visit_NUMERIC(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_NUMERIC', type_, **kw)
-        return super(DMTypeCompiler, self).visit_NUMERIC(type_, **kw)
-        
-    def visit_numeric(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_numeric', type_, **kw)
-        return super(DMTypeCompiler, self).visit_numeric(type_, **kw)
-        
-    def visit_NVARCHAR(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_NVARCHAR', type_, **kw)
-        return super(DMTypeCompiler, self).visit_NVARCHAR(type_, **kw)
-        
-    def visit_REAL(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_REAL', type_, **kw)
-        super(DMTypeCompiler, self).visit_REAL(type_, **kw)
-    
-    def visit_real(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_real', type_, **kw)
-        return super(DMTypeCompiler, self).visit_real(type_, **kw)
-        
-    def visit_SMALLINT(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_SMALLINT', type_, **kw)
-        return super(DMTypeCompiler, self).visit_SMALLINT(type_, **kw)
-        
-    def visit_small_integer(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_small_integer', type_, **kw)
-        return super(DMTypeCompiler, self).visit_small_integer(type_, **kw)
-        
-    def visit_TEXT(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_TEXT', type_, **kw)
-        return super(DMTypeCompiler, self).visit_TEXT(type_, **kw)
-        
-    def visit_time(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_time', type_, **kw)
-        return super(DMTypeCompiler, self).visit_time(type_, **kw)
-        
-    def visit_type_decorator(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_type_decorator', type_, **kw)
-        return super(DMTypeCompiler, self).visit_type_decorator(type_, **kw)
-        
-    def visit_user_defined(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_user_defined', type_, **kw)
-        return super(DMTypeCompiler, self).visit_user_defined(type_, **kw)
-        
-    def visit_VARBINARY(self, type_, **kw):
-        self.dialect.trace_process('DMTypeCompiler', 'visit_VARBINARY', type_, **kw)
-        return super(DMTypeCompiler, self).visit_VARBINARY(type_, **kw)
+
+
+def _exists_element(element):
+    """the :class:`.Exists` of an EXISTS or NOT EXISTS, else None."""
+    if isinstance(element, expression.UnaryExpression) and \
+            element.operator is sql_operators.inv:
+        element = element.element
+        if isinstance(element, expression.Grouping):
+            element = element.element
+    if isinstance(element, expression.Exists):
+        return element
+    return None
 
 
 class DMCompiler(compiler.SQLCompiler):
@@ -359,68 +264,110 @@ class DMCompiler(compiler.SQLCompiler):
             expression.CompoundSelect.EXCEPT: 'MINUS'
         }
     )
+
+    # RETURNING is rendered as RETURNING ... INTO out parameters, which
+    # the execution context binds and reads back
+    _dm_returning = False
+    _dm_returning_pk = None
+
     def __init__(self, *args, **kwargs):
         self.__wheres = {}
         self._quoted_bind_names = {}
         super(DMCompiler, self).__init__(*args, **kwargs)
 
     def visit_mod_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_mod_binary', binary, operator, **kw)
         return "mod(%s, %s)" % (self.process(binary.left, **kw),
                                 self.process(binary.right, **kw))
 
     def visit_now_func(self, fn, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_now_func', fn, **kw)
         return "CURRENT_TIMESTAMP"
 
     def visit_char_length_func(self, fn, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_char_length_func', fn, **kw)
         return "LENGTH" + self.function_argspec(fn, **kw)
 
     def visit_match_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_match_op_binary', binary, operator, **kw)
         return "CONTAINS (%s, %s)" % (self.process(binary.left),
                                       self.process(binary.right))
 
     def visit_true(self, expr, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_true', expr, **kw)
         return '1'
 
     def visit_false(self, expr, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_false', expr, **kw)
         return '0'
 
     def get_cte_preamble(self, recursive):
-        self.dialect.trace_process('DMCompiler', 'get_cte_preamble', recursive)
         return "WITH"
 
     def get_select_hint_text(self, byfroms):
-        self.dialect.trace_process('DMCompiler', 'get_select_hint_text', byfroms)
-        return " ".join(
-            "/*+ %s */" % text for table, text in byfroms.items()
-        )
+        if byfroms:
+            return "/*+ %s */" % " ".join(byfroms.values())
+
+    def visit_dm_hint(self, hint, **kw):
+        args = [t._compiler_dispatch(self, ashint=True, **kw)
+                for t in hint.tables]
+        args.extend(self.preparer.quote(name) for name in hint.names)
+        args.extend(hint.args)
+        if not args:
+            return hint.name
+        return "%s(%s)" % (hint.name, ", ".join(args))
+
+    def _generate_prefixes(self, stmt, prefixes, **kw):
+        # DM reads only the first /*+ */ comment of a statement, so every
+        # DMHint prefix is merged into one comment ahead of the others
+        hints = [prefix for prefix, dialect_name in prefixes
+                 if isinstance(prefix, DMHint) and
+                 dialect_name in (None, "*", self.dialect.name)]
+        if not hints:
+            return super(DMCompiler, self)._generate_prefixes(
+                stmt, prefixes, **kw)
+        text = "/*+ %s */ " % " ".join(
+            self.process(prefix, **kw) for prefix in hints)
+        return text + super(DMCompiler, self)._generate_prefixes(
+            stmt, [(prefix, dialect_name)
+                   for prefix, dialect_name in prefixes
+                   if not isinstance(prefix, DMHint)], **kw)
 
     def function_argspec(self, fn, **kw):
-        self.dialect.trace_process('DMCompiler', 'function_argspec', fn, **kw)
         if len(fn.clauses) > 0 or fn.name.upper() not in NO_ARG_FNS:
             return compiler.SQLCompiler.function_argspec(self, fn, **kw)
         else:
             return ""
 
     def default_from(self):
-        self.dialect.trace_process('DMCompiler', 'default_from')
         return " FROM DUAL"
     
-    def _generate_generic_unary_operator(self, unary, opstring, **kw):
-        self.dialect.trace_process('DMCompiler', '_generate_generic_unary_operator', unary, opstring, **kw)
+    def visit_label(self, label, within_label_clause=False,
+                    within_columns_clause=False, **kw):
+        if within_columns_clause and not within_label_clause and \
+                _exists_element(label.element) is not None:
+            # an EXISTS or NOT EXISTS selected as a column has to become
+            # a value
+            kw['_dm_exists_value'] = True
+        return super(DMCompiler, self).visit_label(
+            label, within_label_clause=within_label_clause,
+            within_columns_clause=within_columns_clause, **kw)
+
+    def _generate_generic_unary_operator(self, unary, opstring,
+                                         _dm_exists_value=False, **kw):
         if opstring == 'EXISTS ':
-            rs = 'SELECT COUNT(*) FROM ' + unary.element._compiler_dispatch(self, **kw)
-            return 'CASE WHEN (' + rs + ' AS R_EXISTS) > 0 THEN 1 ELSE 0 END '
+            if self.dialect.exists_as_count:
+                rs = 'SELECT COUNT(*) FROM ' + unary.element._compiler_dispatch(self, **kw)
+                return 'CASE WHEN (' + rs + ' AS R_EXISTS) > 0 THEN 1 ELSE 0 END '
+            text = opstring + unary.element._compiler_dispatch(self, **kw)
+            if _dm_exists_value:
+                return 'CASE WHEN ' + text + ' THEN 1 ELSE 0 END'
+            return text
+        if _dm_exists_value and opstring == 'NOT ':
+            # NOT EXISTS selected as a column
+            exists = _exists_element(unary)
+            if self.dialect.exists_as_count:
+                rs = 'SELECT COUNT(*) FROM ' + exists.element._compiler_dispatch(self, **kw)
+                return 'CASE WHEN (' + rs + ' AS R_EXISTS) > 0 THEN 0 ELSE 1 END '
+            return 'CASE WHEN NOT ' + exists._compiler_dispatch(self, **kw) + \
+                ' THEN 1 ELSE 0 END'
         return opstring + unary.element._compiler_dispatch(self, **kw)    
 
     def visit_join(self, join, from_linter=None, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_join', join, from_linter, **kwargs)
-        
         if self.dialect.use_ansi:
             return compiler.SQLCompiler.visit_join(
                 self, join, from_linter=from_linter, **kwargs
@@ -441,14 +388,11 @@ class DMCompiler(compiler.SQLCompiler):
             )
 
     def _get_nonansi_join_whereclause(self, froms):
-        self.dialect.trace_process('DMCompiler', '_get_nonansi_join_whereclause', froms)
         clauses = []
 
         def visit_join(join):
-            self.dialect.trace_process('DMCompiler', '_get_nonansi_join_whereclause:visit_join', join)
             if join.isouter:
                 def visit_binary(binary):
-                    self.dialect.trace_process('DMCompiler', '_get_nonansi_join_whereclause:visit_join:visit_binary', binary)
                     if binary.operator == sql_operators.eq:
                         if join.right.is_derived_from(binary.left.table):
                             binary.left = _OuterJoinColumn(binary.left)
@@ -475,19 +419,16 @@ class DMCompiler(compiler.SQLCompiler):
             return sql.and_(*clauses)
 
     def visit_outer_join_column(self, vc, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_outer_join_column', vc, **kw)
         return self.process(vc.column, **kw) + "(+)"
 
     def visit_sequence(self, seq, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_sequence', seq, **kw)
         return self.preparer.format_sequence(seq) + ".nextval"
 
     def get_render_as_alias_suffix(self, alias_name_text):
-        self.dialect.trace_process('DMCompiler', 'get_render_as_alias_suffix', alias_name_text)
         return " " + alias_name_text
 
-    def returning_clause(self, stmt, returning_cols):
-        self.dialect.trace_process('DMCompiler', 'returning_clause', stmt, returning_cols)
+    def returning_clause(self, stmt, returning_cols, *, populate_result_map,
+                         **kw):
         columns = []
         binds = []
         for i, column in enumerate(
@@ -514,37 +455,38 @@ class DMCompiler(compiler.SQLCompiler):
             else:
                 col_expr = column
             outparam = sql.outparam("ret_%d" % i, type_=column.type)
-            self.binds[outparam.key] = outparam
-            binds.append(self.bindparam_string(self._truncate_bindparam(outparam)))
+            binds.append(self.process(outparam))
             
             # ensure the ExecutionContext.get_out_parameters() method is
             # *not* called; the dm dialect wants to handle these
             # parameters separately
             self.has_out_parameters = False
+            self._dm_returning = True
             
             columns.append(self.process(col_expr, within_columns_clause=False))
 
-            self._add_to_result_map(
-                getattr(col_expr, "name", col_expr.anon_label),
-                getattr(col_expr, "name", col_expr.anon_label),
-                (
-                    column,
-                    getattr(column, "name", None),
-                    getattr(column, "key", None),
-                ),
-                column.type,
-            )
+            if populate_result_map:
+                self._add_to_result_map(
+                    getattr(col_expr, "name", col_expr._anon_name_label),
+                    getattr(col_expr, "name", col_expr._anon_name_label),
+                    (
+                        column,
+                        getattr(column, "name", None),
+                        getattr(column, "key", None),
+                    ),
+                    column.type,
+                )
 
         return 'RETURNING ' + ', '.join(columns) + " INTO " + ", ".join(binds)
 
     def _TODO_visit_compound_select(self, select):
         pass
 
-    def visit_select(self, select, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_select', select, **kwargs)
-        """Look for ``LIMIT`` and OFFSET in a select statement, and if
-        so tries to wrap it in a subquery with ``rownum`` criterion.
-        """
+    def translate_select_structure(self, select_stmt, **kwargs):
+        """add the WHERE criteria of non-ANSI joins, and for the
+        ``'rownum'`` pagination mode wrap a LIMIT / OFFSET select in
+        ``ROWNUM`` subqueries."""
+        select = select_stmt
 
         if not getattr(select, '_dm_visit', None):
             if not self.dialect.use_ansi:
@@ -555,93 +497,127 @@ class DMCompiler(compiler.SQLCompiler):
                     select = select.where(whereclause)
                     select._dm_visit = True
 
-            limit_clause = select._limit_clause
-            offset_clause = select._offset_clause
-            if limit_clause is not None or offset_clause is not None:
-                kwargs['select_wraps_for'] = select
-                select = select._generate()
-                select._dm_visit = True
-
-                # Wrap the middle select and add the hint
-                limitselect = sql.select([c for c in select.c])
-                if limit_clause is not None and \
-                    self.dialect.optimize_limits and \
-                        select._simple_int_limit:
-                    limitselect = limitselect.prefix_with(
-                        "/*+ FIRST_ROWS(%d) */" %
-                        select._limit)
-
-                limitselect._dm_visit = True
-                limitselect._is_wrapper = True
-
-                # add expressions to accommodate FOR UPDATE OF
-                for_update = select._for_update_arg
-                if for_update is not None and for_update.of:
-                    for_update = for_update._clone()
-                    for_update._copy_internals()
-
-                    for elem in for_update.of:
-                        select.append_column(elem)
-
-                    adapter = sql_util.ClauseAdapter(select)
-                    for_update.of = [
-                        adapter.traverse(elem)
-                        for elem in for_update.of]
-
-                # If needed, add the limiting clause
-                if limit_clause is not None:
-                    if not self.dialect.use_binds_for_limits:
-                        # use simple int limits, will raise an exception
-                        # if the limit isn't specified this way
-                        max_row = select._limit
-
-                        if offset_clause is not None:
-                            max_row += select._offset
-                        max_row = sql.literal_column("%d" % max_row)
-                    else:
-                        max_row = limit_clause
-                        if offset_clause is not None:
-                            max_row = max_row + offset_clause
-                    limitselect.append_whereclause(
-                        sql.literal_column("ROWNUM") <= max_row)
-
-                # If needed, add the dm_rn, and wrap again with offset.
-                if offset_clause is None:
-                    limitselect._for_update_arg = for_update
-                    select = limitselect
-                else:
-                    limitselect = limitselect.column(
-                        sql.literal_column("ROWNUM").label("dm_rn"))
-                    limitselect._dm_visit = True
-                    limitselect._is_wrapper = True
-
-                    offsetselect = sql.select(
-                        [c for c in limitselect.c if c.key != 'dm_rn'])
-                    offsetselect._dm_visit = True
-                    offsetselect._is_wrapper = True
-
-                    if for_update is not None and for_update.of:
-                        for elem in for_update.of:
-                            if limitselect.corresponding_column(elem) is None:
-                                limitselect.append_column(elem)
-
-                    if not self.dialect.use_binds_for_limits:
-                        offset_clause = sql.literal_column(
-                            "%d" % select._offset)
-                    offsetselect.append_whereclause(
-                        sql.literal_column("dm_rn") > offset_clause)
-
-                    offsetselect._for_update_arg = for_update
-                    select = offsetselect
-
-        return compiler.SQLCompiler.visit_select(self, select, **kwargs)
+            if select._has_row_limiting_clause and \
+                    select._fetch_clause is None and \
+                    self.dialect._pagination == 'rownum':
+                select = self._rownum_select(select, **kwargs)
+
+        return select
+
+    def _rownum_select(self, select, **kwargs):
+        limit_clause = select._limit_clause
+        offset_clause = select._offset_clause
+
+        if not self.dialect.use_binds_for_limits:
+            if select._simple_int_clause(limit_clause):
+                limit_clause = limit_clause.render_literal_execute()
+            if select._simple_int_clause(offset_clause):
+                offset_clause = offset_clause.render_literal_execute()
+
+        orig_select = select
+        select = select._generate()
+        select._dm_visit = True
+
+        # add expressions to accommodate FOR UPDATE OF
+        for_update = select._for_update_arg
+        if for_update is not None and for_update.of:
+            for_update = for_update._clone()
+            for_update._copy_internals()
+
+            for elem in for_update.of:
+                if not select.selected_columns.contains_column(elem):
+                    select = select.add_columns(elem)
+
+        # Wrap the middle select and add the hint
+        inner_subquery = select.alias()
+        limitselect = sql.select(*[
+            c for c in inner_subquery.c
+            if orig_select.selected_columns.corresponding_column(c)
+            is not None])
+
+        # the hint sits in a comment, where a bind placeholder would not
+        # be counted as a parameter: its argument is always rendered as a
+        # literal, from a copy of the limit under its own name, as the
+        # limit itself may stay a bind in the ROWNUM criterion
+        if limit_clause is not None and \
+                self.dialect.optimize_limits and \
+                select._simple_int_clause(limit_clause):
+            limitselect = limitselect.prefix_with(
+                DMHint('FIRST_ROWS', args=[self.process(
+                    limit_clause._clone().render_literal_execute(),
+                    **kwargs)]))
+
+        limitselect._dm_visit = True
+        limitselect._is_wrapper = True
+
+        if for_update is not None and for_update.of:
+            adapter = sql_util.ClauseAdapter(inner_subquery)
+            for_update.of = [
+                adapter.traverse(elem) for elem in for_update.of]
+
+        # If needed, add the limiting clause
+        if limit_clause is not None:
+            max_row = limit_clause
+            if offset_clause is not None:
+                max_row = max_row + offset_clause
+            limitselect = limitselect.where(
+                sql.literal_column("ROWNUM") <= max_row)
+
+        # If needed, add the dm_rn, and wrap again with offset.
+        if offset_clause is None:
+            limitselect._for_update_arg = for_update
+            return limitselect
+
+        limitselect = limitselect.add_columns(
+            sql.literal_column("ROWNUM").label("dm_rn"))
+        limitselect._dm_visit = True
+        limitselect._is_wrapper = True
+
+        if for_update is not None and for_update.of:
+            limitselect_cols = limitselect.selected_columns
+            for elem in for_update.of:
+                if limitselect_cols.corresponding_column(elem) is None:
+                    limitselect = limitselect.add_columns(elem)
+
+        limit_subquery = limitselect.alias()
+        origselect_cols = orig_select.selected_columns
+        offsetselect = sql.select(*[
+            c for c in limit_subquery.c
+            if origselect_cols.corresponding_column(c) is not None])
+        offsetselect._dm_visit = True
+        offsetselect._is_wrapper = True
+
+        if for_update is not None and for_update.of:
+            adapter = sql_util.ClauseAdapter(limit_subquery)
+            for_update.of = [
+                adapter.traverse(elem) for elem in for_update.of]
+
+        offsetselect = offsetselect.where(
+            sql.literal_column("dm_rn") > offset_clause)
+        offsetselect._for_update_arg = for_update
+        return offsetselect
+
+    def _row_limit_clause(self, select, **kw):
+        if select._fetch_clause is None and \
+                self.dialect._pagination == 'fetch':
+            return self.fetch_clause(
+                select, fetch_clause=select._limit_clause, **kw)
+        return super(DMCompiler, self)._row_limit_clause(select, **kw)
 
     def limit_clause(self, select, **kw):
-        self.dialect.trace_process('DMCompiler', 'limit_clause', select, **kw)
-        return super(DMCompiler, self).limit_clause(select, **kw)
+        if self.dialect._pagination == 'rownum':
+            return ""
+        text = ""
+        if select._limit_clause is not None:
+            text += "\n LIMIT " + self.process(select._limit_clause, **kw)
+            if select._offset_clause is not None:
+                text += " OFFSET " + self.process(select._offset_clause, **kw)
+        elif select._offset_clause is not None:
+            text += "\n OFFSET %s ROWS" % \
+                self.process(select._offset_clause, **kw)
+        return text
 
     def for_update_clause(self, select, **kw):
-        self.dialect.trace_process('DMCompiler', 'for_update_clause', select, **kw)
         if self.is_subquery():
             return ""
 
@@ -660,556 +636,31 @@ class DMCompiler(compiler.SQLCompiler):
 
         return tmp
     
-    #def construct_params(
-    #    self,
-    #    params=None,
-    #    _group_number=None,
-    #    _check=True,
-    #    extracted_parameters=None,
-    #    escape_names=True,
-    #):
-    #    self.dialect.trace_process('DMCompiler', 'construct_params', params, _group_number, _check, extracted_parameters, escape_names)
-    #    return super(DMCompiler, self).construct_params(params, _group_number, _check, extracted_parameters, escape_names)
-    
-    def current_executable(self):
-        self.dialect.trace_process('DMCompiler', 'current_executable')
-        return super(DMCompiler, self).current_executable()
-    
-    def delete_extra_from_clause(
-        self, update_stmt, from_table, extra_froms, from_hints, **kw
-    ):
-        self.dialect.trace_process('DMCompiler', 'construct_params', update_stmt, from_table, extra_froms, from_hints, **kw)
-        return super(DMCompiler, self).construct_params(update_stmt, from_table, extra_froms, from_hints, **kw)
-    
-    def delete_table_clause(self, delete_stmt, from_table, extra_froms):
-        self.dialect.trace_process('DMCompiler', 'delete_table_clause', delete_stmt, from_table, extra_froms)
-        return super(DMCompiler, self).delete_table_clause(delete_stmt, from_table, extra_froms)
-    
-    def escape_literal_column(self, text):
-        self.dialect.trace_process('DMCompiler', 'escape_literal_column', text)
-        return super(DMCompiler, self).escape_literal_column(text)
-    
-    def fetch_clause(self, select, **kw):
-        self.dialect.trace_process('DMCompiler', 'fetch_clause', select, **kw)
-        return super(DMCompiler, self).fetch_clause(select, **kw)
-        
-    def format_from_hint_text(self, sqltext, table, hint, iscrud):
-        self.dialect.trace_process('DMCompiler', 'format_from_hint_text', sqltext, table, hint, iscrud)
-        return super(DMCompiler, self).format_from_hint_text(sqltext, table, hint, iscrud)
-        
-    def get_crud_hint_text(self, table, text):
-        self.dialect.trace_process('DMCompiler', 'get_crud_hint_text', table, text)
-        return super(DMCompiler, self).get_crud_hint_text(table, text)
-        
-    def get_from_hint_text(self, table, text):
-        self.dialect.trace_process('DMCompiler', 'get_from_hint_text', table, text)
-        return super(DMCompiler, self).get_from_hint_text(table, text)
-        
-    def get_select_precolumns(self, select, **kw):
-        self.dialect.trace_process('DMCompiler', 'get_select_precolumns', select, **kw)
-        return super(DMCompiler, self).get_select_precolumns(select, **kw)
-        
-    def get_statement_hint_text(self, hint_texts):
-        self.dialect.trace_process('DMCompiler', 'get_statement_hint_text', hint_texts)
-        return super(DMCompiler, self).get_statement_hint_text(hint_texts)
-    
-    def group_by_clause(self, select, **kw):
-        self.dialect.trace_process('DMCompiler', 'group_by_clause', select, **kw)
-        return super(DMCompiler, self).group_by_clause(select, **kw)        
-        
-    def is_subquery(self):
-        self.dialect.trace_process('DMCompiler', 'is_subquery')
-        return super(DMCompiler, self).is_subquery()
-        
-    def order_by_clause(self, select, **kw):
-        self.dialect.trace_process('DMCompiler', 'order_by_clause', select, **kw)
-        return super(DMCompiler, self).order_by_clause(select, **kw)
-        
-    def post_process_text(self, text):
-        self.dialect.trace_process('DMCompiler', 'post_process_text', text)
-        return super(DMCompiler, self).post_process_text(text)
-        
-    #def prefetch(self):
-        #self.dialect.trace_process('DMCompiler', 'prefetch')
-        #return super(DMCompiler, self).prefetch()
-        
-    def render_literal_bindparam(
-        self, bindparam, render_literal_value=NO_ARG, **kw
-    ):
-        self.dialect.trace_process('DMCompiler', 'render_literal_bindparam', bindparam, render_literal_value, **kw)
-        return super(DMCompiler, self).render_literal_bindparam(bindparam, render_literal_value, **kw)
-        
-    def render_literal_value(self, value, type_):
-        self.dialect.trace_process('DMCompiler', 'render_literal_value', value, type_)
-        return super(DMCompiler, self).render_literal_value(value, type_)
-        
-    #def sql_compiler(self):
-        #self.dialect.trace_process('DMCompiler', 'sql_compiler')
-        #return super(DMCompiler, self).sql_compiler()
-        
-    def update_from_clause(self, update_stmt,
-                           from_table, extra_froms,
-                           from_hints,
-                           **kw):
-        self.dialect.trace_process('DMCompiler', 'update_from_clause', 
-                                   update_stmt, from_table, 
-                                   extra_froms, from_hints, 
-                                   **kw)
-        return super(DMCompiler, self).update_from_clause(update_stmt,
-                                                          from_table, extra_froms,
-                                                          from_hints,
-                                                          **kw)
-    def update_limit_clause(self, update_stmt):
-        self.dialect.trace_process('DMCompiler', 'update_limit_clause', update_stmt)
-        return super(DMCompiler, self).update_limit_clause(update_stmt)
-        
-    def update_tables_clause(self, update_stmt, from_table,
-                             extra_froms, **kw):
-        self.dialect.trace_process('DMCompiler', 'update_tables_clause',
-                                   update_stmt, from_table,
-                                   extra_froms, **kw)
-        return super(DMCompiler, self).update_tables_clause(update_stmt, from_table,
-                                                            extra_froms, **kw)
-        
-    def visit_alias(
-        self,
-        alias,
-        asfrom=False,
-        ashint=False,
-        iscrud=False,
-        fromhints=None,
-        subquery=False,
-        lateral=False,
-        enclosing_alias=None,
-        from_linter=None,
-        **kwargs
-    ):
-        self.dialect.trace_process('DMCompiler', 'visit_alias', alias, asfrom, ashint, iscrud, fromhints, subquery, lateral, enclosing_alias, from_linter, **kwargs)
-        return super(DMCompiler, self).visit_alias(alias, asfrom, ashint, iscrud, fromhints, subquery, lateral, enclosing_alias, from_linter, **kwargs)
-        
-    def visit_between_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_between_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_between_op_binary(binary, operator, **kw)
-        
-    def visit_binary(
-        self,
-        binary,
-        override_operator=None,
-        eager_grouping=False,
-        from_linter=None,
-        lateral_from_linter=None,
-        **kw
-    ):
-        self.dialect.trace_process('DMCompiler', 'visit_binary',  binary, override_operator, eager_grouping, from_linter, lateral_from_linter, **kw)
-        return super(DMCompiler, self).visit_binary(binary, override_operator, eager_grouping, from_linter, lateral_from_linter, **kw)
-        
-    def visit_bindparam(
-        self,
-        bindparam,
-        within_columns_clause=False,
-        literal_binds=False,
-        skip_bind_expression=False,
-        literal_execute=False,
-        render_postcompile=False,
-        **kwargs
-    ):
-        self.dialect.trace_process('DMCompiler', 'visit_bindparam', bindparam, within_columns_clause, literal_binds, skip_bind_expression, literal_execute, render_postcompile, **kwargs)
-        return super(DMCompiler, self).visit_bindparam(bindparam, within_columns_clause, literal_binds, skip_bind_expression, literal_execute, render_postcompile, **kwargs)
-        
-    def visit_case(self, clause, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_case', clause, **kwargs)
-        return super(DMCompiler, self).visit_case(clause, **kwargs)
-        
-    def visit_cast(self, cast, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_cast', cast, **kwargs)
-        return super(DMCompiler, self).visit_cast(cast, **kwargs)
-        
-    def visit_clauselist(self, clauselist, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_clauselist', clauselist, **kw)
-        return super(DMCompiler, self).visit_clauselist(clauselist, **kw)
-    
-    def visit_collation(self, element, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_collation', element, **kw)
-        return super(DMCompiler, self).visit_collation(element, **kw)
-        
-    def visit_column(
-        self,
-        column,
-        add_to_result_map=None,
-        include_table=True,
-        result_map_targets=(),
-        **kwargs
-    ):
-        self.dialect.trace_process('DMCompiler', 'visit_column', column, add_to_result_map, include_table, result_map_targets, **kwargs)
-        return super(DMCompiler, self).visit_column(column, add_to_result_map, include_table, result_map_targets, **kwargs)
-        
-    def visit_compound_select(
-        self, cs, asfrom=False, compound_index=None, **kwargs
-    ):
-        self.dialect.trace_process('DMCompiler', 'visit_compound_select', cs, asfrom, compound_index, **kwargs)
-        return super(DMCompiler, self).visit_compound_select(cs, asfrom, compound_index, **kwargs)
-        
-    def visit_contains_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_contains_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_contains_op_binary(binary, operator, **kw)
-        
-    def visit_cte(
-        self,
-        cte,
-        asfrom=False,
-        ashint=False,
-        fromhints=None,
-        visiting_cte=None,
-        from_linter=None,
-        **kwargs
-    ):
-        self.dialect.trace_process('DMCompiler', 'visit_cte', cte, asfrom, ashint, fromhints, visiting_cte, from_linter, **kwargs)
-        return super(DMCompiler, self).visit_cte(cte, asfrom, ashint, fromhints, visiting_cte, from_linter, **kwargs)
-        
-    def visit_custom_op_binary(self, element, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_custom_op_binary', element, operator, **kw)
-        return super(DMCompiler, self).visit_custom_op_binary(element, operator, **kw)
-        
-    def visit_custom_op_unary_modifier(self, element, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_custom_op_unary_modifier', element, operator, **kw)
-        return super(DMCompiler, self).visit_custom_op_unary_modifier(element, operator, **kw)
-        
-    def visit_custom_op_unary_operator(self, element, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_custom_op_unary_operator', element, operator, **kw)
-        return super(DMCompiler, self).visit_custom_op_unary_operator(element, operator, **kw)
-        
-    def visit_delete(self, delete_stmt, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_delete', delete_stmt, **kw)
-        return super(DMCompiler, self).visit_delete(delete_stmt, **kw)
-    
-    def visit_empty_set_expr(self, element_types):
-        self.dialect.trace_process('DMCompiler', 'visit_empty_set_expr', element_types)
-        return super(DMCompiler, self).visit_empty_set_expr(element_types)
-    
-    def visit_endswith_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_endswith_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_endswith_op_binary(binary, operator, **kw)
-        
-    def visit_extract(self, extract, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_extract', extract, **kwargs)
-        super(DMCompiler, self).visit_extract(extract, **kwargs)
-        
-    def visit_fromclause(self, fromclause, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_fromclause', fromclause, **kwargs)
-        return super(DMCompiler, self).visit_fromclause(fromclause, **kwargs)
-        
-    def visit_funcfilter(self, funcfilter, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_funcfilter', funcfilter, **kwargs)
-        super(DMCompiler, self).visit_funcfilter(funcfilter, **kwargs)
-        
-    def visit_function(self, func, add_to_result_map=None, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_function', func, add_to_result_map, **kwargs)
-        return super(DMCompiler, self).visit_function(func, add_to_result_map, **kwargs)
-    
-    def visit_function_as_comparison_op_binary(self, element, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_function_as_comparison_op_binary', element, operator, **kw)
-        return super(DMCompiler, self).visit_function_as_comparison_op_binary(element, operator, **kw)
-        
-    def visit_grouping(self, grouping, asfrom=False, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_grouping', grouping, asfrom, **kwargs)
-        return super(DMCompiler, self).visit_grouping(grouping, asfrom, **kwargs)
-        
-    def visit_ilike_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_ilike_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_ilike_op_binary(binary, operator, **kw)
-        
-    def visit_index(self, index, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_index', index, **kwargs)
-        return super(DMCompiler, self).visit_index(index, **kwargs)
-        
     def visit_insert(self, insert_stmt, **kw):
-        self.dialect.supports_multivalues_insert = True
-        self.dialect.trace_process('DMCompiler', 'visit_insert', insert_stmt, **kw)
-        return super(DMCompiler, self).visit_insert(insert_stmt, **kw)
-        
-    def visit_isfalse_unary_operator(self, element, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_isfalse_unary_operator', element, operator, **kw)
-        return super(DMCompiler, self).visit_isfalse_unary_operator(element, operator, **kw)
-        
-    def visit_istrue_unary_operator(self, element, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_istrue_unary_operator', element, operator, **kw)
-        return super(DMCompiler, self).visit_istrue_unary_operator(element, operator, **kw)
-        
-    def visit_label(
-        self,
-        label,
-        add_to_result_map=None,
-        within_label_clause=False,
-        within_columns_clause=False,
-        render_label_as_label=None,
-        result_map_targets=(),
-        **kw
-    ):
-        self.dialect.trace_process('DMCompiler', 'visit_label', 
-                                   label,
-                                   add_to_result_map,
-                                   within_label_clause,
-                                   within_columns_clause,
-                                   render_label_as_label,
-                                   result_map_targets,
-                                   **kw)
-        return super(DMCompiler, self).visit_label(label,
-                                   add_to_result_map,
-                                   within_label_clause,
-                                   within_columns_clause,
-                                   render_label_as_label,
-                                   result_map_targets,
-                                   **kw)
-        
-    def visit_label_reference(self, element, within_columns_clause=False, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_label_reference', element, within_columns_clause, **kwargs)
-        return super(DMCompiler, self).visit_label_reference(element, within_columns_clause, **kwargs)
-    
-    def visit_lambda_element(self, element, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_lambda_element', element, **kw)
-        return super(DMCompiler, self).visit_lambda_element(element, **kw)
-        
-    def visit_lateral(self, lateral, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_lateral', lateral, **kw)
-        return super(DMCompiler, self).visit_lateral(lateral, **kw)
-        
-    def visit_like_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_like_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_like_op_binary(binary, operator, **kw)
-        
-    def visit_next_value_func(self, next_value, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_next_value_func', next_value, **kw)
-        return super(DMCompiler, self).visit_next_value_func(next_value, **kw)
-        
-    def visit_not_between_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_not_between_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_not_between_op_binary(binary, operator, **kw)
-        
-    def visit_not_contains_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_not_contains_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_not_contains_op_binary(binary, operator, **kw)
-        
-    def visit_not_endswith_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_not_endswith_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_not_endswith_op_binary(binary, operator, **kw)
-        
-    def visit_not_ilike_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_not_ilike_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_not_ilike_op_binary(binary, operator, **kw)
-        
-    def visit_not_like_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_not_like_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_not_like_op_binary(binary, operator, **kw)
-        
-    def visit_not_match_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_not_match_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_not_match_op_binary(binary, operator, **kw)
-        
-    def visit_not_startswith_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_not_startswith_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_not_startswith_op_binary(binary, operator, **kw)
-        
-    def visit_null(self, expr, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_null', expr, **kw)
-        return super(DMCompiler, self).visit_null(expr, **kw)
-        
-    def visit_over(self, over, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_over', over, **kwargs)
-        return super(DMCompiler, self).visit_over(over, **kwargs)
-        
-    def visit_release_savepoint(self, savepoint_stmt):
-        self.dialect.trace_process('DMCompiler', 'visit_release_savepoint', savepoint_stmt)
-        return super(DMCompiler, self).visit_release_savepoint(savepoint_stmt)
-        
-    def visit_rollback_to_savepoint(self, savepoint_stmt):
-        self.dialect.trace_process('DMCompiler', 'visit_rollback_to_savepoint', savepoint_stmt)
-        return super(DMCompiler, self).visit_rollback_to_savepoint(savepoint_stmt)
-        
-    def visit_savepoint(self, savepoint_stmt):
-        self.dialect.trace_process('DMCompiler', 'visit_savepoint', savepoint_stmt)
-        return super(DMCompiler, self).visit_savepoint(savepoint_stmt)
-    
-    def visit_scalar_function_column(self, element, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_scalar_function_column', element, **kw)
-        return super(DMCompiler, self).visit_scalar_function_column(element, **kw)        
-        
-    def visit_select(
-        self,
-        select_stmt,
-        asfrom=False,
-        insert_into=False,
-        fromhints=None,
-        compound_index=None,
-        select_wraps_for=None,
-        lateral=False,
-        from_linter=None,
-        **kwargs
-    ):    
-        self.dialect.trace_process('DMCompiler', 'visit_select', 
-                                   select_stmt,
-                                   asfrom,
-                                   insert_into,
-                                   fromhints,
-                                   compound_index,
-                                   select_wraps_for,
-                                   lateral,
-                                   from_linter,
-                                   **kwargs)
-        return super(DMCompiler, self).visit_select(
-                                   select_stmt,
-                                   asfrom,
-                                   insert_into,
-                                   fromhints,
-                                   compound_index,
-                                   select_wraps_for,
-                                   lateral,
-                                   from_linter,
-                                   **kwargs)
-        
-    def visit_startswith_op_binary(self, binary, operator, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_startswith_op_binary', binary, operator, **kw)
-        return super(DMCompiler, self).visit_startswith_op_binary(binary, operator, **kw)
-    
-    def visit_subquery(self, subquery, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_subquery', subquery, **kw)
-        return super(DMCompiler, self).visit_subquery(subquery, **kw)
-        
-    def visit_table(
-        self,
-        table,
-        asfrom=False,
-        iscrud=False,
-        ashint=False,
-        fromhints=None,
-        use_schema=True,
-        from_linter=None,
-        **kwargs
-    ):
-        self.dialect.trace_process('DMCompiler', 'visit_table', 
-                                   table,
-                                   asfrom,
-                                   iscrud,
-                                   ashint,
-                                   fromhints,
-                                   use_schema,
-                                   from_linter,
-                                   **kwargs)
-        return super(DMCompiler, self).visit_table(table, asfrom, iscrud, ashint, fromhints, use_schema, from_linter, **kwargs)
-        
-    def visit_tablesample(self, tablesample, asfrom=False, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_tablesample', tablesample, asfrom, **kw)
-        return super(DMCompiler, self).visit_tablesample(tablesample, asfrom, **kw)
-    
-    def visit_table_valued_alias(self, element, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_table_valued_alias', element, **kw)
-        return super(DMCompiler, self).visit_table_valued_alias(element, **kw)
-    
-    def visit_table_valued_column(self, element, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_table_valued_column', element, **kw)
-        return super(DMCompiler, self).visit_table_valued_column(element, **kw)
-        
-    def visit_textclause(self, textclause, add_to_result_map=None, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_textclause', textclause, add_to_result_map, **kw)
-        return super(DMCompiler, self).visit_textclause(textclause, add_to_result_map, **kw)
-        
-    def visit_textual_label_reference(self, element, within_columns_clause=False, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_textual_label_reference', 
-                                   element, within_columns_clause, **kwargs)
-        return super(DMCompiler, self).visit_textual_label_reference(element, within_columns_clause, **kwargs)
-        
-    def visit_text_as_from(self, taf,
-                           compound_index=None,
-                           asfrom=False,
-                           parens=True, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_text_as_from',
-                                   taf, compound_index,
-                                   asfrom, parens, **kw)
-        return super(DMCompiler, self).visit_text_as_from(taf, compound_index, asfrom, parens, **kw)
-    
-    def visit_tuple(self, clauselist, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_tuple', clauselist, **kw)
-        return super(DMCompiler, self).visit_tuple(clauselist, **kw)        
-        
-    def visit_typeclause(self, typeclause, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_typeclause', typeclause, **kw)
-        return super(DMCompiler, self).visit_typeclause(typeclause, **kw)
-        
-    def visit_type_coerce(self, type_coerce, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_type_coerce', type_coerce, **kw)
-        return super(DMCompiler, self).visit_type_coerce(type_coerce, **kw)
-        
-    def visit_unary(
-        self, unary, add_to_result_map=None, result_map_targets=(), **kw
-    ):
-        self.dialect.trace_process('DMCompiler', 'visit_unary', unary, add_to_result_map, result_map_targets, **kw)
-        return super(DMCompiler, self).visit_unary(unary, add_to_result_map, result_map_targets, **kw)
-        
-    def visit_update(self, update_stmt, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_update', update_stmt, **kw)
-        return super(DMCompiler, self).visit_update(update_stmt, **kw)
-    
-    def visit_values(self, element, asfrom=False, from_linter=None, **kw):
-        self.dialect.trace_process('DMCompiler', 'visit_values', element, asfrom, from_linter, **kw)
-        return super(DMCompiler, self).visit_values(element, asfrom, from_linter, **kw)
-        
-    def visit_withingroup(self, withingroup, **kwargs):
-        self.dialect.trace_process('DMCompiler', 'visit_withingroup', withingroup, **kwargs)
-        return super(DMCompiler, self).visit_withingroup(withingroup, **kwargs)
-        
-    def _add_to_result_map(self, keyname, name, objects, type_):
-        self.dialect.trace_process('DMCompiler', '_add_to_result_map', keyname, name, objects, type_)
-        super(DMCompiler, self)._add_to_result_map(keyname, name, objects, type_)
-        
-    def _anonymize(self, name):
-        self.dialect.trace_process('DMCompiler', '_anonymize', name)
-        return super(DMCompiler, self)._anonymize(name)
-        
-    def _process_anon(self, key):
-        self.dialect.trace_process('DMCompiler', '_process_anon', key)
-        return super(DMCompiler, self)._process_anon(key)
-        
-    def _render_cte_clause(
-        self,
-        nesting_level=None,
-        include_following_stack=False,
-    ):
-        self.dialect.trace_process('DMCompiler', '_render_cte_clause', nesting_level, include_following_stack)
-        return super(DMCompiler, self)._render_cte_clause(nesting_level, include_following_stack)
-        
-    def _setup_crud_hints(self, stmt, table_text):
-        self.dialect.trace_process('DMCompiler', '_setup_crud_hints', stmt, table_text)
-        return super(DMCompiler, self)._setup_crud_hints(stmt, table_text)
-        
-    def _setup_select_hints(self, select):
-        self.dialect.trace_process('DMCompiler', '_setup_select_hints', select)
-        return super(DMCompiler, self)._setup_select_hints(select)
-        
-    def _setup_select_stack(self, select, compile_state, entry, asfrom, lateral, compound_index):
-        self.dialect.trace_process('DMCompiler', '_setup_select_stack', select, compile_state, entry, asfrom, lateral, compound_index)
-        return super(DMCompiler, self)._setup_select_stack(select, compile_state, entry, asfrom, lateral, compound_index)
-        
-    def _transform_result_map_for_nested_joins(self, select, transformed_select):
-        self.dialect.trace_process('DMCompiler', '_transform_result_map_for_nested_joins', 
-                                   select, transformed_select)
-        super(DMCompiler, self)._transform_result_map_for_nested_joins(select, transformed_select)
-        
-    def _transform_select_for_nested_joins(self, select):
-        self.dialect.trace_process('DMCompiler', '_transform_select_for_nested_joins', select)
-        return super(DMCompiler, self)._transform_select_for_nested_joins(select)
-        
-    def _truncated_identifier(self, ident_class, name):
-        self.dialect.trace_process('DMCompiler', '_truncated_identifier', ident_class, name)
-        return super(DMCompiler, self)._truncated_identifier(ident_class, name)
-        
-    def _truncate_bindparam(self, bindparam):
-        self.dialect.trace_process('DMCompiler', '_truncate_bindparam', bindparam)
-        return super(DMCompiler, self)._truncate_bindparam(bindparam)
+        text = super(DMCompiler, self).visit_insert(insert_stmt, **kw)
+        if self.postfetch_lastrowid and not self.for_executemany and \
+                self.dialect._pk_fetch_mode(insert_stmt.table) == 'returning':
+            text += self._returning_pk_into(insert_stmt.table)
+        return text
+
+    def _returning_pk_into(self, table):
+        """fetch the autoincrement value with the INSERT itself, as
+        ``RETURNING <col> INTO <outparam>``, instead of selecting it back
+        by rowid afterwards."""
+        column = table._autoincrement_column
+        outparam = sql.outparam("dm_ret_pk", type_=column.type)
+        self._dm_returning_pk = outparam.key
+        text = " RETURNING %s INTO %s" % (
+            self.preparer.format_column(column), self.process(outparam))
+        # the execution context reads the variable itself; keep
+        # get_out_parameter_values() from being called
+        self.has_out_parameters = False
+        return text
+
 
 class DMDDLCompiler(compiler.DDLCompiler):
     
     def get_column_specification(self, column, **kwargs):
-        self.dialect.trace_process('DMDDLCompiler', 'get_column_specification', column, **kwargs)
-        
         colspec = self.preparer.format_column(column) + " " + \
             self.dialect.type_compiler.process(
                 column.type, type_expression=column)
@@ -1235,8 +686,6 @@ class DMDDLCompiler(compiler.DDLCompiler):
         return colspec        
 
     def define_constraint_cascades(self, constraint):
-        self.dialect.trace_process('DMDDLCompiler', 'define_constraint_cascades', constraint)
-        
         text = ""
         if constraint.ondelete is not None:
             text += " ON DELETE %s" % constraint.ondelete
@@ -1247,8 +696,6 @@ class DMDDLCompiler(compiler.DDLCompiler):
         return text
     
     def visit_unique_constraint(self, constraint, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_unique_constraint', constraint, **kw)
-        
         if len(constraint) == 0:
             return ''
         text = ""
@@ -1268,8 +715,6 @@ class DMDDLCompiler(compiler.DDLCompiler):
         return text    
 
     def visit_create_index(self, create, include_schema=False, include_table_schema=True, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_create_index', create, include_schema, include_table_schema, **kw)
-        
         index = create.element
         self._verify_index_table(index)
         preparer = self.preparer
@@ -1297,8 +742,6 @@ class DMDDLCompiler(compiler.DDLCompiler):
         return text
 
     def post_create_table(self, table):
-        self.dialect.trace_process('DMDDLCompiler', 'post_create_table', table)
-        
         table_opts = []
         opts = table.dialect_options['dm']
 
@@ -1315,143 +758,7 @@ class DMDDLCompiler(compiler.DDLCompiler):
                 ))
 
         return ''.join(table_opts)
-    
-    # for trace only
-    def construct_params(self, params=None, extracted_parameters=None):
-        self.dialect.trace_process('DMDDLCompiler', 'construct_params', params, extracted_parameters)
-        return super(DMDDLCompiler, self).construct_params(params, extracted_parameters)
-        
-    def create_table_constraints(
-        self, table, _include_foreign_key_constraints=None, **kw
-    ):
-        self.dialect.trace_process('DMDDLCompiler', 'create_table_constraints', 
-                                   table, _include_foreign_key_constraints, **kw)
-        return super(DMDDLCompiler, self).create_table_constraints(table, _include_foreign_key_constraints, **kw)
-        
-    def create_table_suffix(self, table):
-        self.dialect.trace_process('DMDDLCompiler', 'create_table_suffix', table)
-        return super(DMDDLCompiler, self).create_table_suffix(table)
-        
-    def define_constraint_deferrability(self, constraint):
-        self.dialect.trace_process('DMDDLCompiler', 'define_constraint_deferrability', constraint)
-        return super(DMDDLCompiler, self).define_constraint_deferrability(constraint)
-        
-    def define_constraint_match(self, constraint):
-        self.dialect.trace_process('DMDDLCompiler', 'define_constraint_match', constraint)
-        return super(DMDDLCompiler, self).define_constraint_match(constraint)
-        
-    def define_constraint_remote_table(self, constraint, table, preparer):
-        self.dialect.trace_process('DMDDLCompiler', 'define_constraint_remote_table', constraint, table, preparer)
-        return super(DMDDLCompiler, self).define_constraint_remote_table(constraint, table, preparer)
-        
-    def get_column_default_string(self, column):
-        self.dialect.trace_process('DMDDLCompiler', 'get_column_default_string', column)
-        return super(DMDDLCompiler, self).get_column_default_string(column)
-        
-    def get_identity_options(self, identity_options):
-        self.dialect.trace_process('DMDDLCompiler', 'get_identity_options', identity_options)
-        return super(DMDDLCompiler, self).get_identity_options(identity_options)        
-        
-    def visit_add_constraint(self, create, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_add_constraint', create, **kw)
-        return super(DMDDLCompiler, self).visit_add_constraint(create, **kw)
-        
-    def visit_check_constraint(self, constraint, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_check_constraint', constraint, **kw)
-        return super(DMDDLCompiler, self).visit_check_constraint(constraint, **kw)
-        
-    def visit_column_check_constraint(self, constraint, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_column_check_constraint', constraint, **kw)
-        return super(DMDDLCompiler, self).visit_column_check_constraint(constraint, **kw)
-    
-    def visit_computed_column(self, generated, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_computed_column', generated, **kw)
-        return super(DMDDLCompiler, self).visit_computed_column(generated, **kw)
-        
-    #def visit_create_column(self, create, first_pk=False):
-        #self.dialect.trace_process('DMDDLCompiler', 'visit_create_column', create, first_pk)
-        #return super(DMDDLCompiler, self).visit_create_column(create, first_pk)
-        
-    def visit_create_schema(self, create, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_create_schema', create, **kw)
-        return super(DMDDLCompiler, self).visit_create_schema(create, **kw)
-        
-    def visit_create_sequence(self, create, prefix=None, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_create_sequence', create, prefix, **kw)
-        return super(DMDDLCompiler, self).visit_create_sequence(create, prefix, **kw)
-        
-    def visit_create_table(self, create, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_create_table', create, **kw)
-        return super(DMDDLCompiler, self).visit_create_table(create, **kw)
-        
-    def visit_ddl(self, ddl, **kwargs):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_ddl', ddl, **kwargs)
-        return super(DMDDLCompiler, self).visit_ddl(ddl, **kwargs)
-        
-    #def visit_drop_constraint(self, drop):
-        #self.dialect.trace_process('DMDDLCompiler', 'visit_ddl', drop)
-        #return super(DMDDLCompiler, self).visit_ddl(drop)
-        
-    def visit_drop_column_comment(self, drop, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_drop_column_comment', drop, **kw)
-        return super(DMDDLCompiler, self).visit_drop_column_comment(drop, **kw)        
-        
-    def visit_drop_index(self, drop, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_drop_index', drop, **kw)
-        return super(DMDDLCompiler, self).visit_drop_index(drop, **kw)
-        
-    def visit_drop_schema(self, drop, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_drop_schema', drop, **kw)
-        return super(DMDDLCompiler, self).visit_drop_schema(drop, **kw)
-        
-    def visit_drop_sequence(self, drop, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_drop_sequence', drop, **kw)
-        return super(DMDDLCompiler, self).visit_drop_sequence(drop, **kw)
-        
-    def visit_drop_table(self, drop, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_drop_table', drop, **kw)
-        return super(DMDDLCompiler, self).visit_drop_table(drop, **kw)
-    
-    def visit_drop_table_comment(self, drop, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_drop_table_comment', drop, **kw)
-        return super(DMDDLCompiler, self).visit_drop_table_comment(drop, **kw)        
-        
-    def visit_drop_view(self, drop, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_drop_view', drop, **kw)
-        return super(DMDDLCompiler, self).visit_drop_view(drop, **kw)
-        
-    def visit_foreign_key_constraint(self, constraint, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_foreign_key_constraint', constraint, **kw)
-        return super(DMDDLCompiler, self).visit_foreign_key_constraint(constraint, **kw)
-    
-    def visit_identity_column(self, identity, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_identity_column', identity, **kw)
-        return super(DMDDLCompiler, self).visit_identity_column(identity, **kw)        
-        
-    def visit_primary_key_constraint(self, constraint, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_primary_key_constraint', constraint, **kw)
-        return super(DMDDLCompiler, self).visit_primary_key_constraint(constraint, **kw)
-    
-    def visit_set_column_comment(self, create, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_set_column_comment', create, **kw)
-        return super(DMDDLCompiler, self).visit_set_column_comment(create, **kw)
-    
-    def visit_set_table_comment(self, create, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_set_table_comment', create, **kw)
-        return super(DMDDLCompiler, self).visit_set_table_comment(create, **kw)
-    
-    def visit_table_or_column_check_constraint(self, constraint, **kw):
-        self.dialect.trace_process('DMDDLCompiler', 'visit_table_or_column_check_constraint', constraint, **kw)
-        return super(DMDDLCompiler, self).visit_table_or_column_check_constraint(constraint, **kw)
-        
-    def _prepared_index_name(self, index, include_schema=False):
-        self.dialect.trace_process('DMDDLCompiler', '_prepared_index_name', index, include_schema)
-        return super(DMDDLCompiler, self)._prepared_index_name(index, include_schema)
-        
-    def _verify_index_table(self, index):
-        self.dialect.trace_process('DMDDLCompiler', '_verify_index_table', index)
-        return super(DMDDLCompiler, self)._verify_index_table(index)
-        
+
 
 class DMIdentifierPreparer(compiler.IdentifierPreparer):
 
@@ -1459,9 +766,14 @@ class DMIdentifierPreparer(compiler.IdentifierPreparer):
     illegal_initial_characters = set(
         (str(dig) for dig in range(0, 10))).union(["_", "$"])
 
+    def __init__(self, dialect, **kwargs):
+        super(DMIdentifierPreparer, self).__init__(dialect, **kwargs)
+        if dialect.name_cache_size:
+            # asked for every bind parameter of every compile
+            self._bindparam_requires_quotes = lru_cache(
+                dialect.name_cache_size)(self._bindparam_requires_quotes)
+
     def _bindparam_requires_quotes(self, value):
-        self.dialect.trace_process('DMIdentifierPreparer', '_bindparam_requires_quotes', value)
-        
         """Return True if the given identifier requires quoting."""
         lc_value = value.lower()
         return (lc_value in self.reserved_words
@@ -1470,213 +782,254 @@ class DMIdentifierPreparer(compiler.IdentifierPreparer):
                 )
 
     def format_savepoint(self, savepoint):
-        self.dialect.trace_process('DMIdentifierPreparer', '_bindparam_requires_quotes', savepoint)
-        
         name = savepoint.ident.lstrip('_')
         return super(
             DMIdentifierPreparer, self).format_savepoint(savepoint, name)
     
     def _quote_free_identifiers(self, *ids):
-        self.dialect.trace_process('DMIdentifierPreparer', '_bindparam_requires_quotes', *ids)
-        
         """Unilaterally identifier-quote any number of strings."""
     
         return tuple([self.quote_identifier(i) for i in ids if i is not None])
-    
-    # for trace only
-    def format_alias(self, alias, name=None):
-        self.dialect.trace_process('DMIdentifierPreparer', 'format_alias', alias, name)
-        return super(DMIdentifierPreparer, self).format_alias(alias, name)
-        
-    #def format_column(self, column, use_table=False,
-                      #name=None, table_name=None):
-        #self.dialect.trace_process('DMIdentifierPreparer', 'format_column', column, use_table, name, table_name)
-        #return super(DMIdentifierPreparer, self).format_column(column, use_table, name, table_name)
-        
-    #def format_constraint(self, naming, constraint):
-        #self.dialect.trace_process('DMIdentifierPreparer', 'format_constraint', naming, constraint)
-        #return super(DMIdentifierPreparer, self).format_constraint(naming, constraint)
-        
-    def format_label(self, label, name=None):
-        self.dialect.trace_process('DMIdentifierPreparer', 'format_label', label, name)
-        return super(DMIdentifierPreparer, self).format_label(label, name)
-        
-    def format_schema(self, name):
-        self.dialect.trace_process('DMIdentifierPreparer', 'format_schema', name)
-        return super(DMIdentifierPreparer, self).format_schema(name)
-        
-    def format_sequence(self, sequence, use_schema=True):
-        self.dialect.trace_process('DMIdentifierPreparer', 'format_sequence', sequence, use_schema)
-        return super(DMIdentifierPreparer, self).format_sequence(sequence, use_schema)
-        
-    def format_table(self, table, use_schema=True, name=None):
-        self.dialect.trace_process('DMIdentifierPreparer', 'format_table', table, use_schema, name)
-        return super(DMIdentifierPreparer, self).format_table(table, use_schema, name)
-        
-    def format_table_seq(self, table, use_schema=True):
-        self.dialect.trace_process('DMIdentifierPreparer', 'format_table_seq', table, use_schema)
-        return super(DMIdentifierPreparer, self).format_table_seq(table, use_schema)
-        
+
 
 class DMExecutionContext(default.DefaultExecutionContext):
+    # out variable bound to RETURNING ... INTO, see
+    # DMCompiler._returning_pk_into()
+    _dm_returning_var = None
+
     def fire_sequence(self, seq, type_):
-        self.dialect.trace_process('DMExecutionContext', 'fire_sequence', seq, type_)
-        
         return self._execute_scalar(
             "SELECT " +
             self.dialect.identifier_preparer.format_sequence(seq) +
             ".nextval FROM DUAL", type_)
     
-    #def connection(self):
-        #self.dialect.trace_process('DMExecutionContext', 'connection')
-        #super(DMExecutionContext, self).connection()
-        
-    #def engine(self):
-        #self.dialect.trace_process('DMExecutionContext', 'engine')
-        #super(DMExecutionContext, self).engine()
-        
-    # for trace only
-    def get_insert_default(self, column):
-        self.dialect.trace_process('DMExecutionContext', 'get_insert_default', column)
-        return super(DMExecutionContext, self).get_insert_default(column)
-        
-    def get_lastrowid(self):
-        self.dialect.trace_process('DMExecutionContext', 'get_lastrowid')
-        return super(DMExecutionContext, self).get_lastrowid()
-        
-    def get_result_processor(self, type_, colname, coltype):
-        self.dialect.trace_process('DMExecutionContext', 'get_result_processor', type_, colname, coltype)
-        return super(DMExecutionContext, self).get_result_processor(type_, colname, coltype)
-        
-    def get_update_default(self, column):
-        self.dialect.trace_process('DMExecutionContext', 'get_update_default', column)
-        return super(DMExecutionContext, self).get_update_default(column)
-        
-    def lastrow_has_defaults(self):
-        self.dialect.trace_process('DMExecutionContext', 'lastrow_has_defaults')
-        return super(DMExecutionContext, self).lastrow_has_defaults()
-        
-    #def no_parameters(self):
-        #self.dialect.trace_process('DMExecutionContext', 'no_parameters')
-        #return super(DMExecutionContext, self).no_parameters()
-        
-    #def postfetch_cols(self):
-        #self.dialect.trace_process('DMExecutionContext', 'postfetch_cols')
-        #return super(DMExecutionContext, self).postfetch_cols()
-        
-    #def prefetch_cols(self):
-        #self.dialect.trace_process('DMExecutionContext', 'prefetch_cols')
-        #return super(DMExecutionContext, self).prefetch_cols()
-        
-    #def returning_cols(self):
-        #self.dialect.trace_process('DMExecutionContext', 'returning_cols')
-        #super(DMExecutionContext, self).returning_cols()
-        
-    #def rowcount(self):
-        #self.dialect.trace_process('DMExecutionContext', 'rowcount')
-        #return super(DMExecutionContext, self).rowcount()
-        
-    def set_input_sizes(self, translate=None, exclude_types=None):
-        self.dialect.trace_process('DMExecutionContext', 'set_input_sizes', translate, exclude_types)
-        super(DMExecutionContext, self).set_input_sizes(translate, exclude_types)
-        
-    #def should_autocommit(self):
-        #self.dialect.trace_process('DMExecutionContext', 'should_autocommit')
-        #return super(DMExecutionContext, self).should_autocommit()
-        
-    #def should_autocommit_text(self, statement):
-        #self.dialect.trace_process('DMExecutionContext', 'should_autocommit_text', statement)
-        #return super(DMExecutionContext, self).should_autocommit_text(statement)
-        
-    def supports_sane_multi_rowcount(self):
-        self.dialect.trace_process('DMExecutionContext', 'supports_sane_multi_rowcount')
-        return super(DMExecutionContext, self).supports_sane_multi_rowcount()
-        
-    def supports_sane_rowcount(self):
-        self.dialect.trace_process('DMExecutionContext', 'supports_sane_rowcount')
-        return super(DMExecutionContext, self).supports_sane_rowcount()
-        
-    def _execute_scalar(self, stmt, type_, parameters=None):
-        self.dialect.trace_process('DMExecutionContext', '_execute_scalar', stmt, type_, parameters)
-        return super(DMExecutionContext, self)._execute_scalar(stmt, type_, parameters)
-        
-    #def _exec_default(self, default, type_):
-        #self.dialect.trace_process('DMExecutionContext', '_exec_default', default, type_)
-        #return super(DMExecutionContext, self)._exec_default(default, type_)
-    
-    def _process_executemany_defaults(self):
-        self.dialect.trace_process('DMExecutionContext', '_process_executemany_defaults')
-        super(DMExecutionContext, self)._process_executemany_defaults()
-        
-    def _process_executesingle_defaults(self):
-        self.dialect.trace_process('DMExecutionContext', '_process_executesingle_defaults')
-        super(DMExecutionContext, self)._process_executesingle_defaults()
-        
-    def _setup_crud_result_proxy(self):
-        self.dialect.trace_process('DMExecutionContext', '_setup_crud_result_proxy')
-        return super(DMExecutionContext, self)._setup_crud_result_proxy()
-        
-    def _setup_ins_pk_from_empty(self):
-        self.dialect.trace_process('DMExecutionContext', '_setup_ins_pk_from_empty')
-        super(DMExecutionContext, self)._setup_ins_pk_from_empty()
-        
-    def _setup_ins_pk_from_implicit_returning(self, result, rows):
-        self.dialect.trace_process('DMExecutionContext', '_setup_ins_pk_from_implicit_returning', result, row)
-        super(DMExecutionContext, self)._setup_ins_pk_from_implicit_returning(result, row)
-        
     def _set_autoinc_col_from_lastrowid(self, table, autoinc_col, lastrowid):
-        self.dialect.trace_process('DMExecutionContext', '_set_autoinc_col_from_lastrowid')
         statement = "select {} from {} where rowid = '{}'".format(autoinc_col.name, table.name, lastrowid)
         self.dialect.do_execute(self.cursor, statement, None, None)
         return self.cursor.fetchone()[0]
         
     def _setup_ins_pk_from_lastrowid(self):
-        self.dialect.trace_process('DMExecutionContext', '_setup_ins_pk_from_lastrowid')
-        key_getter = self.compiled._within_exec_param_key_getter
         table = self.compiled.statement.table
         compiled_params = self.compiled_parameters[0]
         getter=self.compiled._inserted_primary_key_from_lastrowid_getter
-            
+
+        if self._dm_returning_var is not None:
+            value = self._dm_returning_var.getvalue()
+            if isinstance(value, list):
+                value = value[0] if value else None
+            return [getter(value, compiled_params)]
+
         lastrowid = self.get_lastrowid()
         if lastrowid is not None:
             autoinc_col = table._autoincrement_column
             if autoinc_col is not None:
-                # apply type post processors to the lastrowid
+                # lastrowid is a ROWID; integer keys are looked up from it
                 proc = autoinc_col.type._cached_result_processor(
                         self.dialect, None)
                 if proc is not None:
-                    rowid_dict = {'A': 0, 'B': 1, 'C': 2, 'D': 3, 'E': 4, 'F': 5, 'G': 6, 'H': 7, 'I': 8, 'J': 9,
-                                  'K': 10, 'L': 11,
-                                  'M': 12, 'N': 13, 'O': 14, 'P': 15, 'Q': 16, 'R': 17, 'S': 18, 'T': 19, 'U': 20,
-                                  'V': 21, 'W': 22,
-                                  'X': 23, 'Y': 24, 'Z': 25, 'a': 26, 'b': 27, 'c': 28, 'd': 29, 'e': 30, 'f': 31,
-                                  'g': 32, 'h': 33,
-                                  'i': 34, 'j': 35, 'k': 36, 'l': 37, 'm': 38, 'n': 39, 'o': 40, 'p': 41, 'q': 42,
-                                  'r': 43, 's': 44,
-                                  't': 45, 'u': 46, 'v': 47, 'w': 48, 'x': 49, 'y': 50, 'z': 51, '0': 52, '1': 53,
-                                  '2': 54, '3': 55,
-                                  '4': 56, '5': 57, '6': 58, '7': 59, '8': 60, '9': 61, '+': 62, '/': 63}
-                    lastrowid = self._set_autoinc_col_from_lastrowid(table, autoinc_col, lastrowid)
-                    
-            self.inserted_primary_key = [
-                    lastrowid if c is autoinc_col else
-                    compiled_params.get(key_getter(c), None)
-                    for c in table.primary_key
-                ]
+                    lastrowid = self._autoinc_from_lastrowid(
+                        table, autoinc_col, lastrowid)
+
+        return [getter(lastrowid, compiled_params)]
+
+    def _autoinc_from_lastrowid(self, table, autoinc_col, lastrowid):
+        """the autoincrement value of the row at ``lastrowid``; decoded
+        from the ROWID itself for tables whose key is their physical row
+        number (``dm_pk_fetch='rowid_decode'``), else selected back."""
+        if self.dialect._pk_fetch_mode(table) == 'rowid_decode':
+            rowid = decode_rowid(lastrowid)
+            if rowid is not None and rowid.rowno:
+                return rowid.rowno
+        return self._set_autoinc_col_from_lastrowid(
+            table, autoinc_col, lastrowid)
+
+
+def _traced_method(cls_str, func_str, fn, on_dialect=False):
+    @wraps(fn)
+    def wrapper(self, *args, **kw):
+        dialect = self if on_dialect else self.dialect
+        dialect.trace_process(cls_str, func_str, *args, **kw)
+        return fn(self, *args, **kw)
+    return wrapper
+
+
+# position of the execution context among the arguments of the dialect
+# methods the Connection calls for a statement
+_CONTEXT_ARGS = {
+    'do_execute': 3,
+    'do_executemany': 3,
+    'do_execute_no_params': 2,
+}
+
+
+def _spanned_method(cls_str, func_str, fn, on_dialect=False):
+    position = _CONTEXT_ARGS.get(func_str) if on_dialect else None
+
+    @wraps(fn)
+    def wrapper(self, *args, **kw):
+        if on_dialect:
+            dialect = self
+            if position is None:
+                context = None
+            elif len(args) > position:
+                context = args[position]
+            else:
+                context = kw.get('context')
         else:
-            # don't have a usable lastrowid, so
-            # do the same as _setup_ins_pk_from_empty
-            self.inserted_primary_key = [
-                    compiled_params.get(key_getter(c), None)
-                    for c in table.primary_key
-                ]
-
-        self.inserted_primary_key = [getter(lastrowid, self.compiled_parameters[0])]
-        return self.inserted_primary_key
-        
-    def _use_server_side_cursor(self):
-        self.dialect.trace_process('DMExecutionContext', '_use_server_side_cursor')
-        return super(DMExecutionContext, self)._use_server_side_cursor()
+            dialect = self.dialect
+            context = self
+        return dialect.span_tracer.call(
+            cls_str, func_str, fn, self, args, kw,
+            getattr(context, '_dm_statement', None))
+    return wrapper
+
+
+def _statement_init(init):
+    # the span of the statement opens with its execution context
+    @wraps(init)
+    def wrapper(cls, dialect, *args, **kw):
+        tracer = dialect.span_tracer
+        statement = tracer.begin_statement()
+        context = tracer.within(statement, init, cls, dialect, *args, **kw)
+        context._dm_statement = statement
+        return context
+    return classmethod(wrapper)
+
+
+def _statement_end(fn):
+    # ... and closes once its result is set up, or its DBAPI error handled
+    @wraps(fn)
+    def wrapper(self, *args, **kw):
+        try:
+            return fn(self, *args, **kw)
+        finally:
+            statement = self.__dict__.pop('_dm_statement', None)
+            if statement is not None:
+                self.dialect.span_tracer.end_statement(
+                    statement, type(self).__name__,
+                    getattr(self, 'statement', None))
+    return wrapper
+
+
+def _spanned_context_class(cls):
+    """:func:`_traced_class` of an execution context class for the span
+    tracer, making each statement one span with its calls under it."""
+    traced = _traced_class(cls, _spanned_method)
+    attrs = {'__module__': cls.__module__}
+    for name in ('_init_compiled', '_init_statement', '_init_ddl'):
+        attrs[name] = _statement_init(getattr(cls, name).__func__)
+    for name in ('_setup_result_proxy', 'handle_dbapi_exception'):
+        attrs[name] = _statement_end(getattr(traced, name))
+    return type(cls.__name__, (traced, ), attrs)
+
+
+def _traced_functions(cls, skip=()):
+    """yield (owner class name, method name, function) for every plain
+    method reachable from ``cls``, most derived definition winning."""
+    found = {}
+    for klass in reversed(cls.__mro__[:-1]):
+        for name, value in vars(klass).items():
+            if name.startswith('__') or name in skip or \
+                    not inspect.isfunction(value):
+                continue
+            found[name] = (klass.__name__, value)
+    for name, (owner, fn) in found.items():
+        yield owner, name, fn
+
+
+def _traced_class(cls, method_factory=_traced_method):
+    """return a subclass of ``cls`` whose methods report to
+    ``dialect.trace_process`` (or the dialect's span tracer) when run.
+
+    Installed by :class:`.DMDialect` only when ``supports_trace=True``, so
+    the untraced compilers, preparer and execution context carry no
+    tracing cost at all.
+    """
+    attrs = dict(
+        (name, method_factory(owner, name, fn))
+        for owner, name, fn in _traced_functions(cls)
+    )
+    attrs['__module__'] = cls.__module__
+    return type(cls.__name__, (cls,), attrs)
+
+
+def _cached_name(fn, maxsize):
+    """LRU-cache a name conversion for plain strings; a
+    :class:`.quoted_name` carries its own quoting decision and always
+    goes through ``fn``."""
+    cached = lru_cache(maxsize)(fn)
+
+    @wraps(fn)
+    def convert(name):
+        if type(name) is str:
+            return cached(name)
+        return fn(name)
+    convert.cache_info = cached.cache_info
+    convert.cache_clear = cached.cache_clear
+    return convert
+
+
+class DMInspector(reflection.Inspector):
+    """with ``reflection_workers`` > 1, runs the ``get_multi_*`` reflection
+    categories of ``MetaData.reflect()`` concurrently, each on its own
+    pooled connection.
+
+    The workers read the committed catalog, so DDL not yet committed on
+    the inspector's own connection is not seen.  Reflection may hold up
+    to twice ``reflection_workers`` connections at once (categories plus
+    the batches of :meth:`.DMDialect._run_batches`); size the pool for it.
+    """
+
+    def _get_reflection_info(self, schema=None, filter_names=None,
+                             available=None, _reflect_info=None, **kw):
+        workers = self.dialect.reflection_workers
+        if workers <= 1:
+            return super(DMInspector, self)._get_reflection_info(
+                schema, filter_names, available, _reflect_info, **kw)
+
+        kw["schema"] = schema
+        kw["unreflectable"] = unreflectable = {}
+        # same heuristic as the sequential Inspector: with most tables
+        # asked for, reflect the whole schema without a name filter
+        if filter_names and available and len(filter_names) > 100:
+            fraction = len(filter_names) / len(available)
+        else:
+            fraction = None
+
+        def run(name, optional):
+            if fraction is None or fraction <= 0.5 or \
+                    not self.dialect._overrides_default(name):
+                names = filter_names
+            else:
+                names = None
+            with self.engine.connect() as conn:
+                insp = self._construct(self.__class__._init_connection, conn)
+                insp.info_cache = self.info_cache
+                try:
+                    return getattr(insp, name)(filter_names=names, **kw)
+                except NotImplementedError:
+                    if not optional:
+                        raise
+                    return {}
+
+        with ThreadPoolExecutor(
+                workers, thread_name_prefix='dm-reflect') as executor:
+            futures = [(field, executor.submit(run, name, optional))
+                       for field, name, optional in REFLECTION_CATEGORIES]
+            results = dict((field, future.result())
+                           for field, future in futures)
+
+        if not results['columns']:
+            # none of the tables exist; the sequential Inspector would not
+            # have run the other categories either
+            results = dict((field, {}) for field in results)
+
+        info = reflection._ReflectionInfo(
+            unreflectable=unreflectable, **results)
+        if _reflect_info:
+            _reflect_info.update(info)
+            return _reflect_info
+        return info
 
 
 class DMDialect(default.DefaultDialect):
@@ -1705,16 +1058,44 @@ class DMDialect(default.DefaultDialect):
     supports_comments = True
     supports_default_values = False
     supports_empty_insert = False
+    supports_multivalues_insert = True
+
+    # executemany() INSERTs with RETURNING are sent as multi-row VALUES
+    # batches of insertmanyvalues_page_size rows; plain executemany()
+    # stays on the driver's array binding.  Identity values ascend in
+    # VALUES order, so returned rows are matched to parameter sets by the
+    # autoincrement column.
+    use_insertmanyvalues = True
+    use_insertmanyvalues_wo_returning = False
+    insertmanyvalues_implicit_sentinel = \
+        InsertmanyvaluesSentinelOpts.ANY_AUTOINCREMENT
     
     supports_trace = False
     supports_trace_params = False
     outfile = None
+    span_tracer = None
+    metrics = None
+
+    name_cache_size = NAME_CACHE_SIZE
+    reflection_batch_size = REFLECTION_BATCH_SIZE
+    reflection_workers = 1
+    reflection_cache = None
+    _batch_executor = None
+
+    # set by the driver dialect when its cursors can bind out variables
+    _supports_returning_into = False
+
+    # how LIMIT / OFFSET is rendered: 'limit' (LIMIT n OFFSET m),
+    # 'fetch' (OFFSET m ROWS FETCH FIRST n ROWS ONLY) or 'rownum' (ROWNUM
+    # subqueries, for servers without either); see initialize()
+    _pagination = 'limit'
 
     statement_compiler = DMCompiler
     ddl_compiler = DMDDLCompiler
     type_compiler = DMTypeCompiler
     preparer = DMIdentifierPreparer
     execution_ctx_cls = DMExecutionContext
+    inspector = DMInspector
 
     reflection_options = ('dm_resolve_synonyms', )
 
@@ -1722,7 +1103,8 @@ class DMDialect(default.DefaultDialect):
         (sa_schema.Table, {
             "resolve_synonyms": False,
             "on_commit": None,
-            "compress": False
+            "compress": False,
+            "pk_fetch": None
         }),
         (sa_schema.Index, {
             "bitmap": False,
@@ -1737,17 +1119,248 @@ class DMDialect(default.DefaultDialect):
                  exclude_tablespaces=('SYSTEM', 'SYSAUX', ),
                  supports_trace=False,
                  supports_trace_params=False,                 
+                 trace_path='sqlalchemy_dm_trace.log',
+                 trace_max_bytes=0,
+                 trace_backup_count=1,
+                 trace_queue_size=10000,
+                 trace_overflow='drop',
+                 trace_format='text',
+                 trace_sample_rate=1,
+                 collect_metrics=False,
+                 insert_pk_fetch=None,
+                 pagination='auto',
+                 exists_as_count=False,
+                 name_cache_size=NAME_CACHE_SIZE,
+                 reflection_batch_size=REFLECTION_BATCH_SIZE,
+                 reflection_workers=1,
+                 reflection_cache_path=None,
                  **kwargs):
+        # read by the preparer, created in DefaultDialect.__init__
+        self.name_cache_size = name_cache_size
         self.supports_trace = supports_trace
         self.supports_trace_params = supports_trace_params        
+        if self.supports_trace:
+            if trace_format not in TRACE_FORMATS:
+                raise exc.ArgumentError(
+                    "trace_format must be one of %s, got %r" %
+                    (", ".join(TRACE_FORMATS), trace_format))
+            self.outfile = DMTraceWriter(trace_path,
+                                         max_bytes=trace_max_bytes,
+                                         backup_count=trace_backup_count,
+                                         queue_size=trace_queue_size,
+                                         overflow=trace_overflow,
+                                         header='[\n' if trace_format == 'chrome' else None)
+            if trace_format != 'text':
+                self.span_tracer = DMSpanTracer(
+                    self.outfile, trace_format, trace_sample_rate,
+                    record_args=supports_trace_params)
+            self._install_tracing()
         default.DefaultDialect.__init__(self, **kwargs)
         self.use_ansi = use_ansi
         self.optimize_limits = optimize_limits
         self.use_binds_for_limits = use_binds_for_limits
         self.exclude_tablespaces = exclude_tablespaces
-        
-        if self.supports_trace:
-            self.outfile = open('sqlalchemy_dm_trace.log', 'a')
+        self.insert_pk_fetch = self._check_pk_fetch(insert_pk_fetch)
+        if pagination not in PAGINATION_MODES:
+            raise exc.ArgumentError(
+                "pagination must be one of %s, got %r" %
+                (", ".join(PAGINATION_MODES), pagination))
+        self.pagination = pagination
+        self.exists_as_count = exists_as_count
+        if reflection_batch_size < 1:
+            raise exc.ArgumentError(
+                "reflection_batch_size must be a positive integer, got %r" %
+                (reflection_batch_size, ))
+        self.reflection_batch_size = reflection_batch_size
+        self.reflection_workers = max(int(reflection_workers), 1)
+        self._batch_executor_lock = threading.Lock()
+        if pagination != 'auto':
+            self._pagination = pagination
+        if name_cache_size:
+            self.normalize_name = _cached_name(
+                self.normalize_name, name_cache_size)
+            self.denormalize_name = _cached_name(
+                self.denormalize_name, name_cache_size)
+
+        if reflection_cache_path:
+            self.reflection_cache = DMReflectionCache(reflection_cache_path)
+            self._install_reflection_cache()
+
+        if collect_metrics:
+            self.metrics = DMMetrics()
+            self._install_metrics()
+
+    def _check_pk_fetch(self, mode):
+        if mode is not None and mode not in PK_FETCH_MODES:
+            raise exc.ArgumentError(
+                "pk_fetch must be one of %s, got %r" %
+                (", ".join(PK_FETCH_MODES), mode))
+        return mode
+
+    def _pk_fetch_mode(self, table):
+        """how the autoincrement value of a single-row INSERT into
+        ``table`` is fetched: ``'returning'`` (``RETURNING ... INTO``, same
+        round trip), ``'rowid'`` (a SELECT by ``cursor.lastrowid``) or
+        ``'rowid_decode'`` (the physical row number decoded from
+        ``cursor.lastrowid``, for tables whose identity column follows
+        it; falls back to the SELECT when the ROWID can't be decoded).
+
+        The table's ``dm_pk_fetch`` option wins over the dialect's
+        ``insert_pk_fetch``; with neither set, RETURNING is used whenever
+        the driver can bind out variables.
+        """
+        mode = table.dialect_options['dm']['pk_fetch'] \
+            if isinstance(table, sa_schema.Table) else None
+        mode = self._check_pk_fetch(mode) or self.insert_pk_fetch
+        if mode is None:
+            mode = 'returning' if self._supports_returning_into else 'rowid'
+        return mode
+
+    def _install_tracing(self):
+        """route every dialect, compiler, preparer and execution context
+        method through :meth:`.trace_process`, or through the span tracer
+        when a structured ``trace_format`` is used.
+
+        Nothing in the untraced classes calls :meth:`.trace_process`; the
+        traced variants are built here, per dialect instance, and must be
+        in place before ``DefaultDialect.__init__`` instantiates the
+        preparer and type compiler.
+        """
+        if self.span_tracer is not None:
+            factory = _spanned_method
+        else:
+            factory = _traced_method
+
+        for attr in ('statement_compiler', 'ddl_compiler', 'type_compiler',
+                     'preparer'):
+            setattr(self, attr, _traced_class(getattr(self, attr), factory))
+        if self.span_tracer is not None:
+            self.execution_ctx_cls = _spanned_context_class(
+                self.execution_ctx_cls)
+        else:
+            self.execution_ctx_cls = _traced_class(
+                self.execution_ctx_cls, factory)
+
+        skip = ('trace_process', '_install_tracing',
+                '_handle_synonyms_decorator')
+        for owner, name, fn in _traced_functions(type(self), skip):
+            traced = factory(owner, name, fn, on_dialect=True)
+            setattr(self, name, traced.__get__(self, type(self)))
+
+    def _install_metrics(self):
+        """time DBAPI calls into ``self.metrics``; like tracing, the
+        wrappers only exist on dialects created with
+        ``collect_metrics=True``."""
+        metrics = self.metrics
+        for name in ('do_execute', 'do_executemany'):
+            setattr(self, name, metrics.timed_execute(name, getattr(self, name)))
+        for name in ('do_commit', 'connect'):
+            setattr(self, name, metrics.timed(name, getattr(self, name)))
+        for name in REFLECTION_METHODS:
+            setattr(self, name, metrics.reflecting(getattr(self, name)))
+
+    def name_cache_info(self):
+        """return hits, misses, maxsize and currsize of the identifier
+        caches (``bindparam_quotes``, ``normalize_name``,
+        ``denormalize_name``); empty with ``name_cache_size=0``."""
+        caches = {
+            'bindparam_quotes':
+                self.identifier_preparer._bindparam_requires_quotes,
+            'normalize_name': self.normalize_name,
+            'denormalize_name': self.denormalize_name,
+        }
+        return dict((name, fn.cache_info()._asdict())
+                    for name, fn in caches.items()
+                    if hasattr(fn, 'cache_info'))
+
+    def _install_reflection_cache(self):
+        """serve the ``get_multi_*`` reflection categories from
+        ``self.reflection_cache``; like metrics, the wrappers only exist
+        on dialects created with ``reflection_cache_path``."""
+        for field, name, optional in REFLECTION_CATEGORIES:
+            setattr(self, name, self._cached_reflection(
+                name, getattr(self, name)))
+
+    def _cached_reflection(self, category, fn):
+        cache = self.reflection_cache
+
+        @wraps(fn)
+        def get_multi(connection, **kw):
+            # DB links and synonyms are resolved elsewhere; not cached
+            if kw.get('dblink') or kw.get('dm_resolve_synonyms'):
+                return fn(connection, **kw)
+
+            server = "%s %s" % (
+                connection.engine.url.render_as_string(hide_password=True),
+                self.server_version_info)
+            owner = self.denormalize_name(
+                kw.get('schema') or self.default_schema_name)
+            # the result keys and table set depend on all of these
+            key = "%s %r %r %r %r" % (
+                category, kw.get('schema'), kw.get('kind'),
+                kw.get('scope'), kw.get('include_all', False))
+            markers = self._ddl_markers(
+                connection, owner, info_cache=kw.get('info_cache'))
+
+            filter_names = kw.get('filter_names')
+            if filter_names is None:
+                listing = cache.load_listing(server, owner, key)
+                if listing is None or listing[0] != sorted(markers):
+                    # first run, or tables were created or dropped
+                    result = list(fn(connection, **kw))
+                    cache.store_listing(server, owner, key, markers,
+                                        [name for (_, name), _ in result])
+                    cache.store(server, owner, key, [
+                        (name, markers[name], ((schema, name), value))
+                        for (schema, name), value in result
+                        if name in markers])
+                    return result
+                names = listing[1]
+            else:
+                names = list(filter_names)
+
+            found, misses = cache.load(server, owner, key, markers, names)
+            if misses:
+                fresh = dict(
+                    (name, ((schema, name), value))
+                    for (schema, name), value in fn(
+                        connection, **dict(kw, filter_names=misses)))
+                # None records that the category returned nothing for it
+                cache.store(server, owner, key, [
+                    (name, markers[name], fresh.get(name))
+                    for name in misses if name in markers])
+                found.update(fresh)
+            return [found[name] for name in names
+                    if found.get(name) is not None]
+        return get_multi
+
+    @reflection.cache
+    def _ddl_markers(self, connection, owner, **kw):
+        """``{table or view name: last DDL time}`` for ``owner``, the
+        change markers of the persistent reflection cache."""
+        rows = connection.execute(
+            sql.text("SELECT object_name, last_ddl_time FROM all_objects "
+                     "WHERE owner = :owner "
+                     "AND object_type IN ('TABLE', 'VIEW')"),
+            {"owner": owner}).all()
+        names = self._normalize_names([row[0] for row in rows])
+        return dict((name, str(row[1])) for name, row in zip(names, rows))
+
+    def metrics_snapshot(self, reset=False, prometheus_path=None):
+        """return call counts and latency percentiles (microseconds) as
+        ``{operation: {statement kind: stats}}``.
+
+        Requires ``collect_metrics=True``.  With ``prometheus_path``, the
+        snapshot is also written there in Prometheus text format.
+        """
+        if self.metrics is None:
+            raise exc.InvalidRequestError(
+                "metrics are not collected; create the engine with "
+                "collect_metrics=True")
+        snapshot = self.metrics.snapshot(reset)
+        if prometheus_path:
+            self.metrics.write_prometheus(prometheus_path, snapshot)
+        return snapshot
 
     def initialize(self, connection):
         super(DMDialect, self).initialize(connection)
@@ -1756,60 +1369,44 @@ class DMDialect(default.DefaultDialect):
             self.server_version_info > (10, )
         )
         self.default_schema_name = self._get_default_schema_name(connection)
+        if self.pagination == 'auto':
+            # LIMIT and OFFSET / FETCH are native from DM 7 on
+            self._pagination = 'limit' \
+                if self.server_version_info >= (7, ) else 'rownum'
         
     def trace_process(self, cls_str=None, func_str=None, *args, **kws):
         if not self.supports_trace:
             return
         now = datetime.now().isoformat()
-        self.outfile.write('{}\n'.format(now))
-        self.outfile.write('clsname:{}\n'.format(cls_str))
-        self.outfile.write('funcname:{}\n'.format(func_str))
-        
+        record = '{}\nclsname:{}\nfuncname:{}\n'.format(now, cls_str, func_str)
+
         if self.supports_trace_params:
-            self.outfile.write('args:{}\n'.format(args))
-            self.outfile.write('kws:{}\n'.format(kws))
-            
-        self.outfile.write('\n')
+            record += 'args:{}\nkws:{}\n'.format(args, kws)
+
+        self.outfile.write(record + '\n')
     
     @property
     def _supports_table_compression(self):
-        self.trace_process('DMDialect', '_supports_table_compression')
-        
         return self.server_version_info and \
             self.server_version_info >= (10, 1, )
 
     @property
     def _supports_table_compress_for(self):
-        self.trace_process('DMDialect', '_supports_table_compress_for')
         return self.server_version_info and \
             self.server_version_info >= (11, )
 
     @property
     def _supports_char_length(self):
-        self.trace_process('DMDialect', '_supports_char_length')
         return True
 
     @property
     def _supports_nchar(self):
-        self.trace_process('DMDialect', '_supports_nchar')
         return True
     
-    @property
-    def dialect_description(self):
-        self.trace_process('DMDialect', 'dialect_description')
-        return super(DMDialect, self).dialect_description()
-        
-    def do_close(self, dbapi_connection):
-        self.trace_process('DMDialect', 'do_close', dbapi_connection)
-        super(DMDialect, self).do_close(dbapi_connection)
-        
-    def do_commit(self, dbapi_connection):
-        self.trace_process('DMDialect', 'do_commit', dbapi_connection)
-        super(DMDialect, self).do_commit(dbapi_connection)
-        
     def do_execute(self, cursor, statement, parameters, context=None):
-        self.trace_process('DMDialect', 'do_execute', cursor, statement, parameters, context)
         if parameters != [] and parameters != None:
+            if isinstance(parameters, tuple):
+                parameters = list(parameters)
             for i in range(len(parameters)):
                 list_element = parameters[i]
                 if type(list_element) == list:
@@ -1821,22 +1418,15 @@ class DMDialect(default.DefaultDialect):
                     parameters[i] = list_element
         super(DMDialect, self).do_execute(cursor, statement, parameters, context)
         
-    def do_execute_no_params(self, cursor, statement, context=None):
-        self.trace_process('DMDialect', 'do_execute_no_params', cursor, statement, context)
-        super(DMDialect, self).do_execute_no_params(cursor, statement, context)
-
     def do_release_savepoint(self, connection, name):
-        self.trace_process('DMDialect', 'do_release_savepoint', connection, name)
         pass
     
     _isolation_lookup = ["READ COMMITTED", "SERIALIZABLE"]
 
     def get_isolation_level(self, connection):
-        self.trace_process('DMDialect', 'get_isolation_level', connection)
         raise NotImplementedError("implemented by dm dialect")
 
     def get_default_isolation_level(self, dbapi_conn):
-        self.trace_process('DMDialect', 'get_default_isolation_level', dbapi_conn)
         try:
             return self.get_isolation_level(dbapi_conn)
         except NotImplementedError:
@@ -1845,12 +1435,9 @@ class DMDialect(default.DefaultDialect):
             return "READ COMMITTED"
 
     def set_isolation_level(self, connection, level):
-        self.trace_process('DMDialect', 'set_isolation_level', connection, level)
         raise NotImplementedError("implemented by dm dialect")
 
     def has_table(self, connection, table_name, schema=None, dblink=None, **kw):
-        self.trace_process('DMDialect', 'has_table', connection, table_name, schema)
-        
         if not schema:
             schema = self.default_schema_name
         name = self.denormalize_name(table_name),
@@ -1861,8 +1448,6 @@ class DMDialect(default.DefaultDialect):
         return cursor.first() is not None
 
     def has_sequence(self, connection, sequence_name, schema=None):
-        self.trace_process('DMDialect', 'has_sequence', connection, sequence_name, schema)
-        
         if not schema:
             schema = self.default_schema_name
         cursor = connection.execute(
@@ -1874,7 +1459,6 @@ class DMDialect(default.DefaultDialect):
         return cursor.first() is not None
 
     def normalize_name(self, name):
-        self.trace_process('DMDialect', 'normalize_name', name)
         """convert the given name to lowercase if it is detected as
         case insensitive.
 
@@ -1893,7 +1477,6 @@ class DMDialect(default.DefaultDialect):
             return name
 
     def denormalize_name(self, name):
-        self.trace_process('DMDialect', 'denormalize_name', name)
         """convert the given name to a case insensitive identifier
         for the backend if it is an all-lowercase name.
 
@@ -1908,15 +1491,22 @@ class DMDialect(default.DefaultDialect):
             name = name.upper()
         return name
 
+    def _normalize_names(self, names):
+        """normalize a whole column of reflected names at once.
+
+        Reflection rows repeat the same table, owner and constraint names
+        many times over; each distinct name is converted only once.
+        """
+        normalized = dict((name, self.normalize_name(name))
+                          for name in set(names))
+        return [normalized[name] for name in names]
+
     def _get_default_schema_name(self, connection):
-        self.trace_process('DMDialect', '_get_default_schema_name', connection)
         return self.normalize_name(
             connection.execute(sql.text('SELECT USER FROM DUAL')).scalar())
 
     def _resolve_synonym(self, connection, desired_owner=None,
                          desired_synonym=None, desired_table=None):
-        self.trace_process('DMDialect', '_resolve_synonym', 
-                           connection, desired_owner, desired_synonym, desired_table)
         """search for a local synonym matching the given desired owner/name.
 
         if desired_owner is None, attempts to locate a distinct owner.
@@ -2013,39 +1603,91 @@ class DMDialect(default.DefaultDialect):
         else:
             return value
 
-    def _run_batches(self, connection, all_objects, query, query_fllow, dblink):
-        batches = list(all_objects)
-
-        while len(batches)>0:
-            batch = batches[0:500]
-            batches[0:500] = []
-
-            if dblink and not dblink.startswith("@"):
-                dblink = f"@{dblink}"
-
-            execution_options = {
-                "_dm_dblink": dblink or "",
-                "schema_translate_map": None,
-            }
-
-            temp_query = query
-
-            if(len(batch) != 0):
-                temp_query += '\''
-                temp_query += str(batch[0])
-                temp_query += '\''
+    def _run_batches(self, connection, all_objects, query, query_fllow,
+                     dblink, params=None):
+        """run ``query + IN list + query_fllow`` for ``all_objects`` in
+        batches of up to ``reflection_batch_size`` names, yielding the
+        result mappings.
+
+        The names are bound, not inlined: each batch is padded (by
+        repeating its last name) to the next of ``REFLECTION_IN_SIZES``
+        or to the batch size, so every reflection query has only a few
+        distinct texts and the server reuses their plans.  ``params``
+        holds any other bind values of the query.
+
+        With ``reflection_workers`` > 1 the batches run concurrently, each
+        on a pooled connection of the same engine, and their rows are
+        yielded in batch order.
+        """
+        batch_size = self.reflection_batch_size
+        sizes = [size for size in REFLECTION_IN_SIZES if size < batch_size]
+        sizes.append(batch_size)
+        objects = list(all_objects)
+
+        if dblink and not dblink.startswith("@"):
+            dblink = f"@{dblink}"
+
+        # the batches may run on worker threads, outside the reflection
+        # call that DMMetrics marks; the option marks them instead
+        execution_options = {
+            "_dm_dblink": dblink or "",
+            "schema_translate_map": None,
+            REFLECTION_OPTION: True,
+        }
 
-            for i in range(len(batch) - 1):
-                temp_query += ', '
-                temp_query += '\''
-                temp_query += str(batch[i + 1])
-                temp_query += '\''
+        statements = []
+        for start in range(0, len(objects), batch_size):
+            batch = objects[start:start + batch_size]
+            size = next(size for size in sizes if size >= len(batch))
+            batch.extend(batch[-1:] * (size - len(batch)))
+
+            names = dict(("name_%d" % i, name)
+                         for i, name in enumerate(batch))
+            if params:
+                names.update(params)
+            statement = sql.text(
+                query + ", ".join(":name_%d" % i for i in range(size)) +
+                query_fllow)
+            statements.append((statement, names))
+
+        if self.reflection_workers > 1 and len(statements) > 1:
+            engine = connection.engine
+
+            def fetch(statement, names):
+                with engine.connect() as conn:
+                    return conn.execute(
+                        statement, names,
+                        execution_options=execution_options).mappings().all()
+
+            executor = self._reflection_executor()
+            futures = [executor.submit(fetch, statement, names)
+                       for statement, names in statements]
+            for future in futures:
+                yield from future.result()
+            return
 
-            temp_query += query_fllow
-            result = connection.execute(sql.text(temp_query), execution_options=execution_options)
+        for statement, names in statements:
+            result = connection.execute(
+                statement, names, execution_options=execution_options)
             yield from result.mappings()
 
+    def _reflection_executor(self):
+        """thread pool shared by all batched reflection queries of this
+        dialect; kept apart from the DMInspector category threads, which
+        wait on it."""
+        with self._batch_executor_lock:
+            if self._batch_executor is None:
+                self._batch_executor = ThreadPoolExecutor(
+                    self.reflection_workers,
+                    thread_name_prefix='dm-reflect-batch')
+            return self._batch_executor
+
     def _get_all_objects(self, connection, schema, scope, kind, filter_names, dblink, **kw):
+        """the names, as stored, of the tables to reflect: ``filter_names``
+        when given, else every table of ``schema`` (listed once per
+        inspection)."""
+        if filter_names is not None:
+            return [self.denormalize_name(n) for n in filter_names]
 
         schema = self.denormalize_name(schema or self.default_schema_name)
 
@@ -2053,6 +1695,18 @@ class DMDialect(default.DefaultDialect):
         if schema is None:
             schema = self.default_schema_name
 
+        info_cache = kw.get('info_cache')
+        if info_cache is None:
+            return self._get_table_listing(connection, schema)
+        # parallel reflection categories ask for it at the same time
+        lock = info_cache.setdefault(('_dm_table_listing', 'lock'),
+                                     threading.Lock())
+        with lock:
+            return self._get_table_listing(
+                connection, schema, info_cache=info_cache)
+
+    @reflection.cache
+    def _get_table_listing(self, connection, schema, **kw):
         sql_str = "SELECT table_name FROM all_tables WHERE "
         if self.exclude_tablespaces:
             sql_str += (
@@ -2068,15 +1722,36 @@ class DMDialect(default.DefaultDialect):
         result = connection.execute(sql.text(sql_str).bindparams(owner=schema)).scalars()
 
         return result.all()
+
+    def _rows_by_table(self, key, all_objects, fetch, info_cache):
+        """rows of a per-table catalog query for ``all_objects``.
+
+        Within one inspection (``info_cache``) each table is queried at
+        most once: the rows are kept per table under ``key`` and later
+        calls, from any ``get_multi_*`` method, only ``fetch(names)`` the
+        tables not seen yet.  Rows come back grouped by table, in the
+        order of ``all_objects``.
+        """
+        names = list(dict.fromkeys(all_objects))
+        if info_cache is None:
+            return fetch(names)
+
+        lock = info_cache.setdefault((key, 'lock'), threading.Lock())
+        with lock:
+            by_table = info_cache.setdefault(key, {})
+            missing = [name for name in names if name not in by_table]
+            if missing:
+                fetched = dict((name, []) for name in missing)
+                for row_dict in fetch(missing):
+                    fetched.setdefault(row_dict["table_name"], []).append(
+                        row_dict)
+                by_table.update(fetched)
+        return [row_dict for name in names for row_dict in by_table[name]]
    
 
     @reflection.cache
     def _prepare_reflection_args(self, connection, table_name, schema=None,
                                  resolve_synonyms=False, dblink='', **kw):
-        self.trace_process('DMDialect', '_prepare_reflection_args',
-                           connection, table_name, schema,
-                           resolve_synonyms, dblink, **kw)
-
         if resolve_synonyms:
             actual_name, owner, dblink, synonym = self._resolve_synonym(
                 connection,
@@ -2100,16 +1775,12 @@ class DMDialect(default.DefaultDialect):
 
     @reflection.cache
     def get_schema_names(self, connection, **kw):
-        self.trace_process('DMDialect', 'get_schema_names', connection, **kw)
-        
         s = "SELECT SF_GET_SCHEMA_NAME_BY_ID(CURRENT_SCHID());"
         cursor = connection.execute(s)
         return [self.normalize_name(row[0]) for row in cursor]
 
     @reflection.cache
     def get_table_names(self, connection, schema=None, **kw):
-        self.trace_process('DMDialect', 'get_table_names', connection, schema, **kw)
-        
         schema = self.denormalize_name(schema or self.default_schema_name)
 
         # note that table_names() isn't loading DBLINKed or synonym'ed tables
@@ -2135,8 +1806,6 @@ class DMDialect(default.DefaultDialect):
 
     @reflection.cache
     def get_temp_table_names(self, connection, **kw):
-        self.trace_process('DMDialect', 'get_temp_table_names', connection, **kw)
-        
         schema = self.denormalize_name(self.default_schema_name)
 
         sql_str = "SELECT table_name FROM all_tables WHERE "
@@ -2157,8 +1826,6 @@ class DMDialect(default.DefaultDialect):
 
     @reflection.cache
     def get_view_names(self, connection, schema=None, **kw):
-        self.trace_process('DMDialect', 'get_view_names', connection, schema, **kw)
-        
         schema = self.denormalize_name(schema or self.default_schema_name)
         s = sql.text("SELECT view_name FROM all_views WHERE owner = :owner")
         cursor = connection.execute(s.bindparams(owner=self.denormalize_name(schema)))
@@ -2181,22 +1848,20 @@ class DMDialect(default.DefaultDialect):
 
         if ObjectKind.TABLE in kind or ObjectKind.MATERIALIZED_VIEW in kind:
             query = "SELECT a_tables.table_name, a_tables.compression, a_tables.compress_for"
-            query += "\nFROM all_tables AS a_tables\nWHERE a_tables.owner = \'" + owner + "\'\nAND a_tables.table_name IN("
-            if (len(all_objects)>0):
-                query += "\'" + all_objects[0] + "\'"
-                if(len(all_objects)>1):
-                    for i in range(len(all_objects) - 1):
-                        query += ",\'" + all_objects[i+1] + "\'"
-            query += ")"
-
-            result = connection.execute(sql.text(query))
-
-            for table, compression, compress_for in result:
-                if compression == "ENABLED":
-                    data = {"oracle_compress": compress_for}
+            query += "\nFROM all_tables AS a_tables\nWHERE a_tables.owner = :owner\nAND a_tables.table_name IN("
+
+            rows = list(self._run_batches(
+                connection, all_objects, query, ")", dblink,
+                params={"owner": owner}))
+            tables = self._normalize_names(
+                [row_dict["table_name"] for row_dict in rows])
+
+            for table, row_dict in zip(tables, rows):
+                if row_dict["compression"] == "ENABLED":
+                    data = {"oracle_compress": row_dict["compress_for"]}
                 else:
                     data = default()
-                options[(owner, self.normalize_name(table))] = data
+                options[(owner, table)] = data
 
         if ObjectKind.VIEW in kind and ObjectScope.DEFAULT in scope:
             # add the views (no temporary views)
@@ -2208,8 +1873,6 @@ class DMDialect(default.DefaultDialect):
 
     @reflection.cache
     def get_table_options(self, connection, table_name, schema=None, **kw):
-        self.trace_process('DMDialect', 'get_table_options', connection, table_name, schema, **kw)
-        
         options = {}
 
         resolve_synonyms = kw.get('dm_resolve_synonyms', False)
@@ -2252,7 +1915,6 @@ class DMDialect(default.DefaultDialect):
 
     @reflection.cache
     def get_columns(self, connection, table_name, schema=None, **kw):
-        self.trace_process('DMDialect', 'get_columns', connection, table_name, schema, **kw)
         """
 
         kw arguments can be:
@@ -2335,9 +1997,8 @@ class DMDialect(default.DefaultDialect):
                     """AND a_tab_cols.column_name = a_col_comments.column_name\n"""\
                     """AND a_tab_cols.owner = a_col_comments.owner\n"""\
                     """AND a_tab_cols.hidden_column = \'NO\'\n"""\
-                    """AND a_tab_cols.owner = \'"""
-        query += str(owner)
-        query += """\' WHERE a_tab_cols.table_name IN("""
+                    """AND a_tab_cols.owner = :owner"""
+        query += """ WHERE a_tab_cols.table_name IN("""
 
         query_fllow = ")\nORDER BY a_tab_cols.table_name, a_tab_cols.column_id;"
 
@@ -2352,13 +2013,18 @@ class DMDialect(default.DefaultDialect):
             all_objects,
             query,
             query_fllow,
-            dblink
+            dblink,
+            params={"owner": owner}
         )
 
-        for row_dict in result:
-            table_name = self.normalize_name(row_dict["table_name"])
+        rows = list(result)
+        table_names = self._normalize_names(
+            [row_dict["table_name"] for row_dict in rows])
+        colnames = self._normalize_names(
+            [row_dict["column_name"] for row_dict in rows])
+
+        for row_dict, table_name, colname in zip(rows, table_names, colnames):
             orig_colname = row_dict["column_name"]
-            colname = self.normalize_name(orig_colname)
             coltype = row_dict["data_type"]
             scale = row_dict['data_scale']
             length = row_dict['char_length']
@@ -2421,35 +2087,28 @@ class DMDialect(default.DefaultDialect):
                         FROM user_tab_comments
                         WHERE table_name IN(
                         """
-            if (len(all_objects)>0):
-                COMMENT_SQL += "\'" + all_objects[0] + "\'"
-                if(len(all_objects)>1):
-                    for i in range(len(all_objects) - 1):
-                        COMMENT_SQL += ",\'" + all_objects[i+1] + "\'"
-            COMMENT_SQL += ")"
+            params = None
         else:
             COMMENT_SQL = "SELECT table_name, comments"\
                     "\nFROM all_tab_comments"\
-                    "\nWHERE owner = "+"\'"+schema + "\'"\
+                    "\nWHERE owner = :owner "\
                     "AND table_name IN("
-            if (len(all_objects)>0):
-                COMMENT_SQL += "\'" + all_objects[0] + "\'"
-                if(len(all_objects)>1):
-                    for i in range(len(all_objects) - 1):
-                        COMMENT_SQL += ",\'" + all_objects[i+1] + "\'"
-            COMMENT_SQL += ")"
+            params = {"owner": schema}
         default = ReflectionDefaults.table_comment
-        result = connection.execute(sql.text(COMMENT_SQL))
+        rows = list(self._run_batches(
+            connection, all_objects, COMMENT_SQL, ")", dblink, params))
+        tables = self._normalize_names(
+            [row_dict["table_name"] for row_dict in rows])
         ignore_mat_view = "snapshot table for snapshot "
         a=(
             (
-                (schema, self.normalize_name(table)),
-                {"text": comment}
-                if comment is not None
-                and not comment.startswith(ignore_mat_view)
+                (schema, table),
+                {"text": row_dict["comments"]}
+                if row_dict["comments"] is not None
+                and not row_dict["comments"].startswith(ignore_mat_view)
                 else default(),
             )
-            for table, comment in result
+            for table, row_dict in zip(tables, rows)
         )
         return a
 
@@ -2463,8 +2122,6 @@ class DMDialect(default.DefaultDialect):
         dblink="",
         **kw
     ):
-        self.trace_process('DMDialect', 'get_table_comment', connection, table_name, schema, resolve_synonyms, dblink, **kw)
-        
         info_cache = kw.get("info_cache")
         (table_name, schema, dblink, synonym) = self._prepare_reflection_args(
             connection,
@@ -2515,22 +2172,19 @@ class DMDialect(default.DefaultDialect):
             "\na.index_name = b.index_name "
 
         if flag == True:
-            query += "\nAND b.table_owner =  " + "'" + schema + "' "
+            query += "\nAND b.table_owner = :owner "
         else:
             query += "\nAND a.table_owner = b.table_owner "
 
         query += "\nAND a.table_name = b.table_name "
         if schema is not None:
             if schema.upper() !=self.default_schema_name.upper():
-                query += "AND a.table_owner =  "+"'"+schema+"' "
+                query += "AND a.table_owner = :owner "
         query += "\nAND a.table_name IN("
 
         query_fllow = ")\nORDER BY a.index_name, a.column_position"
 
-        if filter_names == None:
-            all_objects = self._get_all_objects(connection, schema, scope, kind, filter_names, dblink, **kw)
-        else:
-            all_objects = [self.denormalize_name(n) for n in filter_names]
+        all_objects = self._get_all_objects(connection, schema, scope, None, filter_names, dblink, **kw)
 
         if dblink != None:
             query = query % {'dblink': dblink}
@@ -2539,17 +2193,24 @@ class DMDialect(default.DefaultDialect):
 
         pks = {
             row_dict["cons_name"]
-            for row_dict in self.get_multi_constraint_data(connection, schema, filter_names, scope, None, dblink)
+            for row_dict in self.get_multi_constraint_data(
+                connection, schema, all_objects, scope, None, dblink,
+                info_cache=kw.get('info_cache'))
             if row_dict["constraint_type"] == "P"
         }
 
-        result = self._run_batches(
-            connection,
+        result = self._rows_by_table(
+            ('_dm_index_rows', schema, dblink or ''),
             all_objects,
-            query,
-            query_fllow,
-            dblink
-        )
+            lambda names: list(self._run_batches(
+                connection,
+                names,
+                query,
+                query_fllow,
+                dblink,
+                params={"owner": schema} if schema is not None else None
+            )),
+            kw.get('info_cache'))
 
         return [
             row_dict
@@ -2579,11 +2240,16 @@ class DMDialect(default.DefaultDialect):
 
         indexes = defaultdict(dict)
 
-        for row_dict in self._get_indexes_rows(
+        rows = list(self._get_indexes_rows(
             connection, schema, all_objects, None, dblink, **kw
-        ):
-            index_name = self.normalize_name(row_dict["index_name"])
-            table_name = self.normalize_name(row_dict["table_name"])
+        ))
+        index_names = self._normalize_names(
+            [row_dict["index_name"] for row_dict in rows])
+        table_names = self._normalize_names(
+            [row_dict["table_name"] for row_dict in rows])
+
+        for row_dict, index_name, table_name in zip(
+                rows, index_names, table_names):
             table_indexes = indexes[(schema, table_name)]
 
             if index_name not in table_indexes:
@@ -2604,8 +2270,8 @@ class DMDialect(default.DefaultDialect):
         return (
             (key, list(indexes[key].values()) if key in indexes else default())
             for key in (
-                (schema, self.normalize_name(obj_name))
-                for obj_name in all_objects
+                (schema, obj_name)
+                for obj_name in self._normalize_names(all_objects)
             )
         )
 
@@ -2613,10 +2279,6 @@ class DMDialect(default.DefaultDialect):
     @reflection.cache
     def get_indexes(self, connection, table_name, schema=None,
                     resolve_synonyms=False, dblink='', **kw):
-        self.trace_process('DMDialect', 'get_indexes', 
-                           connection, table_name, schema,
-                           resolve_synonyms, dblink, **kw)
-
         info_cache = kw.get('info_cache')
         (table_name, schema, dblink, synonym) = \
             self._prepare_reflection_args(connection, table_name, schema,
@@ -2717,7 +2379,8 @@ class DMDialect(default.DefaultDialect):
                 "\nrem.owner AS remote_owner," \
                 "\nloc.position as loc_pos," \
                 "\nrem.position as rem_pos,"\
-                "\nac.delete_rule as delete_rule"\
+                "\nac.delete_rule as delete_rule,"\
+                "\nac.search_condition as search_condition"\
 
         if schema is not None and schema != 'SYS':
             query += "\nFROM user_constraints%(dblink)s ac," + "\nuser_cons_columns%(dblink)s loc," + "\nuser_cons_columns%(dblink)s rem"
@@ -2730,7 +2393,7 @@ class DMDialect(default.DefaultDialect):
         else:
             query = query % {'dblink': ''}
 
-        query_fllow = ")\nAND ac.constraint_type IN ('R','P','U')" \
+        query_fllow = ")\nAND ac.constraint_type IN ('R','P','U','C')" \
             "\nAND ac.owner = loc.owner" \
             "\nAND ac.constraint_name = loc.constraint_name" \
             "\nAND ac.r_owner = rem.owner(+)" \
@@ -2738,25 +2401,23 @@ class DMDialect(default.DefaultDialect):
             "\nAND (rem.position IS NULL or loc.position=rem.position)" \
             "\nORDER BY ac.constraint_name, loc.position"
 
-        if filter_names == None:
-            all_objects = self._get_all_objects(connection, schema, scope, kind, filter_names, dblink, **kw)
-        else:
-            all_objects = [self.denormalize_name(n) for n in filter_names]
+        all_objects = self._get_all_objects(connection, schema, scope, kind, filter_names, dblink, **kw)
 
-        result = list(self._run_batches(
-            connection,
+        return self._rows_by_table(
+            ('_dm_constraint_data', schema, dblink or ''),
             all_objects,
-            query,
-            query_fllow,
-            dblink
-        ))
-        return result
+            lambda names: list(self._run_batches(
+                connection,
+                names,
+                query,
+                query_fllow,
+                dblink
+            )),
+            kw.get('info_cache'))
 
     @reflection.cache
     def _get_constraint_data(self, connection, table_name, schema=None,
                              dblink='', **kw):
-        self.trace_process('DMDialect', '_get_constraint_data', connection, table_name, schema, dblink, **kw)
-
 
         text = \
             "SELECT"\
@@ -2804,13 +2465,15 @@ class DMDialect(default.DefaultDialect):
             connection, schema, scope, kind, filter_names, dblink, **kw
         )
 
-        constraint_data = self.get_multi_constraint_data(connection, schema, all_objects, scope, kind, dblink)
-        for row_dict in constraint_data:
-            if row_dict["constraint_type"] != "P":
-                continue
-            table_name = self.normalize_name(row_dict["table_name"])
-            constraint_name = self.normalize_name(row_dict["cons_name"])
-            column_name = self.normalize_name(row_dict["local_column"])
+        constraint_data = self.get_multi_constraint_data(
+            connection, schema, all_objects, scope, kind, dblink,
+            info_cache=kw.get('info_cache'))
+        rows = [row_dict for row_dict in constraint_data
+                if row_dict["constraint_type"] == "P"]
+        names = zip(*[
+            self._normalize_names([row_dict[key] for row_dict in rows])
+            for key in ("table_name", "cons_name", "local_column")])
+        for table_name, constraint_name, column_name in names:
 
             table_pk = primary_keys[(schema, table_name)]
             if not table_pk:
@@ -2822,15 +2485,13 @@ class DMDialect(default.DefaultDialect):
         return (
             (key, primary_keys[key] if key in primary_keys else default())
             for key in (
-                (schema, self.normalize_name(obj_name))
-                for obj_name in all_objects
+                (schema, obj_name)
+                for obj_name in self._normalize_names(all_objects)
             )
         )
 
     @reflection.cache
     def get_pk_constraint(self, connection, table_name, schema=None, **kw):
-        self.trace_process('DMDialect', 'get_pk_constraint', connection, table_name, schema, **kw)
-        
         resolve_synonyms = kw.get('dm_resolve_synonyms', False)
         dblink = kw.get('dblink', '')
         info_cache = kw.get('info_cache')
@@ -2871,23 +2532,24 @@ class DMDialect(default.DefaultDialect):
         all_remote_owners = set()
         fkeys = defaultdict(dict)
         remote_owners_lut = {}
-        constraint_data = self.get_multi_constraint_data(connection, schema, all_objects, scope, kind, dblink)
+        constraint_data = self.get_multi_constraint_data(
+            connection, schema, all_objects, scope, kind, dblink,
+            info_cache=kw.get('info_cache'))
 
-        for row_dict in constraint_data:
-            if row_dict["constraint_type"] != "R":
-                continue
+        rows = [row_dict for row_dict in constraint_data
+                if row_dict["constraint_type"] == "R"]
+        names = zip(rows, *[
+            self._normalize_names([row_dict[key] for row_dict in rows])
+            for key in ("table_name", "cons_name", "local_column",
+                        "remote_table", "remote_column", "remote_owner")])
 
-            table_name = self.normalize_name(row_dict["table_name"])
-            constraint_name = self.normalize_name(row_dict["cons_name"])
+        for (row_dict, table_name, constraint_name, local_column,
+                remote_table, remote_column, remote_owner) in names:
             table_fkey = fkeys[(schema, table_name)]
 
             assert constraint_name is not None
 
-            local_column = self.normalize_name(row_dict["local_column"])
-            remote_table = self.normalize_name(row_dict["remote_table"])
-            remote_column = self.normalize_name(row_dict["remote_column"])
             remote_owner_orig = row_dict["remote_owner"]
-            remote_owner = self.normalize_name(remote_owner_orig)
             if remote_owner_orig is not None:
                 all_remote_owners.add(remote_owner_orig)
 
@@ -2923,15 +2585,13 @@ class DMDialect(default.DefaultDialect):
         return (
             (key, list(fkeys[key].values()) if key in fkeys else default())
             for key in (
-            (schema, self.normalize_name(obj_name))
-            for obj_name in all_objects
+            (schema, obj_name)
+            for obj_name in self._normalize_names(all_objects)
         )
         )
 
     @reflection.cache
     def get_foreign_keys(self, connection, table_name, schema=None, **kw):
-        self.trace_process('DMDialect', 'get_foreign_keys', connection, table_name, schema, **kw)
-        
         requested_schema = schema  # to check later on
         resolve_synonyms = kw.get('dm_resolve_synonyms', False)
         dblink = kw.get('dblink', '')
@@ -3015,13 +2675,17 @@ class DMDialect(default.DefaultDialect):
             )
         }
 
-        for row_dict in self.get_multi_constraint_data(connection, schema, all_objects, scope, kind, dblink):
-            if row_dict["constraint_type"] != "U":
-                continue
-            table_name = self.normalize_name(row_dict["table_name"])
+        rows = [
+            row_dict for row_dict in self.get_multi_constraint_data(
+                connection, schema, all_objects, scope, kind, dblink,
+                info_cache=kw.get('info_cache'))
+            if row_dict["constraint_type"] == "U"]
+        names = zip(rows, *[
+            self._normalize_names([row_dict[key] for row_dict in rows])
+            for key in ("table_name", "cons_name", "local_column")])
+
+        for row_dict, table_name, constraint_name, column_name in names:
             constraint_name_orig = row_dict["cons_name"]
-            constraint_name = self.normalize_name(constraint_name_orig)
-            column_name = self.normalize_name(row_dict["local_column"])
             table_uc = unique_cons[(schema, table_name)]
 
             assert constraint_name is not None
@@ -3049,17 +2713,14 @@ class DMDialect(default.DefaultDialect):
                 else default(),
             )
             for key in (
-            (schema, self.normalize_name(obj_name))
-            for obj_name in all_objects
+            (schema, obj_name)
+            for obj_name in self._normalize_names(all_objects)
         )
         )
 
 
     @reflection.cache
     def get_unique_constraints(self, connection, table_name, schema=None, **kw):
-        self.trace_process('DMDialect', 'get_unique_constraints',
-                           connection, table_name, schema, **kw)
-        
         resolve_synonyms = kw.get('dm_resolve_synonyms', False)
         dblink = kw.get('dblink', '')
         info_cache = kw.get('info_cache')
@@ -3100,10 +2761,6 @@ class DMDialect(default.DefaultDialect):
     @reflection.cache
     def get_view_definition(self, connection, view_name, schema=None,
                             resolve_synonyms=False, dblink='', **kw):
-        self.trace_process('DMDialect', 'get_view_definition',
-                           connection, view_name, schema,
-                           resolve_synonyms, dblink, **kw)
-        
         info_cache = kw.get('info_cache')
         (view_name, schema, dblink, synonym) = \
             self._prepare_reflection_args(connection, view_name, schema,
@@ -3129,12 +2786,22 @@ class DMDialect(default.DefaultDialect):
         check_constraints = defaultdict(list)
 
         not_null = re.compile(r"..+?. IS NOT NULL$")
-        for row_dict in self.get_multi_constraint_data(connection, schema, all_objects, scope, kind, dblink):
-            if row_dict["constraint_type"] != "C":
+        rows = [
+            row_dict for row_dict in self.get_multi_constraint_data(
+                connection, schema, all_objects, scope, kind, dblink,
+                info_cache=kw.get('info_cache'))
+            if row_dict["constraint_type"] == "C"]
+        names = zip(rows, *[
+            self._normalize_names([row_dict[key] for row_dict in rows])
+            for key in ("table_name", "cons_name")])
+
+        seen = set()
+        for row_dict, table_name, constraint_name in names:
+            # one row per column the constraint refers to
+            if (table_name, constraint_name) in seen:
                 continue
-            table_name = self.normalize_name(row_dict["table_name"])
-            constraint_name = self.normalize_name(row_dict["constraint_name"])
-            search_condition = rowdict["search_condition"]
+            seen.add((table_name, constraint_name))
+            search_condition = row_dict["search_condition"]
 
             table_checks = check_constraints[(schema, table_name)]
             if constraint_name is not None and (include_all or not not_null.match(search_condition)):
@@ -3148,8 +2815,8 @@ class DMDialect(default.DefaultDialect):
                 else default(),
             )
             for key in (
-                (schema, self.normalize_name(obj_name))
-                for obj_name in all_objects
+                (schema, obj_name)
+                for obj_name in self._normalize_names(all_objects)
             )
             )
         
@@ -3185,31 +2852,6 @@ class DMDialect(default.DefaultDialect):
             for cons in check_constraints
             if include_all or not re.match(r"..+?. IS NOT NULL$", cons[8])
         ]    
-        
-    # for trace only
-    def reflecttable(self, connection, table, include_columns, exclude_columns, **opts):
-        self.trace_process('DMDialect', 'reflecttable', connection, table, include_columns, exclude_columns, **opts)
-        return super(DMDialect, self).reflecttable(connection, table, include_columns, exclude_columns, **opts)
-        
-    def reset_isolation_level(self, dbapi_conn):
-        self.trace_process('DMDialect', 'reflecttable', dbapi_conn)
-        super(DMDialect, self).reset_isolation_level(dbapi_conn)
-        
-    def set_connection_execution_options(self, connection, opts):
-        self.trace_process('DMDialect', 'set_connection_execution_options', connection, opts)
-        super(DMDialect, self).set_connection_execution_options(connection, opts)
-        
-    def set_engine_execution_options(self, engine, opts):
-        self.trace_process('DMDialect', 'set_engine_execution_options', engine, opts)
-        super(DMDialect, self).set_engine_execution_options(engine, opts)
-        
-    def type_descriptor(self, typeobj):
-        self.trace_process('DMDialect', 'type_descriptor', typeobj)
-        return super(DMDialect, self).type_descriptor(typeobj)
-        
-    def validate_identifier(self, ident):
-        self.trace_process('DMDialect', 'validate_identifier', ident)
-        super(DMDialect, self).validate_identifier(ident)
 
 
 class _OuterJoinColumn(sql.ClauseElement):
@@ -3,7 +3,9 @@ from __future__ import absolute_import
 from .base import DMCompiler, DMDialect, DMExecutionContext
 from . import base as dm
 import sqlalchemy.engine.result as _result
-from sqlalchemy import types as sqltypes, util, exc
+from sqlalchemy.engine import cursor as _cursor
+from sqlalchemy.engine.interfaces import ExecuteStyle
+from sqlalchemy import types as sqltypes, util, exc, event
 from sqlalchemy import util
 import random
 import collections
@@ -12,15 +14,74 @@ import re
 import json
 import time
 import datetime as dt
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from .warmup import warm_up, WARMUP_WORKERS
 from .types import _DMBinary, _DMBoolean, _DMChar, _DMDate, _DMEnum, \
      _DMInteger, _DMInterval, _DMLongVarBinary, _DMLongVarchar, _DMNumeric, \
      _DMNVarChar, _DMRowid, _DMString, _DMText, _DMUnicodeText, INTERVAL, \
      LONGVARCHAR, ROWID, _DMBLOB, DMBINARY, ARRAYCLOB
 
+_datetime = dt.datetime
+
+# bind type affinities whose values never need the executemany string
+# conversions, and those that only ever carry one of the two kinds
+_NO_CONVERSION = (sqltypes.String, sqltypes.Integer, sqltypes.Numeric,
+                  sqltypes.Boolean, sqltypes._Binary, sqltypes.Interval,
+                  sqltypes.Time, sqltypes.Uuid)
+_DATETIME_ONLY = (sqltypes.DateTime, sqltypes.Date)
+_LIST_ONLY = (sqltypes.ARRAY, sqltypes.JSON)
+
+
+DEFAULT_EXECUTEMANY_CHUNK_SIZE = 10000
+
+# statements run on every new connection, see _session_setup_sql()
+SESSION_SETUP = ('SET_SESSION_IDENTITY_CHECK(1)', )
+
+
+def _chunk_rowcount(rowcount):
+    return rowcount if rowcount and rowcount > 0 else 0
+
+
+def _runs_sql_defaults(compiled):
+    # whether _process_execute_defaults() executes any default as a query
+    defaults = [column.default for column in compiled.insert_prefetch] + \
+        [column.onupdate for column in compiled.update_prefetch]
+    return any(
+        default is not None and
+        not (default.is_scalar or default.is_callable)
+        for default in defaults)
+
+
+def _positional_rows(context, rows, start=0):
+    # per row, what the execution context does for the parameter sets of
+    # an executemany: bind values by name, Python-side column defaults,
+    # bind processors
+    compiled = context.compiled
+    positiontup = compiled.positiontup
+    processors = compiled._bind_processors
+    procs = [processors.get(name) for name in positiontup]
+    prefetch = compiled.insert_prefetch or compiled.update_prefetch
+    for group, row in enumerate(rows, start):
+        params = compiled.construct_params(
+            row, escape_names=False, _group_number=group)
+        if prefetch:
+            context.compiled_parameters = [params]
+            context._process_execute_defaults()
+        yield [
+            params[name] if proc is None else proc(params[name])
+            for name, proc in zip(positiontup, procs)]
+
+
+def _format_datetime(value):
+    if value.tzinfo is None and value.year >= 1000:
+        # same text as the strftime() form below, without the format parse
+        return value.isoformat(' ', 'microseconds') + ' '
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f %Z").replace("UTC", "")
+
+
 class DMCompiler_dmPython(DMCompiler):
     def bindparam_string(self, name, **kw):
-        self.dialect.trace_process('DMCompiler_dmPython', 'bindparam_string', name, **kw)
-        
         quote = getattr(name, 'quote', None)
         if quote is True or quote is not False and \
                 self.preparer._bindparam_requires_quotes(name):
@@ -89,9 +150,20 @@ class DMCompiler_dmPython(DMCompiler):
 class DMExecutionContext_dmPython(DMExecutionContext):
 
     
+    _returning_vars = ()
+
     def pre_exec(self):
-        self.dialect.trace_process('DMExecutionContext_dmPython', 'pre_exec')
-        
+        key = getattr(self.compiled, "_dm_returning_pk", None)
+        if key is not None:
+            self._bind_returning_var(key)
+        if getattr(self.compiled, "_dm_returning", False):
+            self._bind_returning_vars()
+        if self.execute_style is ExecuteStyle.INSERTMANYVALUES and \
+                self.compiled.positional:
+            # insertmanyvalues splices positional parameter sets together
+            # as tuples
+            self.parameters = [tuple(p) for p in self.parameters]
+
         if not getattr(self.compiled, "_dm_sql_compiler", False):
             return
 
@@ -99,9 +171,66 @@ class DMExecutionContext_dmPython(DMExecutionContext):
 
         self.include_set_input_sizes = self.dialect._include_setinputsizes
 
+    def _bind_returning_var(self, key):
+        var = self._dm_returning_var = self.cursor.var(int)
+        parameters = self.parameters[0]
+        if self.compiled.positional:
+            parameters[self.compiled.positiontup.index(key)] = var
+        else:
+            parameters[key] = var
+
+    def _bind_returning_vars(self):
+        """bind a cursor variable to each ``ret_<n>`` out parameter of a
+        ``RETURNING ... INTO`` statement."""
+        compiled = self.compiled
+        dbapi = self.dialect.dbapi
+        variables = []
+        for i in range(len(compiled._result_columns)):
+            name = "ret_%d" % i
+            bindparam = compiled.binds[name]
+            dbtype = bindparam.type.dialect_impl(self.dialect).\
+                get_dbapi_type(dbapi)
+            if dbtype is None:
+                raise exc.InvalidRequestError(
+                    "Cannot create out parameter for parameter %r - its "
+                    "type %r is not supported by dmPython" %
+                    (bindparam.key, bindparam.type))
+            var = self.cursor.var(dbtype)
+            if compiled.positional:
+                position = compiled.positiontup.index(name)
+                for parameters in self.parameters:
+                    parameters[position] = var
+            else:
+                for parameters in self.parameters:
+                    parameters[name] = var
+            variables.append(var)
+        self._returning_vars = variables
+
+    def fetchall_for_returning(self, cursor):
+        """rows returned into the out variables by the last execution,
+        one per inserted row, in VALUES order."""
+        if not self._returning_vars:
+            return super(DMExecutionContext_dmPython, self).\
+                fetchall_for_returning(cursor)
+        columns = []
+        for var in self._returning_vars:
+            value = var.getvalue()
+            columns.append(value if isinstance(value, list) else [value])
+        return list(zip(*columns))
+
+    def post_exec(self):
+        if self._returning_vars:
+            # DML has no cursor description; present the RETURNING
+            # columns as a buffered result, which insertmanyvalues
+            # replaces with the rows it collected batch by batch
+            self.cursor_fetch_strategy = \
+                _cursor.FullyBufferedCursorFetchStrategy(
+                    self.cursor,
+                    [(entry.keyname, None)
+                     for entry in self.compiled._result_columns],
+                    initial_buffer=self.fetchall_for_returning(self.cursor))
+
     def create_cursor(self):
-        self.dialect.trace_process('DMExecutionContext_dmPython', 'create_cursor')
-        
         c = self._dbapi_connection.cursor()
         if self.dialect.arraysize:
             c.arraysize = self.dialect.arraysize
@@ -235,14 +364,38 @@ class DMDialect_dmPython(DMDialect):
 
     execute_sequence_format = list
 
+    # set by the first connect()
+    encoding = None
+    case_sensitive = None
+
     def __init__(self,
                  auto_convert_lobs=True,
                  coerce_to_decimal=True,
                  autocommit = False,
                  connection_timeout = 0,
                  arraysize=50,# _retry_on_12516=False,
+                 native_datetime=None,
+                 executemany_chunk_size=0,
+                 session_setup=SESSION_SETUP,
+                 pool_warmup=0,
+                 pool_warmup_workers=WARMUP_WORKERS,
+                 ping_idle_time=0,
                  **kwargs):
         DMDialect.__init__(self, **kwargs)
+        self.session_setup = tuple(session_setup or ())
+        self._session_setup = self._session_setup_sql(self.session_setup)
+        self.pool_warmup = pool_warmup
+        self.pool_warmup_workers = pool_warmup_workers
+        self.ping_idle_time = ping_idle_time
+        # id(dbapi connection) -> [connection, ping cursor, checkin time]
+        self._ping_state = {}
+        # executemany hands date and datetime typed values to dmPython as
+        # datetime objects instead of formatted strings; None detects it
+        # on the first executemany that binds one, see _send_rows()
+        self.native_datetime = native_datetime
+        self._native_datetime = None if native_datetime is None \
+            else bool(native_datetime)
+        self.executemany_chunk_size = executemany_chunk_size
         self.arraysize = arraysize
         self.auto_convert_lobs = auto_convert_lobs
         self.autocommit = False
@@ -293,29 +446,46 @@ class DMDialect_dmPython(DMDialect):
         import dmPython
         return dmPython
 
+    def _session_setup_sql(self, statements):
+        """the SQL run by connect() for ``statements``: a single statement
+        as is, several as one DMSQL block, so that session setup is one
+        round trip however many statements it has.  Statements other than
+        procedure calls (``SET SCHEMA``, ``ALTER SESSION``, ...) need
+        ``EXECUTE IMMEDIATE`` inside a block."""
+        statements = [stmt.strip().rstrip(';') for stmt in statements]
+        statements = [stmt for stmt in statements if stmt]
+        if not statements:
+            return None
+        if len(statements) == 1:
+            return statements[0] + ';'
+        return 'BEGIN\n' + ''.join(
+            '    %s;\n' % stmt for stmt in statements) + 'END;'
+
     def connect(self, *cargs, **cparams):
-        self.trace_process('DMDialect_dmPython', 'connect', *cargs, **cparams)
-        
+        conn = self.dbapi.connect(*cargs, **cparams)
         try:
-            conn = self.dbapi.connect(*cargs, **cparams)
-            
-            self.encoding = self.get_conn_local_code(conn)
-            
-            self.case_sensitive = conn.str_case_sensitive
-            if self.case_sensitive:
-                self.requires_name_normalize = True
-            else:
-                self.requires_name_normalize = False
-                        
-            cursor = conn.cursor();
-            cursor.execute('SET_SESSION_IDENTITY_CHECK(1);')
-            return conn
-        except self.dbapi.DatabaseError as err:
+            if self.case_sensitive is None:
+                self._detect_connection_facts(conn)
+            if self._session_setup is not None:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(self._session_setup)
+                finally:
+                    cursor.close()
+        except Exception:
+            conn.close()
             raise
-        
+        return conn
+
+    def _detect_connection_facts(self, conn):
+        """encoding and identifier case sensitivity, which are the same
+        for every connection of the dialect; read once, from the first
+        one."""
+        self.encoding = self.get_conn_local_code(conn)
+        self.requires_name_normalize = bool(conn.str_case_sensitive)
+        self.case_sensitive = conn.str_case_sensitive
+
     def get_conn_local_code(self, conn):
-        self.trace_process('DMDialect_dmPython', 'get_conn_local_code', conn)
-        
         if conn.local_code == 1:
             return 'utf-8'
         elif conn.local_code == 2:
@@ -338,17 +508,20 @@ class DMDialect_dmPython(DMDialect):
             return 'iso_8859_11'
     
     def initialize(self, connection):
-        self.trace_process('DMDialect_dmPython', 'initialize', connection)
         super(DMDialect_dmPython, self).initialize(connection)
         self._detect_decimal_char(connection)
 
+        cursor = connection.connection.cursor()
+        self._supports_returning_into = hasattr(cursor, 'var')
+        cursor.close()
+        # RETURNING ... INTO needs out variables; with it, executemany
+        # INSERTs that return keys go through insertmanyvalues
+        self.insert_returning = self._supports_returning_into
+
     def _detect_decimal_char(self, connection):
-        self.trace_process('DMDialect_dmPython', '_detect_decimal_char', connection)
         return
 
     def _detect_decimal(self, value):
-        self.trace_process('DMDialect_dmPython', '_detect_decimal', value)
-        
         if "." in value:
             return decimal.Decimal(value)
         else:
@@ -357,12 +530,9 @@ class DMDialect_dmPython(DMDialect):
     _to_decimal = decimal.Decimal
 
     def on_connect(self):
-        self.trace_process('DMDialect_dmPython', 'on_connect')
         return
         
     def create_connect_args(self, url):
-        self.trace_process('DMDialect_dmPython', 'create_connect_args', url)
-        
         opts = url.translate_connect_args(username='user')
 
         opts.update(url.query)
@@ -380,6 +550,13 @@ class DMDialect_dmPython(DMDialect):
         util.coerce_kw_type(opts, 'rwseparate_percent', int)
         util.coerce_kw_type(opts, 'lang_id', int)
         util.coerce_kw_type(opts, 'local_code', int)
+        util.coerce_kw_type(opts, 'pool_warmup', int)
+        util.coerce_kw_type(opts, 'pool_warmup_workers', int)
+
+        # ours, not dmPython's; see warm_up()
+        self.pool_warmup = opts.pop('pool_warmup', self.pool_warmup)
+        self.pool_warmup_workers = opts.pop('pool_warmup_workers',
+                                            self.pool_warmup_workers)
         
         opts.setdefault('autoCommit', self.autocommit)
         opts.setdefault('connection_timeout', self.connection_timeout)
@@ -393,9 +570,62 @@ class DMDialect_dmPython(DMDialect):
         
         return ([], opts)
 
+    @classmethod
+    def engine_created(cls, engine):
+        dialect = engine.dialect
+        event.listen(engine, 'close', dialect._forget_ping_state)
+        event.listen(engine, 'close_detached', dialect._forget_ping_state)
+        if dialect.ping_idle_time:
+            event.listen(engine, 'checkin', dialect._note_checkin)
+        if dialect.pool_warmup and not dialect.is_async:
+            warm_up(engine)
+
+    def _forget_ping_state(self, dbapi_connection, connection_record=None):
+        self._ping_state.pop(id(dbapi_connection), None)
+
+    def _note_checkin(self, dbapi_connection, connection_record):
+        if dbapi_connection is None:
+            return
+        state = self._ping_state.get(id(dbapi_connection))
+        if state is None or state[0] is not dbapi_connection:
+            state = self._ping_state[id(dbapi_connection)] = \
+                [dbapi_connection, None, None]
+        state[2] = time.monotonic()
+
+    def do_ping(self, dbapi_connection):
+        """pre-ping a connection on checkout, unless it was checked in less
+        than ``ping_idle_time`` seconds ago.
+
+        dmPython's own ``ping()`` is used if the driver has one; otherwise
+        ``SELECT 1 FROM DUAL`` is executed on a cursor kept open, for
+        pings only, for the life of the connection.
+        """
+        state = self._ping_state.get(id(dbapi_connection))
+        if state is None or state[0] is not dbapi_connection:
+            state = self._ping_state[id(dbapi_connection)] = \
+                [dbapi_connection, None, None]
+        elif state[2] is not None and \
+                time.monotonic() - state[2] < self.ping_idle_time:
+            return True
+        self._ping(dbapi_connection, state)
+        return True
+
+    def _ping(self, dbapi_connection, state):
+        ping = getattr(dbapi_connection, 'ping', None)
+        if ping is not None:
+            ping()
+            return
+        cursor = state[1]
+        if cursor is None:
+            cursor = state[1] = dbapi_connection.cursor()
+        try:
+            cursor.execute(self._dialect_specific_select_one)
+            cursor.fetchall()
+        except self.dbapi.Error:
+            state[1] = None
+            raise
+
     def _get_server_version_info(self, connection):
-        self.trace_process('DMDialect_dmPython', '_get_server_version_info', connection)
-        
         dbapi_con = connection.connection
         version = []
         r = re.compile(r'[.\-]')
@@ -407,8 +637,6 @@ class DMDialect_dmPython(DMDialect):
         return tuple(version)
 
     def is_disconnect(self, e, connection, cursor):
-        self.trace_process('DMDialect_dmPython', 'is_disconnect', e, connection, cursor)
-        
         error, = e.args
         if isinstance(e, self.dbapi.InterfaceError):
             return "not connected" in str(e)
@@ -418,8 +646,6 @@ class DMDialect_dmPython(DMDialect):
             return False
 
     def create_xid(self):
-        self.trace_process('DMDialect_dmPython', 'create_xid')
-        
         """create a two-phase transaction ID.
 
         this id will be passed to do_begin_twophase(), do_rollback_twophase(),
@@ -428,43 +654,238 @@ class DMDialect_dmPython(DMDialect):
         id = random.randint(0, 2 ** 128)
         return (0x1234, "%032x" % id, "%032x" % 9)
 
-    def do_executemany(self, cursor, statement, parameters, context=None):
-        self.trace_process('DMDialect_dmPython', 'do_executemany', cursor, statement, parameters, context)
-        
-        if isinstance(parameters, tuple):
-            parameters = list(parameters)
-        import datetime
-        rows = len(parameters)
-        columns = len(parameters[0]) if parameters else 0
-        for i in range(rows):
-            for j in range(columns):
-                if type(parameters[i][j]) == datetime.datetime:
-                    temp = parameters[i][j]
-                    str_temp = temp.strftime("%Y-%m-%d %H:%M:%S.%f %Z")
-                    str_result = str_temp
-                    if 'UTC' in str_temp:
-                        str_result = str_temp.replace("UTC", "")
-                    parameters[i][j] = str_result
-                if type(parameters[i][j]) == list:
-                    list_element = parameters[i][j]
-                    if len(list_element) == 0:
-                        result_string = ''
+    def _executemany_plan(self, compiled, width):
+        """return (datetime positions, list positions, native positions)
+        to convert for the rows of an executemany against ``compiled``,
+        or None when the statement gives no usable bind types.
+
+        The plan is worked out from the bind types once and kept on the
+        compiled statement, so cached statements never redo it.  Unless
+        native datetime binding is known not to work, date and datetime
+        typed columns (DATE, DATETIME, TIMESTAMP with or without time
+        zone) are left as datetime objects, at the native positions;
+        untyped columns keep the string conversion.
+        """
+        if compiled is None or not compiled.positional:
+            return None
+        native = self._native_datetime is not False
+        plan = compiled.__dict__.get('_dm_executemany_plan')
+        if plan is None or plan[0] is not native:
+            datetime_positions = []
+            list_positions = []
+            native_positions = []
+            for position, name in enumerate(compiled.positiontup or ()):
+                bind = compiled.binds.get(name)
+                affinity = bind.type._type_affinity if bind is not None \
+                    else None
+                if affinity is None:
+                    affinity = sqltypes.NullType
+                if issubclass(affinity, _NO_CONVERSION):
+                    continue
+                if native and issubclass(affinity, _DATETIME_ONLY):
+                    native_positions.append(position)
+                    continue
+                if not issubclass(affinity, _LIST_ONLY):
+                    datetime_positions.append(position)
+                if not issubclass(affinity, _DATETIME_ONLY):
+                    list_positions.append(position)
+            plan = compiled._dm_executemany_plan = (
+                native, len(compiled.positiontup or ()),
+                tuple(datetime_positions), tuple(list_positions),
+                tuple(native_positions))
+        if plan[1] != width:
+            return None
+        return plan[2:]
+
+    def _send_rows(self, cursor, statement, rows, plan):
+        """executemany ``rows``, converted by ``plan``; returns the
+        rowcount.
+
+        While native datetime binding is undecided, the first executemany
+        with datetime objects at native positions decides it: if the
+        driver rejects the binds client side (TypeError, ValueError,
+        InterfaceError, NotSupportedError), the rows are resent with
+        those values as strings, and if that succeeds, strings are used
+        from then on; if it goes through, datetime objects are.
+        """
+        native_positions = plan[2] if plan is not None else ()
+        if native_positions and self._native_datetime is False:
+            # planned before the driver was found to reject them
+            self._convert_executemany_rows(rows, (native_positions, ()))
+        elif native_positions and self._native_datetime is None:
+            bind_errors = (TypeError, ValueError, self.dbapi.InterfaceError,
+                           self.dbapi.NotSupportedError)
+            try:
+                cursor.executemany(statement, rows)
+            except bind_errors:
+                self._convert_executemany_rows(rows, (native_positions, ()))
+                cursor.executemany(statement, rows)
+                self._native_datetime = False
+            else:
+                self._native_datetime = True
+            return cursor.rowcount
+        cursor.executemany(statement, rows)
+        return cursor.rowcount
+
+    def _convert_executemany_rows(self, rows, plan):
+        width = len(rows[0])
+        if plan is None:
+            plan = (range(width), range(width))
+        datetime_positions, list_positions = plan[:2]
+
+        for j in datetime_positions:
+            for row in rows:
+                if type(row[j]) is _datetime:
+                    row[j] = _format_datetime(row[j])
+        for j in list_positions:
+            for row in rows:
+                if type(row[j]) is list:
+                    row[j] = json.dumps(row[j]) if row[j] else ''
+
+    def _executemany(self, cursor, statement, parameters, compiled,
+                     chunk_size, pipeline=True):
+        if not chunk_size and isinstance(parameters, (list, tuple)):
+            if isinstance(parameters, tuple):
+                parameters = list(parameters)
+            plan = None
+            if parameters:
+                plan = self._executemany_plan(compiled, len(parameters[0]))
+                self._convert_executemany_rows(parameters, plan)
+            self._send_rows(cursor, statement, parameters, plan)
+            return
+
+        # streaming: rows are pulled from ``parameters`` chunk_size at a
+        # time; each chunk is converted while the previous one is sent
+        # from a worker thread, so at most two chunks are held at once.
+        # Without ``pipeline``, as when pulling rows runs queries on the
+        # connection, chunks are sent one after the other instead.
+        chunk_size = chunk_size or DEFAULT_EXECUTEMANY_CHUNK_SIZE
+        rows = iter(parameters)
+        plan = width = None
+        rowcount = 0
+        with ThreadPoolExecutor(1) as sender:
+            pending = None
+            try:
+                while True:
+                    chunk = [
+                        row if type(row) is list else list(row)
+                        for row in itertools.islice(rows, chunk_size)]
+                    if not chunk:
+                        break
+                    if width is None:
+                        width = len(chunk[0])
+                        plan = self._executemany_plan(compiled, width)
+                    self._convert_executemany_rows(chunk, plan)
+                    if pending is not None:
+                        rowcount += _chunk_rowcount(pending.result())
+                        pending = None
+                    if pipeline:
+                        pending = sender.submit(
+                            self._send_rows, cursor, statement, chunk, plan)
                     else:
-                        result_string = json.dumps(list_element)
-                    list_element = result_string
-                    parameters[i][j] = list_element
-        cursor.executemany(statement, parameters)
+                        rowcount += _chunk_rowcount(self._send_rows(
+                            cursor, statement, chunk, plan))
+                    chunk = None
+            finally:
+                if pending is not None:
+                    rowcount += _chunk_rowcount(pending.result())
+        return rowcount
+
+    def do_executemany(self, cursor, statement, parameters, context=None):
+        if context is not None:
+            compiled = getattr(context, 'compiled', None)
+            chunk_size = context.execution_options.get(
+                'executemany_chunk_size', self.executemany_chunk_size)
+        else:
+            compiled = None
+            chunk_size = self.executemany_chunk_size
+        rowcount = self._executemany(
+            cursor, statement, parameters, compiled, chunk_size,
+            not getattr(context, '_dm_serial_send', False))
+        if rowcount is not None and context is not None:
+            context._rowcount = rowcount
+
+    def stream_executemany(self, connection, statement, rows,
+                           chunk_size=None):
+        """execute ``statement`` once for every row of ``rows``, which may
+        be any iterable, a generator included, without materializing it.
+
+        Rows are converted and sent ``chunk_size`` at a time (the
+        ``executemany_chunk_size`` dialect option by default), so peak
+        memory is bounded by the chunk size rather than by the load.
+
+        ``statement`` is either a SQL string in the driver's paramstyle,
+        with ``rows`` as sequences, or a Core construct such as
+        ``table.insert()``, with ``rows`` as dictionaries keyed by
+        parameter name; the construct is compiled once, against the keys
+        of the first row, and Python-side column defaults are applied to
+        every row as :meth:`.Connection.execute` does.  A chunk is sent
+        from a worker thread while the next one is converted, unless a
+        column default left to the rows is a Sequence or SQL expression,
+        which runs a query on the connection; chunks are then sent one
+        after the other.
+
+        ``connection`` is a :class:`.Connection`; the statement runs in
+        its transaction, begun if none is in progress, and goes through
+        :meth:`do_executemany` with an execution context, so metrics and
+        tracing see it.  The connection's cursor execute events are not
+        fired.
+
+        Returns the total rowcount reported by the driver.
+        """
+        chunk_size = chunk_size or self.executemany_chunk_size or \
+            DEFAULT_EXECUTEMANY_CHUNK_SIZE
+        options = {'executemany_chunk_size': chunk_size}
+        rows = iter(rows)
+        if not connection.in_transaction():
+            connection.begin()
+        dbapi_connection = connection.connection
+
+        if isinstance(statement, str):
+            context = self.execution_ctx_cls._init_statement(
+                self, connection, dbapi_connection,
+                connection._execution_options.union(options),
+                statement, [])
+        else:
+            try:
+                first = next(rows)
+            except StopIteration:
+                return 0
+            # compiled for executemany, so that SQL defaults are rendered
+            # inline and only Python-side ones are left to the rows
+            compiled = statement.compile(
+                dialect=self, column_keys=list(first), for_executemany=True)
+            if not compiled.positional:
+                raise exc.InvalidRequestError(
+                    "stream_executemany() requires a positional "
+                    "paramstyle, not %r" % self.paramstyle)
+            context = self.execution_ctx_cls._init_compiled(
+                self, connection, dbapi_connection,
+                connection._execution_options.merge_with(
+                    statement._execution_options, options),
+                compiled, [first], statement, None)
+            # the context has processed the first row
+            rows = itertools.chain(
+                context.parameters, _positional_rows(context, rows, 1))
+            # Sequence and SQL expression defaults are queries on the
+            # connection, which must not overlap a chunk being sent
+            context._dm_serial_send = _runs_sql_defaults(compiled)
+
+        cursor = context.cursor
+        try:
+            self.do_executemany(cursor, context.statement, rows, context)
+        except BaseException as e:
+            connection._handle_dbapi_exception(
+                e, context.statement, None, cursor, context)
+        cursor.close()
+        return context._rowcount or 0
 
     def do_rollback_twophase(self, connection, xid, is_prepared=True,
                              recover=False):
-        self.trace_process('DMDialect_dmPython', 'do_rollback_twophase', connection, xid, is_prepared, recover)
-        
         self.do_rollback(connection.connection)
 
     def do_commit_twophase(self, connection, xid, is_prepared=True,
                            recover=False):
-        self.trace_process('DMDialect_dmPython', 'do_commit_twophase', connection, xid, is_prepared, recover)
-        
         self.do_commit(connection.connection)
 
 dialect = DMDialect_dmPython
@@ -0,0 +1,124 @@
+import re
+
+from sqlalchemy import exc, schema as sa_schema
+from sqlalchemy.sql import elements, roles
+from sqlalchemy.sql.visitors import InternalTraversal
+
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_$#]*$')
+
+
+class DMHint(roles.StatementOptionRole, elements.ClauseElement):
+    """one optimizer hint, rendered as ``NAME(table, ..., name, ...,
+    arg, ...)``; ``names`` (index names) are quoted as identifiers,
+    ``args`` are rendered as given, so they are plain values, never SQL
+    expressions: a bind parameter inside the hint comment would not be
+    seen by the driver.
+
+    Hints are attached with :func:`with_hints` as DM-only statement
+    prefixes; the compiler merges every hint of a statement into a single
+    ``/*+ ... */`` comment after SELECT, UPDATE or DELETE.  Tables are
+    rendered as their name or alias in that statement, and both tables and
+    arguments are part of the statement's cache key, so hinted statements
+    are cached like any other.
+    """
+
+    __visit_name__ = 'dm_hint'
+
+    _traverse_internals = [
+        ('name', InternalTraversal.dp_string),
+        ('tables', InternalTraversal.dp_clauseelement_tuple),
+        ('names', InternalTraversal.dp_string_list),
+        ('args', InternalTraversal.dp_string_list),
+    ]
+
+    def __init__(self, name, tables=(), names=(), args=()):
+        self.name = name
+        self.tables = tuple(tables)
+        self.names = list(names)
+        for arg in args:
+            if isinstance(arg, elements.ClauseElement):
+                raise exc.ArgumentError(
+                    "optimizer hint arguments are rendered as text, not "
+                    "SQL expressions; got %r" % (arg,))
+        self.args = [str(arg) for arg in args]
+
+
+def _name(name, what):
+    if isinstance(name, sa_schema.Index):
+        name = name.name
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise exc.ArgumentError("invalid %s for an optimizer hint: %r" %
+                                (what, name))
+    return name
+
+
+def _degree(value, what):
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise exc.ArgumentError("%s must be a non-negative integer, got %r" %
+                                (what, value))
+    return value
+
+
+def hint(name, *tables):
+    """a hint taking only tables, e.g. ``hint('NO_USE_HASH', a, b)``."""
+    return DMHint(_name(name, 'hint name').upper(), tables)
+
+
+def index(table, *indexes):
+    """access ``table`` through one of ``indexes`` (names or
+    :class:`.Index` objects)."""
+    return DMHint('INDEX', (table,),
+                  names=[_name(idx, 'index name') for idx in indexes])
+
+
+def no_index(table, *indexes):
+    """do not use ``indexes`` to access ``table``."""
+    return DMHint('NO_INDEX', (table,),
+                  names=[_name(idx, 'index name') for idx in indexes])
+
+
+def full(table):
+    """scan ``table`` in full."""
+    return DMHint('FULL', (table,))
+
+
+def parallel(degree, table=None):
+    """run the statement, or the scan of ``table``, with ``degree``
+    parallel workers."""
+    degree = _degree(degree, 'parallel degree')
+    return DMHint('PARALLEL', () if table is None else (table,),
+                  args=[degree])
+
+
+def use_hash(*tables):
+    return DMHint('USE_HASH', tables)
+
+
+def use_nl(*tables):
+    return DMHint('USE_NL', tables)
+
+
+def use_merge(*tables):
+    return DMHint('USE_MERGE', tables)
+
+
+def leading(*tables):
+    """join the tables in the order given."""
+    return DMHint('LEADING', tables)
+
+
+def param(name, value):
+    """set a dm.ini parameter for this statement only, e.g.
+    ``param('ENABLE_HASH_JOIN', 1)``."""
+    return DMHint(_name(name, 'parameter name').upper(),
+                  args=[_degree(value, 'parameter value')])
+
+
+def with_hints(stmt, *hints):
+    """add ``hints`` to a SELECT, UPDATE or DELETE for the DM dialect;
+    other dialects do not render them."""
+    for h in hints:
+        if not isinstance(h, DMHint):
+            raise exc.ArgumentError("expected a DM hint, got %r" % (h,))
+    return stmt.prefix_with(*hints, dialect='dm')
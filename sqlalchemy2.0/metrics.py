@@ -0,0 +1,237 @@
+import os
+import time
+import threading
+from functools import wraps
+
+
+STATEMENT_KINDS = {
+    'SELECT': 'SELECT',
+    'WITH': 'SELECT',
+    'INSERT': 'INSERT',
+    'UPDATE': 'UPDATE',
+    'DELETE': 'DELETE',
+    'MERGE': 'UPDATE',
+    'CREATE': 'DDL',
+    'ALTER': 'DDL',
+    'DROP': 'DDL',
+    'TRUNCATE': 'DDL',
+    'COMMENT': 'DDL',
+    'GRANT': 'DDL',
+    'REVOKE': 'DDL',
+}
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+# execution option marking a statement as a reflection query where the
+# thread running it is not inside a reflection call
+REFLECTION_OPTION = '_dm_reflection'
+
+
+def statement_kind(statement, context=None):
+    """classify a statement as SELECT, INSERT, UPDATE, DELETE, DDL or
+    OTHER, preferring what the execution context already knows."""
+    if context is not None:
+        if context.isddl:
+            return 'DDL'
+        if context.isinsert:
+            return 'INSERT'
+        if context.isupdate:
+            return 'UPDATE'
+        if context.isdelete:
+            return 'DELETE'
+    words = statement.lstrip(' \t\r\n(').split(None, 1)
+    if not words:
+        return 'OTHER'
+    return STATEMENT_KINDS.get(words[0].upper(), 'OTHER')
+
+
+class DMLatencyHistogram(object):
+    """HDR-style log-linear latency histogram in microseconds.
+
+    Every power-of-two range is split into ``2 ** sub_bucket_bits``
+    buckets, so recorded values are kept with a relative error of at most
+    ``2 ** -(sub_bucket_bits - 1)`` (1/16, 6.25%, by default) at any
+    magnitude, in a sparse bucket dict.
+    """
+
+    def __init__(self, sub_bucket_bits=5):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._sub_buckets = 1 << sub_bucket_bits
+        self.buckets = {}
+        self.count = 0
+        self.errors = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < self._sub_buckets:
+            return value
+        exponent = value.bit_length() - self.sub_bucket_bits
+        return (exponent << self.sub_bucket_bits) + (value >> exponent)
+
+    def _upper_bound(self, index):
+        exponent = index >> self.sub_bucket_bits
+        mantissa = index & (self._sub_buckets - 1)
+        if not exponent:
+            return mantissa
+        return ((mantissa + 1) << exponent) - 1
+
+    def record(self, value, error=False):
+        value = int(value)
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if error:
+            self.errors += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, quantile):
+        if not self.count:
+            return None
+        target = max(quantile * self.count, 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def snapshot(self):
+        data = {
+            'count': self.count,
+            'errors': self.errors,
+            'sum_us': self.total,
+            'min_us': self.min,
+            'max_us': self.max,
+        }
+        for quantile in QUANTILES:
+            data['p%s_us' % _quantile_label(quantile)] = \
+                self.percentile(quantile)
+        return data
+
+
+def _quantile_label(quantile):
+    return ('%g' % (quantile * 100)).replace('.', '')
+
+
+class DMMetrics(object):
+    """Per-dialect call counters and latency histograms, keyed by
+    operation (``do_execute``, ``do_executemany``, ``do_commit``,
+    ``connect``) and statement kind."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._local = threading.local()
+
+    def record(self, operation, kind, elapsed_us, error=False):
+        key = (operation, kind)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = DMLatencyHistogram()
+            histogram.record(elapsed_us, error)
+
+    def timed(self, operation, fn):
+        """wrap a call with no statement (commit, connect)."""
+        record = self.record
+
+        @wraps(fn)
+        def timed(*args, **kw):
+            start = time.perf_counter()
+            error = True
+            try:
+                result = fn(*args, **kw)
+                error = False
+                return result
+            finally:
+                record(operation, '', (time.perf_counter() - start) * 1e6,
+                       error)
+        return timed
+
+    def timed_execute(self, operation, fn):
+        """wrap ``do_execute`` / ``do_executemany``, keyed by the kind of
+        statement run, or ``reflection`` inside a reflection call or
+        with the ``_dm_reflection`` execution option."""
+        record = self.record
+        local = self._local
+
+        @wraps(fn)
+        def timed_execute(cursor, statement, parameters, context=None):
+            if getattr(local, 'reflecting', 0) or context is not None and \
+                    context.execution_options.get(REFLECTION_OPTION):
+                kind = 'reflection'
+            else:
+                kind = statement_kind(statement, context)
+            start = time.perf_counter()
+            error = True
+            try:
+                result = fn(cursor, statement, parameters, context)
+                error = False
+                return result
+            finally:
+                record(operation, kind, (time.perf_counter() - start) * 1e6,
+                       error)
+        return timed_execute
+
+    def reflecting(self, fn):
+        """mark statements run under ``fn`` as reflection queries."""
+        local = self._local
+
+        @wraps(fn)
+        def reflecting(*args, **kw):
+            local.reflecting = getattr(local, 'reflecting', 0) + 1
+            try:
+                return fn(*args, **kw)
+            finally:
+                local.reflecting -= 1
+        return reflecting
+
+    def snapshot(self, reset=False):
+        with self._lock:
+            histograms = self._histograms
+            if reset:
+                self._histograms = {}
+            data = {}
+            for (operation, kind), histogram in histograms.items():
+                data.setdefault(operation, {})[kind] = histogram.snapshot()
+        return data
+
+    def to_prometheus(self, snapshot, prefix='sqlalchemy_dm'):
+        lines = [
+            '# HELP %s_latency_seconds DBAPI call latency.' % prefix,
+            '# TYPE %s_latency_seconds summary' % prefix,
+        ]
+        errors = [
+            '# HELP %s_errors_total DBAPI calls that raised.' % prefix,
+            '# TYPE %s_errors_total counter' % prefix,
+        ]
+        for operation in sorted(snapshot):
+            for kind in sorted(snapshot[operation]):
+                data = snapshot[operation][kind]
+                labels = 'operation="%s",kind="%s"' % (operation, kind)
+                for quantile in QUANTILES:
+                    value = data['p%s_us' % _quantile_label(quantile)]
+                    lines.append('%s_latency_seconds{%s,quantile="%s"} %.9f' % (
+                        prefix, labels, quantile, (value or 0) / 1e6))
+                lines.append('%s_latency_seconds_sum{%s} %.9f' % (
+                    prefix, labels, data['sum_us'] / 1e6))
+                lines.append('%s_latency_seconds_count{%s} %d' % (
+                    prefix, labels, data['count']))
+                errors.append('%s_errors_total{%s} %d' % (
+                    prefix, labels, data['errors']))
+        return '\n'.join(lines + errors) + '\n'
+
+    def write_prometheus(self, path, snapshot):
+        """write ``snapshot`` in Prometheus text format, replacing ``path``
+        atomically so a node-exporter textfile collector never reads a
+        partial file."""
+        tmp = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmp, 'w') as f:
+            f.write(self.to_prometheus(snapshot))
+        os.replace(tmp, path)
@@ -0,0 +1,114 @@
+from sqlalchemy import sql, exc
+from sqlalchemy.sql import operators, elements
+
+
+def _order_columns(order_by):
+    """return ``[(column, descending)]`` for ORDER BY expressions given as
+    columns or ``column.asc()`` / ``column.desc()``."""
+    columns = []
+    for expr in order_by:
+        descending = False
+        while isinstance(expr, elements.UnaryExpression) and \
+                expr.modifier in (operators.asc_op, operators.desc_op,
+                                  operators.nulls_first_op,
+                                  operators.nulls_last_op):
+            if expr.modifier is operators.desc_op:
+                descending = True
+            expr = expr.element
+        columns.append((expr, descending))
+    if not columns:
+        raise exc.ArgumentError("keyset pagination needs ORDER BY columns")
+    return columns
+
+
+def keyset_predicate(order_by, last_key, row_value=False):
+    """WHERE criteria selecting the rows that sort after ``last_key``.
+
+    ``order_by`` lists the sort columns, optionally with ``.desc()``;
+    together they must be unique and not nullable (end the list with the
+    primary key).  ``last_key`` holds their values for the last row seen.
+
+    By default the row comparison is expanded, for ``(a, b) > (:a, :b)``::
+
+        a >= :a AND (a > :a OR a = :a AND b > :b)
+
+    whose leading range on ``a`` lets DM seek an index on ``(a, b)``.
+    ``row_value=True`` renders the row-value comparison itself, which
+    requires every column to sort in the same direction.
+    """
+    columns = _order_columns(order_by)
+    if len(last_key) != len(columns):
+        raise exc.ArgumentError(
+            "last_key has %d values for %d ORDER BY columns" %
+            (len(last_key), len(columns)))
+
+    if row_value:
+        directions = set(descending for column, descending in columns)
+        if len(directions) > 1:
+            raise exc.ArgumentError(
+                "row value comparison needs every ORDER BY column to sort "
+                "in the same direction")
+        left = sql.tuple_(*[column for column, descending in columns])
+        right = sql.tuple_(*[
+            sql.literal(value, column.type)
+            for (column, descending), value in zip(columns, last_key)])
+        return left < right if directions.pop() else left > right
+
+    after = []
+    equal = []
+    for (column, descending), value in zip(columns, last_key):
+        after.append(sql.and_(
+            *equal + [column < value if descending else column > value]))
+        equal.append(column == value)
+    criteria = sql.or_(*after)
+    if len(columns) == 1:
+        return criteria
+
+    column, descending = columns[0]
+    leading = column <= last_key[0] if descending else column >= last_key[0]
+    return sql.and_(leading, criteria)
+
+
+def keyset_page(select, order_by, last_key=None, page_size=1000,
+                row_value=False):
+    """``select`` ordered by ``order_by``, limited to the ``page_size``
+    rows after ``last_key`` (the first page when None).
+
+    Any ORDER BY already on ``select`` is replaced.
+    """
+    select = select.order_by(None).order_by(*order_by).limit(page_size)
+    if last_key is not None:
+        select = select.where(
+            keyset_predicate(order_by, last_key, row_value=row_value))
+    return select
+
+
+def iter_keyset_pages(connection, select, order_by, page_size=1000,
+                      last_key=None, row_value=False):
+    """execute ``select`` page by page on ``connection``, yielding each
+    page as a list of rows.
+
+    Each page seeks past the last key of the previous one instead of
+    using OFFSET, so with an index on the ORDER BY columns every page
+    costs the same however deep the walk goes.  The ORDER BY columns
+    must be among the selected columns.
+    """
+    selected = list(select.selected_columns)
+    positions = []
+    for column, descending in _order_columns(order_by):
+        target = select.selected_columns.corresponding_column(column)
+        if target is None:
+            raise exc.ArgumentError(
+                "ORDER BY column %s is not selected" % column)
+        positions.append(
+            [i for i, c in enumerate(selected) if c is target][0])
+
+    while True:
+        rows = connection.execute(keyset_page(
+            select, order_by, last_key, page_size, row_value)).all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last_key = tuple(rows[-1][i] for i in positions)
@@ -0,0 +1,99 @@
+import pickle
+import sqlite3
+import threading
+
+
+class DMReflectionCache(object):
+    """Reflection results kept across processes in a local SQLite file.
+
+    Entries are stored per server, schema, reflection category and table,
+    together with the table's change marker (its last DDL time); an entry
+    is only used while the marker read from the catalog still matches.
+    For whole-schema reflection the list of tables returned is stored as
+    well, along with the schema's object names at that time, so a table
+    created or dropped since forces a full re-read of the category.
+
+    Values are pickled: only point ``path`` at a file no one else can
+    write.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS dm_reflection ("
+                "server TEXT, schema TEXT, category TEXT, name TEXT, "
+                "marker TEXT, value BLOB, "
+                "PRIMARY KEY (server, schema, category, name))")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS dm_reflection_listing ("
+                "server TEXT, schema TEXT, category TEXT, "
+                "objects BLOB, names BLOB, "
+                "PRIMARY KEY (server, schema, category))")
+
+    def load(self, server, schema, category, markers, names):
+        """return ``({name: value}, misses)`` for ``names``; an entry is
+        a hit only if its stored marker equals ``markers[name]``."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT name, marker, value FROM dm_reflection "
+                "WHERE server = ? AND schema = ? AND category = ?",
+                (server, schema, category)).fetchall()
+        stored = dict((name, (marker, value)) for name, marker, value in rows)
+        found = {}
+        misses = []
+        for name in names:
+            entry = stored.get(name)
+            if entry is not None and name in markers and \
+                    entry[0] == markers[name]:
+                found[name] = pickle.loads(entry[1])
+            else:
+                misses.append(name)
+        self.hits += len(found)
+        self.misses += len(misses)
+        return found, misses
+
+    def store(self, server, schema, category, entries):
+        """store ``(name, marker, value)`` entries."""
+        rows = [(server, schema, category, name, marker,
+                 pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+                for name, marker, value in entries]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO dm_reflection "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def load_listing(self, server, schema, category):
+        """return ``(object names, table names)`` stored by the last
+        whole-schema reflection of ``category``, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT objects, names FROM dm_reflection_listing "
+                "WHERE server = ? AND schema = ? AND category = ?",
+                (server, schema, category)).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0]), pickle.loads(row[1])
+
+    def store_listing(self, server, schema, category, objects, names):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO dm_reflection_listing "
+                "VALUES (?, ?, ?, ?, ?)",
+                (server, schema, category,
+                 pickle.dumps(sorted(objects), pickle.HIGHEST_PROTOCOL),
+                 pickle.dumps(list(names), pickle.HIGHEST_PROTOCOL)))
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM dm_reflection")
+            self._db.execute("DELETE FROM dm_reflection_listing")
+        self.hits = self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,193 @@
+import itertools
+import threading
+import time
+
+from sqlalchemy import event, exc, pool
+from sqlalchemy.orm import Session
+
+
+ROUTE_OPTION = 'dm_route'
+ROUTES = ('primary', 'replica')
+
+
+def _sync_engine(engine):
+    # AsyncEngine binds are given to the sync Session by their sync_engine
+    return getattr(engine, 'sync_engine', engine)
+
+
+def is_read(statement):
+    """True for a plain SELECT: no DML, no ``FOR UPDATE``.  Textual SQL
+    is not inspected and counts as a write."""
+    if statement is None or not getattr(statement, 'is_select', False):
+        return False
+    if getattr(statement, 'is_dml', False):
+        return False
+    return getattr(statement, '_for_update_arg', None) is None
+
+
+def _pool_status(engine):
+    p = engine.pool
+    if not isinstance(p, pool.QueuePool):
+        return {}
+    return {'size': p.size(), 'checkedin': p.checkedin(),
+            'checkedout': p.checkedout(), 'overflow': p.overflow()}
+
+
+class DMRouter(object):
+    """Read/write routing between a primary engine and replica engines
+    (DM standby nodes), done by SQLAlchemy rather than by dmPython's
+    ``rwseparate``, which should then be left off.
+
+    Reads are plain SELECTs; they go to the replicas in turn, everything
+    else to ``primary``.  A statement's ``dm_route`` execution option,
+    ``'primary'`` or ``'replica'``, overrides the choice.  Core code
+    picks an engine per statement with :meth:`engine_for`; sessions of
+    :class:`DMRoutingSession` also keep reads on the primary inside
+    write transactions and for ``sticky_reads`` seconds after one, so
+    that a session reads its own writes despite replication lag.
+
+    Engines may be :class:`.Engine` or :class:`.AsyncEngine`; for the
+    latter use ``AsyncSession(sync_session_class=DMRoutingSession,
+    router=router)``.
+    """
+
+    def __init__(self, primary, replicas=(), sticky_reads=0):
+        if sticky_reads < 0:
+            raise exc.ArgumentError(
+                "sticky_reads must be a number of seconds, got %r" %
+                (sticky_reads, ))
+        self.primary = _sync_engine(primary)
+        self.replicas = [_sync_engine(engine) for engine in replicas]
+        self.sticky_reads = sticky_reads
+        self.names = {self.primary: 'primary'}
+        for i, engine in enumerate(self.replicas):
+            self.names[engine] = 'replica_%d' % i
+        # engine_for() returns engines as given, async ones included
+        self._given = dict(zip([self.primary] + self.replicas,
+                               [primary] + list(replicas)))
+        self._lock = threading.Lock()
+        self._next_replica = itertools.cycle(self.replicas or [self.primary])
+        self._routed = {}
+
+    def _count(self, engine, kind):
+        key = (self.names[engine], kind)
+        with self._lock:
+            self._routed[key] = self._routed.get(key, 0) + 1
+
+    def replica(self):
+        """the next replica engine, round robin; the primary when there
+        are no replicas."""
+        with self._lock:
+            return next(self._next_replica)
+
+    def route(self, statement):
+        """``'primary'`` or ``'replica'`` for ``statement``."""
+        options = getattr(statement, '_execution_options', None) or {}
+        route = options.get(ROUTE_OPTION)
+        if route is not None:
+            if route not in ROUTES:
+                raise exc.ArgumentError(
+                    "%s must be one of %s, got %r" %
+                    (ROUTE_OPTION, ", ".join(ROUTES), route))
+            return route
+        return 'replica' if is_read(statement) else 'primary'
+
+    def engine_for(self, statement):
+        """the engine to run ``statement`` on."""
+        if self.route(statement) == 'replica':
+            engine = self.replica()
+            self._count(engine, 'read')
+        else:
+            engine = self.primary
+            self._count(engine, 'write')
+        return self._given[engine]
+
+    def metrics_snapshot(self, reset=False):
+        """per engine: routing decisions by kind (``read``, ``write``,
+        ``pinned`` for reads kept on the primary), pool status, and the
+        dialect's call metrics when it has ``collect_metrics=True``."""
+        with self._lock:
+            routed = self._routed
+            if reset:
+                self._routed = {}
+        data = {}
+        for engine, name in self.names.items():
+            data[name] = {
+                'routed': dict((kind, count)
+                               for (key, kind), count in routed.items()
+                               if key == name),
+                'pool': _pool_status(engine),
+            }
+            metrics = getattr(engine.dialect, 'metrics', None)
+            if metrics is not None:
+                data[name]['metrics'] = metrics.snapshot(reset)
+        return data
+
+
+class DMRoutingSession(Session):
+    """a :class:`.Session` routing through ``router``; see
+    :class:`DMRouter`.
+
+    A transaction becomes a write transaction with its first flush or
+    write statement run through the session, or from the start with
+    :meth:`begin_write`; from then on all of it runs on the primary.  One
+    replica is used per transaction.  :meth:`get_bind` without a
+    statement returns the primary and changes nothing.
+    """
+
+    def __init__(self, router, **kw):
+        super(DMRoutingSession, self).__init__(**kw)
+        self.router = router
+        self._dm_writing = False
+        self._dm_last_write = None
+        self._dm_replica = None
+        event.listen(self, 'do_orm_execute', self._dm_on_execute)
+        event.listen(self, 'before_flush', self._dm_on_flush)
+        event.listen(self, 'after_transaction_end', self._dm_on_end)
+
+    def begin_write(self):
+        """begin a transaction that runs on the primary throughout, for
+        reads that must see current data or lock rows."""
+        transaction = self.begin()
+        self._dm_writing = True
+        return transaction
+
+    def _dm_on_execute(self, orm_execute_state):
+        # runs before get_bind() and before the transaction autobegins
+        if self.router.route(orm_execute_state.statement) == 'primary':
+            self._dm_writing = True
+
+    def _dm_on_flush(self, session, flush_context, instances):
+        self._dm_writing = True
+
+    def _dm_on_end(self, session, transaction):
+        if transaction.parent is not None:
+            return
+        # committed or rolled back; stick from now on
+        if self._dm_writing:
+            self._dm_writing = False
+            self._dm_last_write = time.monotonic()
+        self._dm_replica = None
+
+    def _dm_pinned(self):
+        if self._dm_writing:
+            return True
+        return self._dm_last_write is not None and \
+            time.monotonic() - self._dm_last_write < self.router.sticky_reads
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        router = self.router
+        if clause is None and not self._flushing:
+            return router.primary
+        if self._flushing or router.route(clause) == 'primary':
+            router._count(router.primary, 'write')
+            return router.primary
+        if self._dm_pinned():
+            router._count(router.primary, 'pinned')
+            return router.primary
+        # kept until the transaction the read autobegins has ended
+        if self._dm_replica is None:
+            self._dm_replica = router.replica()
+        engine = self._dm_replica
+        router._count(engine, 'read')
+        return engine
@@ -0,0 +1,306 @@
+import os
+import json
+import time
+import queue
+import atexit
+import itertools
+import threading
+
+from sqlalchemy import exc
+
+
+OVERFLOW_POLICIES = ('drop', 'drop_oldest', 'block')
+
+TRACE_FORMATS = ('text', 'jsonl', 'chrome')
+
+_CLOSE = object()
+
+
+class DMTraceWriter(object):
+    """Buffered, thread-safe sink for the dialect trace log.
+
+    Records are dropped into a bounded queue by the calling thread and
+    written by a daemon thread in batches, so a traced request never waits
+    on file I/O (unless ``overflow='block'`` is chosen).
+
+    :param path: trace file, opened in append mode.
+    :param max_bytes: rotate once the file would grow past this size;
+     ``0`` disables rotation.
+    :param backup_count: number of rotated files kept, ``path.1`` being
+     the most recent.
+    :param queue_size: maximum number of records waiting to be written.
+    :param overflow: what to do when the queue is full; ``'drop'``
+     discards the new record, ``'drop_oldest'`` discards the oldest queued
+     record, ``'block'`` waits for the writer thread.
+    :param batch_size: maximum number of records written per flush.
+    :param flush_interval: seconds the writer waits for more records
+     before flushing a partial batch.
+    :param header: text written at the top of every new (empty) file,
+     including files started by rotation.
+    """
+
+    def __init__(self, path='sqlalchemy_dm_trace.log', max_bytes=0,
+                 backup_count=1, queue_size=10000, overflow='drop',
+                 batch_size=500, flush_interval=1.0, header=None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise exc.ArgumentError(
+                "trace overflow policy must be one of %s, got %r" %
+                (", ".join(OVERFLOW_POLICIES), overflow))
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.header = header
+        self.dropped = 0
+
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(queue_size)
+        self._file = open(path, 'a')
+        self._size = self._file.tell()
+        self._write_header()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name='dm-trace-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, record):
+        """queue one complete record; never interleaves with other
+        threads' records."""
+        if self._closed:
+            return
+        if self.overflow == 'block':
+            self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                if self.overflow == 'drop_oldest' and not self._closed:
+                    # close() queues _CLOSE only after setting _closed under
+                    # this lock, so the record popped is never the sentinel
+                    try:
+                        self._queue.get_nowait()
+                    except queue.Empty:
+                        pass
+                    else:
+                        self._queue.task_done()
+                        self.dropped += 1
+                    try:
+                        self._queue.put_nowait(record)
+                        return
+                    except queue.Full:
+                        pass
+                self.dropped += 1
+
+    def flush(self):
+        """block until every record queued so far is on disk."""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            try:
+                while len(batch) < self.batch_size and batch[-1] is not _CLOSE:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                pass
+
+            closing = batch[-1] is _CLOSE
+            records = batch[:-1] if closing else batch
+            if records:
+                self._emit(''.join(records))
+            for _ in batch:
+                self._queue.task_done()
+            if closing:
+                return
+
+    def _emit(self, data):
+        if self.max_bytes and self._size and \
+                self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+    def _rotate(self):
+        self._file.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = "%s.%d" % (self.path, i)
+                if os.path.exists(src):
+                    os.replace(src, "%s.%d" % (self.path, i + 1))
+            os.replace(self.path, self.path + ".1")
+            self._file = open(self.path, 'a')
+        else:
+            self._file = open(self.path, 'w')
+        self._size = 0
+        self._write_header()
+
+    def _write_header(self):
+        if self.header and not self._size:
+            self._file.write(self.header)
+            self._size = len(self.header)
+
+
+class _Statement(object):
+    """the root span of one statement, kept on its execution context."""
+
+    __slots__ = ('span_id', 'parent_id', 'depth', 'sampled', 'wall',
+                 'start')
+
+    def __init__(self, span_id, parent_id, depth, sampled):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.depth = depth
+        self.sampled = sampled
+        self.wall = time.time()
+        self.start = time.perf_counter_ns()
+
+
+class DMSpanTracer(object):
+    """Records traced dialect calls as timed, nested spans.
+
+    Every statement executed is one root span, ``statement``, from the
+    creation of its execution context to its result; the calls made for
+    it (parameter processing, cursor creation, ``pre_exec``,
+    ``do_execute``, ...) are spans nested under it.  Any other traced
+    call made while no traced call is running on the same thread (a
+    statement compile, a connect, a reflection method) is a root span of
+    its own.  Only one root span in ``sample_rate`` is recorded; spans
+    nested under it follow its sampling decision, so a sampled statement
+    is always traced completely.
+
+    ``format`` is ``'jsonl'`` (one JSON object per span, carrying span and
+    parent ids) or ``'chrome'`` (Chrome trace-event "complete" events,
+    loadable in chrome://tracing or Perfetto).
+    """
+
+    def __init__(self, writer, format='jsonl', sample_rate=1,
+                 record_args=False):
+        self.writer = writer
+        self.format = format
+        self.sample_rate = max(int(sample_rate), 1)
+        self.record_args = record_args
+        self.pid = os.getpid()
+        self._local = threading.local()
+        self._roots = itertools.count()
+        self._ids = itertools.count(1)
+
+    def _stack(self):
+        # (span id, sampled, statement, depth) of the running calls
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _parent(self, stack):
+        if stack:
+            span_id, sampled, statement, depth = stack[-1]
+            return span_id, sampled, depth + 1
+        return None, next(self._roots) % self.sample_rate == 0, 0
+
+    def begin_statement(self):
+        """open the span of a statement about to be executed; nested
+        under the running call, if any, else a root span."""
+        parent_id, sampled, depth = self._parent(self._stack())
+        return _Statement(next(self._ids) if sampled else None,
+                          parent_id, depth, sampled)
+
+    def within(self, statement, fn, *args, **kw):
+        """run ``fn`` with ``statement`` as the running span."""
+        stack = self._stack()
+        stack.append((statement.span_id, statement.sampled, statement,
+                      statement.depth))
+        try:
+            return fn(*args, **kw)
+        finally:
+            stack.pop()
+
+    def end_statement(self, statement, cls_str, sql=None):
+        if statement.sampled:
+            self.writer.write(self._format(
+                cls_str, 'statement', statement.span_id,
+                statement.parent_id, statement.depth, statement.wall,
+                statement.start, time.perf_counter_ns(), (sql, ), {}))
+
+    def call(self, cls_str, func_str, fn, obj, args, kw, statement=None):
+        stack = self._stack()
+        if statement is not None and \
+                (not stack or stack[-1][2] is not statement):
+            # called by the Connection for a statement: under its span
+            parent_id = statement.span_id
+            sampled = statement.sampled
+            depth = statement.depth + 1
+        else:
+            parent_id, sampled, depth = self._parent(stack)
+            if stack:
+                statement = stack[-1][2]
+
+        if not sampled:
+            stack.append((None, False, statement, depth))
+            try:
+                return fn(obj, *args, **kw)
+            finally:
+                stack.pop()
+
+        span_id = next(self._ids)
+        stack.append((span_id, True, statement, depth))
+        wall = time.time()
+        start = time.perf_counter_ns()
+        try:
+            return fn(obj, *args, **kw)
+        finally:
+            end = time.perf_counter_ns()
+            stack.pop()
+            self.writer.write(self._format(
+                cls_str, func_str, span_id, parent_id, depth,
+                wall, start, end, args, kw))
+
+    def _format(self, cls_str, func_str, span_id, parent_id, depth,
+                wall, start, end, args, kw):
+        tid = threading.get_ident()
+        if self.format == 'chrome':
+            event = {
+                'name': func_str,
+                'cat': cls_str,
+                'ph': 'X',
+                'ts': start / 1000.0,
+                'dur': (end - start) / 1000.0,
+                'pid': self.pid,
+                'tid': tid,
+            }
+            if self.record_args:
+                event['args'] = {'args': repr(args), 'kws': repr(kw)}
+            return json.dumps(event) + ',\n'
+
+        record = {
+            'ts': wall,
+            'cls': cls_str,
+            'func': func_str,
+            'span': span_id,
+            'parent': parent_id,
+            'depth': depth,
+            'dur_us': (end - start) / 1000.0,
+            'thread': tid,
+        }
+        if self.record_args:
+            record['args'] = repr(args)
+            record['kws'] = repr(kw)
+        return json.dumps(record) + '\n'
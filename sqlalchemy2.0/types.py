@@ -1,6 +1,9 @@
 
 #from . import base as dm
 import json
+import base64
+import binascii
+import collections
 from sqlalchemy import util, sql, ARRAY
 from sqlalchemy import types as sqltypes, schema as sa_schema
 from sqlalchemy.types import VARCHAR, NVARCHAR, CHAR, \
@@ -117,6 +120,29 @@ class INTERVAL(sqltypes.TypeEngine):
 class ROWID(sqltypes.TypeEngine):
     __visit_name__ = 'ROWID'
 
+
+DMRowid = collections.namedtuple('DMRowid', ['epno', 'partno', 'rowno'])
+
+
+def decode_rowid(rowid):
+    """split a DM ROWID into its site number, partition table id and
+    physical row number, without asking the server.
+
+    A ROWID is 18 characters of base64 (``A-Z a-z 0-9 + /``) encoding,
+    most significant first, a 24 bit site number, a 36 bit partition
+    table id and a 48 bit row number.  Returns None for anything else.
+    """
+    if not isinstance(rowid, str) or len(rowid) != 18:
+        return None
+    try:
+        # two leading zero digits make it a whole number of base64 quanta
+        value = int.from_bytes(
+            base64.b64decode('AA' + rowid, validate=True), 'big')
+    except (binascii.Error, ValueError):
+        return None
+    return DMRowid(value >> 84, (value >> 48) & 0xFFFFFFFFF,
+                   value & 0xFFFFFFFFFFFF)
+
 class _DMBoolean(sqltypes.Boolean):
     def get_dbapi_type(self, dbapi):
         return dbapi.NUMBER
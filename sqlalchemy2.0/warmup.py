@@ -0,0 +1,111 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import pool
+
+
+# connections opened at once by warm_up()
+WARMUP_WORKERS = 4
+
+
+def _warmup_size(engine, connections):
+    if connections is None:
+        connections = engine.dialect.pool_warmup
+    if isinstance(engine.pool, pool.NullPool):
+        return 0
+    if isinstance(engine.pool, pool.QueuePool):
+        # overflow connections would be closed again on return
+        connections = min(connections, engine.pool.size())
+    return max(connections, 0)
+
+
+def _timed(connect):
+    start = time.perf_counter()
+    connection = connect()
+    return connection, time.perf_counter() - start
+
+
+def warm_up(engine, connections=None, workers=None):
+    """open ``connections`` pooled connections of ``engine`` before any
+    traffic, ``workers`` at a time, and return how long each took to
+    open and set up, in seconds.
+
+    The first connection is opened alone, as it runs the dialect's
+    ``initialize()``; the others are opened in parallel on a thread pool
+    of ``workers`` threads, so that a cold start reaches the server as
+    at most ``workers`` connects at once.  All of them are then checked
+    back into the pool.  ``connections`` is capped at the pool size.
+
+    The defaults come from the ``pool_warmup`` and
+    ``pool_warmup_workers`` dialect options, which can also be given in
+    the URL, e.g. ``dm://user:pass@host:5236?pool_warmup=20``; when
+    ``pool_warmup`` is set, the engine is warmed up by create_engine().
+    """
+    connections = _warmup_size(engine, connections)
+    workers = workers or engine.dialect.pool_warmup_workers
+    if not connections:
+        return []
+
+    opened = []
+    times = []
+    error = None
+    try:
+        connection, elapsed = _timed(engine.raw_connection)
+        opened.append(connection)
+        times.append(elapsed)
+        if connections > 1:
+            with ThreadPoolExecutor(
+                    min(workers, connections - 1),
+                    thread_name_prefix='dm-warmup') as executor:
+                futures = [executor.submit(_timed, engine.raw_connection)
+                           for _ in range(connections - 1)]
+            for future in futures:
+                try:
+                    connection, elapsed = future.result()
+                except Exception as err:
+                    error = error or err
+                else:
+                    opened.append(connection)
+                    times.append(elapsed)
+    finally:
+        for connection in opened:
+            connection.close()
+    if error is not None:
+        raise error
+    return times
+
+
+async def warm_up_async(engine, connections=None, workers=None):
+    """:func:`warm_up` for an :class:`.AsyncEngine`; connections are
+    opened as ``workers`` concurrent tasks.  Not run by
+    create_async_engine(), which cannot wait on it."""
+    sync_engine = engine.sync_engine
+    connections = _warmup_size(sync_engine, connections)
+    workers = workers or sync_engine.dialect.pool_warmup_workers
+    if not connections:
+        return []
+
+    opened = []
+    times = []
+    semaphore = asyncio.Semaphore(workers)
+
+    async def connect():
+        async with semaphore:
+            start = time.perf_counter()
+            connection = await engine.connect()
+        opened.append(connection)
+        times.append(time.perf_counter() - start)
+
+    try:
+        await connect()
+        results = await asyncio.gather(
+            *[connect() for _ in range(connections - 1)],
+            return_exceptions=True)
+    finally:
+        for connection in opened:
+            await connection.close()
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return times
@@ -0,0 +1,118 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_dm import hints
+from sqlalchemy_dm.dmPython import DMDialect_dmPython
+
+
+metadata = sa.MetaData()
+t = sa.Table('t', metadata, sa.Column('a', sa.Integer),
+             sa.Column('b', sa.Integer))
+
+
+def dialect(**kw):
+    kw.setdefault('paramstyle', 'qmark')
+    return DMDialect_dmPython(**kw)
+
+
+def compile(stmt, **kw):
+    compiled = stmt.compile(dialect=dialect(**kw))
+    return ' '.join(compiled.string.split()), compiled
+
+
+def test_first_rows_hint_with_bound_limit():
+    sql, compiled = compile(sa.select(t).where(t.c.a == 3).limit(10),
+                            pagination='rownum', optimize_limits=True)
+    # the hint's argument is a literal, the ROWNUM limit stays a bind
+    assert sql.startswith(
+        'SELECT /*+ FIRST_ROWS(__[POSTCOMPILE_param_')
+    assert sql.endswith('WHERE ROWNUM <= ?')
+    params = compiled.construct_params()
+    expanded = compiled._process_parameters_for_postcompile(params)
+    assert expanded.statement.count('?') == len(expanded.positiontup)
+    assert 'FIRST_ROWS(10)' in expanded.statement
+
+
+def test_first_rows_hint_with_literal_limit():
+    sql, compiled = compile(sa.select(t).limit(10).offset(5),
+                            pagination='rownum', optimize_limits=True,
+                            use_binds_for_limits=False)
+    expanded = compiled._process_parameters_for_postcompile(
+        compiled.construct_params())
+    statement = ' '.join(expanded.statement.split())
+    assert '/*+ FIRST_ROWS(10) */' in statement
+    assert 'WHERE ROWNUM <= 10 + 5' in statement
+    assert statement.endswith('WHERE dm_rn > 5')
+    assert not expanded.positiontup
+
+
+def test_first_rows_hint_follows_cached_limit():
+    d = dialect(pagination='rownum', optimize_limits=True)
+    cache = {}
+    statements = []
+    for limit in (10, 20):
+        stmt = sa.select(t).limit(limit)
+        compiled, extracted, _ = stmt._compile_w_cache(
+            d, compiled_cache=cache, column_keys=[],
+            for_executemany=False, schema_translate_map=None)
+        expanded = compiled._process_parameters_for_postcompile(
+            compiled.construct_params(extracted_parameters=extracted))
+        statements.append(expanded.statement)
+    assert len(cache) == 1
+    assert 'FIRST_ROWS(10)' in statements[0]
+    assert 'FIRST_ROWS(20)' in statements[1]
+
+
+def test_hints_merge_into_one_comment():
+    stmt = hints.with_hints(
+        sa.select(t).where(t.c.a == 1),
+        hints.index(t, 'ix_t_a'), hints.parallel(4))
+    sql, compiled = compile(stmt)
+    assert sql.startswith('SELECT /*+ INDEX(t, ix_t_a) PARALLEL(4) */ t.a')
+    assert sql.count('?') == 1
+
+
+def test_hint_rejects_sql_expression_args():
+    with pytest.raises(sa.exc.ArgumentError):
+        hints.DMHint('FIRST_ROWS', args=[sa.bindparam('n', 10)])
+    with pytest.raises(sa.exc.ArgumentError):
+        hints.DMHint('FIRST_ROWS', args=[t.c.a])
+
+
+exists = sa.exists().where(t.c.a == 1)
+SUBQUERY = '(SELECT * FROM t WHERE t.a = ?)'
+COUNT = '(SELECT COUNT(*) FROM %s AS R_EXISTS) > 0' % SUBQUERY
+
+
+@pytest.mark.parametrize('stmt, expected', [
+    (sa.select(t.c.a).where(exists),
+     'SELECT t.a FROM t WHERE EXISTS %s' % SUBQUERY),
+    (sa.select(t.c.a).where(~exists),
+     'SELECT t.a FROM t WHERE NOT (EXISTS %s)' % SUBQUERY),
+    (sa.select(exists),
+     'SELECT CASE WHEN EXISTS %s THEN 1 ELSE 0 END AS anon_1 FROM DUAL'
+     % SUBQUERY),
+    (sa.select(~exists),
+     'SELECT CASE WHEN NOT EXISTS %s THEN 1 ELSE 0 END AS anon_1 '
+     'FROM DUAL' % SUBQUERY),
+    (sa.select(exists.label('x')),
+     'SELECT CASE WHEN EXISTS %s THEN 1 ELSE 0 END AS x FROM DUAL'
+     % SUBQUERY),
+    (sa.select((~exists).label('x')),
+     'SELECT CASE WHEN NOT EXISTS %s THEN 1 ELSE 0 END AS x FROM DUAL'
+     % SUBQUERY),
+])
+def test_exists(stmt, expected):
+    assert compile(stmt)[0] == expected
+
+
+@pytest.mark.parametrize('stmt, expected', [
+    (sa.select(t.c.a).where(exists),
+     'SELECT t.a FROM t WHERE CASE WHEN %s THEN 1 ELSE 0 END' % COUNT),
+    (sa.select(exists.label('x')),
+     'SELECT CASE WHEN %s THEN 1 ELSE 0 END AS x FROM DUAL' % COUNT),
+    (sa.select((~exists).label('x')),
+     'SELECT CASE WHEN %s THEN 0 ELSE 1 END AS x FROM DUAL' % COUNT),
+])
+def test_exists_as_count(stmt, expected):
+    assert compile(stmt, exists_as_count=True)[0] == expected
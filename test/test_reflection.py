@@ -0,0 +1,126 @@
+import collections
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import registry
+
+# as the package's entry point does, for runs from a source checkout
+registry.register('dm.dmPython', 'sqlalchemy_dm.dmPython',
+                  'DMDialect_dmPython')
+
+
+TABLES = ['T_%d' % i for i in range(5)]
+
+COLUMN_FIELDS = ('TABLE_NAME', 'COLUMN_NAME', 'DATA_TYPE', 'CHAR_LENGTH',
+                 'DATA_PRECISION', 'DATA_SCALE', 'NULLABLE', 'DATA_DEFAULT',
+                 'COMMENTS', 'VIRTUAL_COLUMN')
+
+
+class Cursor(object):
+    """answers the catalog queries of a reflection of TABLES, each table
+    with one column and nothing else."""
+
+    arraysize = 50
+    rowcount = -1
+    lastrowid = None
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self._rows = []
+
+    def execute(self, statement, parameters=()):
+        fields, rows = ('X', ), []
+        if statement.startswith('SELECT USER FROM DUAL'):
+            rows = [('SYSDBA', )]
+        elif statement.startswith('SELECT table_name FROM all_tables'):
+            fields, rows = ('TABLE_NAME', ), [(name, ) for name in TABLES]
+        elif statement.startswith('SELECT a_tab_cols.table_name'):
+            fields = COLUMN_FIELDS
+            rows = [(name, 'ID', 'INT', None, None, None, 'N', None, None,
+                     'NO')
+                    for name in TABLES if name in parameters]
+        self.description = [(field, None, None, None, None, None, None)
+                            for field in fields]
+        self._rows = rows
+
+    def executemany(self, statement, rows):
+        for row in rows:
+            self.execute(statement, row)
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size=None):
+        return self.fetchall()
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class Connection(object):
+    server_version = '8.1.3.62'
+    local_code = 1
+    str_case_sensitive = True
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class DBAPI(object):
+    paramstyle = 'qmark'
+    apilevel = '2.0'
+    threadsafety = 1
+    version = '2.5.5'
+
+    class Error(Exception):
+        pass
+
+    class InterfaceError(Error):
+        pass
+
+    class DatabaseError(Error):
+        pass
+
+    @staticmethod
+    def connect(*args, **kw):
+        return Connection()
+
+
+for name in ('Warning', 'DataError', 'OperationalError', 'IntegrityError',
+             'InternalError', 'ProgrammingError', 'NotSupportedError'):
+    setattr(DBAPI, name, type(name, (DBAPI.DatabaseError, ), {}))
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_reflect_runs_each_catalog_query_once(workers):
+    engine = sa.create_engine('dm+dmPython://u:p@h:5236', module=DBAPI,
+                              reflection_workers=workers)
+    with engine.connect():
+        pass
+
+    statements = collections.Counter()
+
+    @sa.event.listens_for(engine, 'before_cursor_execute')
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements[statement] += 1
+
+    metadata = sa.MetaData()
+    metadata.reflect(engine)
+
+    assert sorted(metadata.tables) == [name.lower() for name in TABLES]
+    assert statements
+    assert dict(statements) == dict.fromkeys(statements, 1)